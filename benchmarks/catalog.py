@@ -0,0 +1,332 @@
+"""
+Generator of a large synthetic catalog for repository benchmarks.
+
+Fills a SQLite database with the bot's schema: movies with Ukrainian titles,
+genres, directors and ratings, users whose list sizes follow a long tail,
+their watched and Watch Later rows skewed towards popular movies, and guild
+wheels. The same seed always produces the same database.
+
+    python -m benchmarks.catalog large_movies.db
+    python -m benchmarks.catalog large_movies.db --movies 50000 --users 5000
+"""
+import argparse
+import datetime
+import logging
+import math
+import os
+import random
+import time
+
+MOVIES = 500000
+USERS = 50000
+WHEELS = 2000
+MEDIAN_LIST_SIZE = 40  # Movies per user, log-normal so a few users have thousands
+MAX_LIST_SIZE = 5000
+WATCHED_SHARE = 0.6  # The rest of a user's list is Watch Later
+POPULARITY_SKEW = 2.5  # Higher values concentrate the lists on fewer movies
+MAX_WHEEL_SIZE = 60
+CHUNK_SIZE = 20000  # Rows per executemany
+
+ADJECTIVES = (
+    # Masculine and feminine forms, picked to agree with the noun
+    ("Останній", "Остання"),
+    ("Темний", "Темна"),
+    ("Великий", "Велика"),
+    ("Тихий", "Тиха"),
+    ("Таємний", "Таємна"),
+    ("Червоний", "Червона"),
+    ("Холодний", "Холодна"),
+    ("Загублений", "Загублена"),
+    ("Вічний", "Вічна"),
+    ("Дикий", "Дика"),
+    ("Нічний", "Нічна"),
+    ("Білий", "Біла"),
+    ("Зоряний", "Зоряна"),
+    ("Срібний", "Срібна"),
+    ("Довгий", "Довга"),
+    ("Чужий", "Чужа"),
+)
+MASCULINE_NOUNS = (
+    "світ", "острів", "вітер", "шлях", "сад", "потяг", "місяць", "сон",
+    "берег", "ліс", "спадок", "привид", "сигнал", "код", "обрій", "танець",
+)
+FEMININE_NOUNS = (
+    "ріка", "зима", "гра", "країна", "історія", "ніч", "дорога", "мелодія",
+    "пам'ять", "війна", "зірка", "тінь", "хвиля", "планета", "таємниця", "весна",
+)
+GENITIVES = (
+    "міста", "моря", "долі", "часу", "героя", "пустелі", "кохання", "вітру",
+    "півночі", "майбутнього", "минулого", "степу", "королеви", "океану",
+)
+ENGLISH_ADJECTIVES = (
+    "Last", "Dark", "Great", "Silent", "Secret", "Red", "Cold", "Lost",
+    "Eternal", "Wild", "Night", "White", "Starry", "Silver", "Long", "Strange",
+)
+ENGLISH_NOUNS = (
+    "World", "Island", "Wind", "Road", "Garden", "Train", "Moon", "Dream",
+    "Shore", "Forest", "Legacy", "Ghost", "Signal", "Code", "Horizon", "Dance",
+    "River", "Winter", "Game", "Country", "Story", "Night", "Way", "Melody",
+    "Memory", "War", "Star", "Shadow", "Wave", "Planet", "Mystery", "Spring",
+)
+GENRES = (
+    "драма", "комедія", "трилер", "жахи", "фантастика", "мелодрама",
+    "бойовик", "детектив", "мультфільм", "документальний", "пригоди",
+    "кримінал", "фентезі", "вестерн", "мюзикл", "біографія", "історичний",
+)
+FIRST_NAMES = (
+    "Олександр", "Андрій", "Марина", "Олена", "Тарас", "Ірина", "Сергій",
+    "Наталія", "Дмитро", "Оксана", "Юрій", "Kira", "Martin", "Agnès", "Akira",
+    "Sofia", "Paolo", "Jane", "Denis", "Céline",
+)
+LAST_NAMES = (
+    "Довженко", "Параджанов", "Муратова", "Шевченко", "Коваленко", "Бондар",
+    "Ткаченко", "Мельник", "Кравчук", "Лисенко", "Nolan", "Kurosawa", "Varda",
+    "Villeneuve", "Sciamma", "Sorrentino", "Campion", "Scorsese", "Bigelow",
+)
+
+
+def ukrainian_title(rng: random.Random) -> tuple:
+    """Ukrainian title and an English original name for it"""
+    english = f"The {rng.choice(ENGLISH_ADJECTIVES)} {rng.choice(ENGLISH_NOUNS)}"
+    if rng.random() < 0.5:
+        noun = rng.choice(MASCULINE_NOUNS)
+        adjective = rng.choice(ADJECTIVES)[0]
+    else:
+        noun = rng.choice(FEMININE_NOUNS)
+        adjective = rng.choice(ADJECTIVES)[1]
+    kind = rng.random()
+    if kind < 0.4:
+        title = f"{adjective} {noun}"
+    elif kind < 0.7:
+        title = f"{noun.capitalize()} {rng.choice(GENITIVES)}"
+    else:
+        subtitle = f"{rng.choice(FEMININE_NOUNS)} {rng.choice(GENITIVES)}"
+        title = f"{adjective} {noun}: {subtitle}"
+        english += f": {rng.choice(ENGLISH_NOUNS)}"
+    return title, english
+
+
+def rating(rng: random.Random, mean: float):
+    """Rating from 1 to 10 with one decimal, sometimes missing like on Kinorium"""
+    if rng.random() < 0.05:
+        return None
+    return round(min(10.0, max(1.0, rng.gauss(mean, 1.1))), 1)
+
+
+def movie_rows(count: int, rng: random.Random):
+    seen = set()
+    for number in range(1, count + 1):
+        title, english = ukrainian_title(rng)
+        year = rng.randint(1925, 2025)
+        base_title, part = title, 1
+        while (title, year) in seen:  # (title, release_year) is unique
+            part += 1
+            title = f"{base_title} {part}"
+        seen.add((title, year))
+        genres = rng.sample(GENRES, rng.randint(1, 3))
+        yield {
+            "title": title,
+            "original_name": f"{english}, {year}" if rng.random() < 0.8 else None,
+            "release_year": year,
+            "genre": ", ".join(genres),
+            "runtime": max(5, int(rng.gauss(105, 25))),
+            "director": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "kinorium_title_link": f"https://ua.kinorium.com/{number}/",
+            "kinorium_rating": rating(rng, 6.8),
+            "imdb_rating": rating(rng, 6.5),
+            "image_url": f"https://images.kinorium.com/movie/poster/{number}/w150.jpg",
+        }
+
+
+def user_rows(count: int):
+    for number in range(1, count + 1):
+        yield {
+            "discord_id": str(100000000000000000 + number),
+            "kinorium_id": 1000000 + number,
+            "username": f"кіноман{number}",
+        }
+
+
+def list_size(rng: random.Random) -> int:
+    size = int(rng.lognormvariate(math.log(MEDIAN_LIST_SIZE), 1.0))
+    return max(1, min(MAX_LIST_SIZE, size))
+
+
+def popular_movie(movies: int, rng: random.Random) -> int:
+    """Movie id, low ids are the popular ones"""
+    return 1 + int(movies * rng.random() ** POPULARITY_SKEW)
+
+
+def user_movie_rows(users: int, movies: int, rng: random.Random):
+    from database.models import UserMovieStatus
+
+    first_day = datetime.date(2015, 1, 1)
+    for user_id in range(1, users + 1):
+        movie_ids = set()
+        size = min(list_size(rng), movies)
+        while len(movie_ids) < size:
+            movie_ids.add(popular_movie(movies, rng))
+        for movie_id in movie_ids:
+            added = first_day + datetime.timedelta(days=rng.randrange(3650))
+            if rng.random() < WATCHED_SHARE:
+                yield {
+                    "user_id": user_id,
+                    "movie_id": movie_id,
+                    "status": UserMovieStatus.WATCHED,
+                    "user_rating": rng.randint(1, 10) if rng.random() < 0.7 else None,
+                    "watched_date": added,
+                    "added_date": added,
+                }
+            else:
+                yield {
+                    "user_id": user_id,
+                    "movie_id": movie_id,
+                    "status": UserMovieStatus.WATCH_LATER,
+                    "user_rating": None,
+                    "watched_date": None,
+                    "added_date": added,
+                }
+
+
+def wheel_rows(wheels: int):
+    from database.repositories.movie_wheel_repository import GLOBAL_WHEEL_NAME
+
+    yield {"id": 1, "name": GLOBAL_WHEEL_NAME, "guild_id": None, "channel_id": None}
+    for number in range(1, wheels):
+        guild_id = 900000000000000000 + number
+        if number % 5 == 0:  # Some guilds keep a wheel per channel
+            channel_id = guild_id + 1
+            name = f"Guild {guild_id} / Channel {channel_id}"
+        else:
+            channel_id = None
+            name = f"Guild {guild_id}"
+        yield {
+            "id": number + 1,
+            "name": name,
+            "guild_id": str(guild_id),
+            "channel_id": str(channel_id) if channel_id else None,
+        }
+
+
+def wheel_entry_rows(wheels: int, users: int, movies: int, rng: random.Random):
+    for wheel_id in range(1, wheels + 1):
+        movie_ids = set()
+        for _ in range(rng.randint(1, MAX_WHEEL_SIZE)):
+            movie_ids.add(popular_movie(movies, rng))
+        for movie_id in movie_ids:
+            yield {
+                "wheel_id": wheel_id,
+                "movie_id": movie_id,
+                "user_id": rng.randint(1, users),
+            }
+
+
+def insert_chunked(connection, table, rows) -> int:
+    from sqlalchemy import insert
+
+    total = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            connection.execute(insert(table), chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        connection.execute(insert(table), chunk)
+        total += len(chunk)
+    return total
+
+
+def generate(
+    path: str,
+    movies: int = MOVIES,
+    users: int = USERS,
+    wheels: int = WHEELS,
+    seed: int = 0,
+) -> dict:
+    """
+    Create a new database at path with the bot's schema and synthetic data
+
+    Args:
+        path (str): Database file, must not exist yet
+        movies (int): Number of movies
+        users (int): Number of users, each with watched and Watch Later rows
+        wheels (int): Number of wheels including the global one
+        seed (int): Seed of the random generator
+
+    Returns:
+        dict: Row counts per table
+    """
+    from sqlalchemy import create_engine, text
+
+    from database.db import Base, create_trigger, schema_version
+    from database.models import (
+        Movie,
+        MovieSearchSite,
+        MovieWheel,
+        MovieWheelEntry,
+        User,
+        UserMovie,
+    )
+
+    if os.path.exists(path):
+        raise FileExistsError(f"{path} already exists, the catalog needs a new file")
+    rng = random.Random(seed)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(bind=engine)
+        counts = {}
+        with engine.connect() as connection:
+            # Nothing to recover if generation fails halfway, skip the journal
+            connection.execute(text("PRAGMA journal_mode=OFF;"))
+            connection.execute(text("PRAGMA synchronous=OFF;"))
+            tables = (
+                (Movie, movie_rows(movies, rng)),
+                (User, user_rows(users)),
+                (UserMovie, user_movie_rows(users, movies, rng)),
+                (MovieWheel, wheel_rows(wheels)),
+                (MovieWheelEntry, wheel_entry_rows(wheels, users, movies, rng)),
+            )
+            for table, rows in tables:
+                start = time.perf_counter()
+                counts[table.__tablename__] = insert_chunked(connection, table, rows)
+                connection.commit()
+                logging.info(
+                    f"Inserted {counts[table.__tablename__]} rows into "
+                    f"{table.__tablename__} in {time.perf_counter() - start:.1f}s"
+                )
+            sites = [
+                {"name": "Kinorium", "query_template": "https://ua.kinorium.com/search/?q="},
+                {"name": "IMDb", "query_template": "https://www.imdb.com/find/?q="},
+            ]
+            counts[MovieSearchSite.__tablename__] = insert_chunked(
+                connection, MovieSearchSite, sites
+            )
+            connection.commit()
+        # After the movies, so temp_inserted_movies stays empty as after a scrape
+        create_trigger(engine)
+        with engine.begin() as connection:
+            connection.execute(text(f"PRAGMA user_version = {schema_version(engine)};"))
+    finally:
+        engine.dispose()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="new database file")
+    parser.add_argument("--movies", type=int, default=MOVIES)
+    parser.add_argument("--users", type=int, default=USERS)
+    parser.add_argument("--wheels", type=int, default=WHEELS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    counts = generate(args.path, args.movies, args.users, args.wheels, args.seed)
+    for table, count in counts.items():
+        print(f"{table}: {count}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    main()
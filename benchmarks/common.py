@@ -0,0 +1,128 @@
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+DEFAULT_THRESHOLD = 0.25  # Allowed relative growth of any metric
+HIGHER_IS_BETTER_SUFFIX = "_per_s"  # Throughput metrics, a drop is a regression
+# Timings, sizes and error rates, growth is a regression. Counts such as calls or
+# operations follow the run's settings and are not compared.
+LOWER_IS_BETTER_SUFFIXES = ("_s", "_ms", "_mb", "_bytes", "_rate")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of the current process in megabytes"""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return usage / 1024 / 1024 if sys.platform == "darwin" else usage / 1024
+
+
+def children_peak_rss_mb() -> float:
+    """Peak resident memory of the largest finished child process, e.g. a browser"""
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return usage / 1024 / 1024 if sys.platform == "darwin" else usage / 1024
+
+
+def run_isolated(func, *args):
+    """Run a function in a fresh process so its peak memory is measured alone"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(func, *args).result()
+
+
+def baseline_path(name: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def load_baseline(name: str):
+    """Load saved benchmark results, or None if there is no baseline yet"""
+    try:
+        with open(baseline_path(name), encoding="utf-8") as f:
+            return json.load(f)["results"]
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(name: str, results: dict):
+    """Save benchmark results together with the environment they came from"""
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(baseline_path(name), "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compare results with the baseline. Throughputs ending with
+    HIGHER_IS_BETTER_SUFFIX must not drop, metrics ending with one of
+    LOWER_IS_BETTER_SUFFIXES must not grow, other metrics are not compared.
+
+    Args:
+        results (dict): {case: {metric: value}} from the current run
+        baseline (dict): Results of the same shape from the baseline
+        threshold (float): Allowed relative growth, 0.2 means 20%
+
+    Returns:
+        list: Human readable descriptions of regressed metrics
+    """
+    regressions = []
+    for case, metrics in results.items():
+        for metric, value in metrics.items():
+            base_value = baseline.get(case, {}).get(metric)
+            if not base_value or not isinstance(value, (int, float)):
+                continue
+            if metric.endswith(HIGHER_IS_BETTER_SUFFIX):
+                regressed = value < base_value / (1 + threshold)
+            elif metric.endswith(LOWER_IS_BETTER_SUFFIXES):
+                regressed = value > base_value * (1 + threshold)
+            else:
+                continue
+            if regressed:
+                regressions.append(
+                    f"{case} {metric}: {value:.4g} vs baseline {base_value:.4g} "
+                    f"({(value / base_value - 1) * 100:+.0f}%)"
+                )
+    return regressions
+
+
+def report(
+    name: str, results: dict, update: bool, threshold: float, check: bool = False
+) -> int:
+    """
+    Print results, compare them with the baseline and optionally save them.
+
+    With check, as in CI, a missing baseline fails the run instead of
+    passing it unchecked.
+
+    Returns:
+        int: Process exit code, 1 if any metric regressed beyond the threshold
+    """
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+    if update:
+        save_baseline(name, results)
+        logging.info(f"Baseline saved to {baseline_path(name)}")
+        return 0
+
+    baseline = load_baseline(name)
+    if baseline is None:
+        if check:
+            logging.error(f"No baseline for {name} to check against")
+            return 1
+        logging.warning(f"No baseline for {name}, run with --update to create one")
+        return 0
+
+    regressions = find_regressions(results, baseline, threshold)
+    for regression in regressions:
+        logging.error(f"Regression: {regression}")
+    if not regressions:
+        logging.info(f"No regressions beyond {threshold:.0%} against the baseline")
+    return 1 if regressions else 0
@@ -0,0 +1,198 @@
+"""
+Benchmark of discord.py's caches on a simulated large guild.
+
+Feeds synthetic gateway events straight into the bot's connection state, once
+with every intent and the default caches the bot used to run with and once
+with the options from bot.bot.gateway_options(). Only the events each set of
+intents would receive are fed: members and presences need their privileged
+intents, messages arrive either way. Each mode runs in its own process so
+peak RSS is not shared.
+
+    python -m benchmarks.gateway_cache                  # compare with the baseline
+    python -m benchmarks.gateway_cache --members 200000
+    python -m benchmarks.gateway_cache --update         # save a new baseline
+    python -m benchmarks.gateway_cache --check          # fail without a baseline
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+
+from benchmarks.common import DEFAULT_THRESHOLD, peak_rss_mb, report, run_isolated
+
+GUILD_ID = 1
+CHANNEL_ID = 10
+BOT_ID = 2
+MEMBERS = 50000
+MESSAGES = 20000
+PRESENCE_UPDATES = 50000
+TIMESTAMP = "2024-01-01T00:00:00+00:00"
+
+
+def user_payload(user_id: int) -> dict:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id}",
+        "global_name": f"User {user_id}",
+        "discriminator": "0",
+        "avatar": None,
+    }
+
+
+def member_payload(user_id: int) -> dict:
+    return {
+        "user": user_payload(user_id),
+        "roles": [],
+        "joined_at": TIMESTAMP,
+        "deaf": False,
+        "mute": False,
+        "nick": None,
+        "flags": 0,
+    }
+
+
+def presence_payload(user_id: int, rng: random.Random) -> dict:
+    status = rng.choice(("online", "idle", "dnd"))
+    return {
+        "user": {"id": str(user_id)},
+        "guild_id": str(GUILD_ID),
+        "status": status,
+        "activities": [{"name": f"Game {rng.randrange(500)}", "type": 0}],
+        "client_status": {"desktop": status},
+    }
+
+
+def guild_payload(members: int, intents, rng: random.Random) -> dict:
+    """GUILD_CREATE after chunking, the gateway sends only what intents allow"""
+    member_ids = range(100, 100 + members) if intents.members else ()
+    return {
+        "id": str(GUILD_ID),
+        "name": "Large guild",
+        "owner_id": str(BOT_ID),
+        "member_count": members,
+        "large": True,
+        "features": [],
+        "emojis": [],
+        "stickers": [],
+        "roles": [
+            {
+                "id": str(GUILD_ID),
+                "name": "@everyone",
+                "permissions": "0",
+                "position": 0,
+                "color": 0,
+                "hoist": False,
+                "managed": False,
+                "mentionable": False,
+            }
+        ],
+        "channels": [
+            {
+                "id": str(CHANNEL_ID),
+                "type": 0,
+                "name": "general",
+                "position": 0,
+                "permission_overwrites": [],
+            }
+        ],
+        "members": [member_payload(BOT_ID)]
+        + [member_payload(user_id) for user_id in member_ids],
+        "presences": (
+            [presence_payload(user_id, rng) for user_id in member_ids]
+            if intents.presences
+            else []
+        ),
+    }
+
+
+def message_payload(message_id: int, user_id: int) -> dict:
+    member = member_payload(user_id)
+    return {
+        "id": str(message_id),
+        "channel_id": str(CHANNEL_ID),
+        "guild_id": str(GUILD_ID),
+        "author": member.pop("user"),
+        "member": member,
+        "content": f"Has anyone seen movie {message_id}? " * 3,
+        "timestamp": TIMESTAMP,
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+    }
+
+
+async def feed_events(mode: str, members: int) -> dict:
+    from discord.ext import commands
+
+    if mode == "all_intents":
+        import discord
+
+        bot = commands.Bot(command_prefix="!", intents=discord.Intents.all())
+    else:
+        from bot.bot import gateway_options
+
+        bot = commands.Bot(command_prefix="!", **gateway_options())
+    await bot._async_setup_hook()  # Binds the loop, as login would
+    state = bot._connection
+    intents = state._intents
+    rng = random.Random(0)
+
+    start = time.process_time()
+    guild = state._add_guild_from_data(guild_payload(members, intents, rng))
+    if intents.guild_messages:
+        for number in range(MESSAGES):
+            user_id = 100 + rng.randrange(members)
+            state.parse_message_create(message_payload(1000 + number, user_id))
+            if number % 1000 == 0:
+                await asyncio.sleep(0)  # Let dispatched on_message tasks finish
+    if intents.presences:
+        for _ in range(PRESENCE_UPDATES):
+            user_id = 100 + rng.randrange(members)
+            state.parse_presence_update(presence_payload(user_id, rng))
+    await asyncio.sleep(0)
+    cpu_s = time.process_time() - start
+
+    return {
+        "cached_members": len(guild.members),
+        "cached_messages": len(state._messages or ()),
+        "cpu_s": round(cpu_s, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def run_case(mode: str, members: int) -> dict:
+    """Build the caches of one mode. Runs in a separate process."""
+    logging.disable(logging.WARNING)  # discord.py warns about the missing websocket
+    return asyncio.run(feed_events(mode, members))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--members", type=int, default=MEMBERS)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update", action="store_true", help="save a new baseline")
+    parser.add_argument(
+        "--check", action="store_true", help="fail if there is no baseline, for CI"
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for mode in ("all_intents", "minimal"):
+        logging.info(f"Feeding a guild of {args.members} members ({mode})")
+        results[mode] = run_isolated(run_case, mode, args.members)
+
+    saved = results["all_intents"]["peak_rss_mb"] - results["minimal"]["peak_rss_mb"]
+    logging.info(f"Minimal intents and caches save {saved:.1f} MB of peak RSS")
+    return report("gateway_cache", results, args.update, args.threshold, args.check)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+"""
+Benchmark of the wheel animation pipeline in bot/gif_generation.py.
+
+Runs offline on synthetic posters. Each wheel size is measured in its own
+process so peak RSS is not shared between cases.
+
+    python -m benchmarks.gif_generation            # compare with the baseline
+    python -m benchmarks.gif_generation --update   # save a new baseline
+    python -m benchmarks.gif_generation --check    # fail without a baseline
+"""
+import argparse
+import logging
+import random
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from benchmarks.common import DEFAULT_THRESHOLD, peak_rss_mb, report, run_isolated
+
+WHEEL_SIZES = (2, 5, 20, 100)
+POSTER_SIZE = (300, 450)
+CREATE_FRAME_SAMPLES = 200
+DECODE_ROUNDS = 5
+
+
+def make_poster(rng: random.Random) -> bytes:
+    """Draw a poster-like JPEG: a gradient with a few blurred shapes and a title"""
+    width, height = POSTER_SIZE
+    top = np.array([rng.randrange(256) for _ in range(3)])
+    bottom = np.array([rng.randrange(256) for _ in range(3)])
+    gradient = np.linspace(0, 1, height)[:, None, None]
+    pixels = (top * (1 - gradient) + bottom * gradient).astype(np.uint8)
+    image = Image.fromarray(np.repeat(pixels, width, axis=1))
+
+    draw = ImageDraw.Draw(image)
+    for _ in range(6):
+        x, y, r = rng.randrange(width), rng.randrange(height), rng.randrange(15, 90)
+        color = tuple(rng.randrange(256) for _ in range(3))
+        draw.ellipse([x - r, y - r, x + r, y + r], fill=color)
+    draw.text((20, height - 60), "Синтетичний фільм", fill="white")
+
+    buffer = BytesIO()
+    image.filter(ImageFilter.GaussianBlur(2)).save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def make_posters(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [make_poster(rng) for _ in range(count)]
+
+
+def run_case(wheel_size: int, output_format: str) -> dict:
+    """Measure one wheel size. Runs in a separate process."""
+    from bot import gif_generation
+
+    posters = make_posters(wheel_size)
+
+    _, zoomed_size = gif_generation.get_slot_sizes()
+    start = time.perf_counter()
+    for _ in range(DECODE_ROUNDS):
+        images = [gif_generation.load_poster(data, zoomed_size) for data in posters]
+    decode_s = (time.perf_counter() - start) / DECODE_ROUNDS
+
+    thumbnails = [gif_generation.make_thumbnails(image) for image in images] * 10
+    start = time.perf_counter()
+    for i in range(CREATE_FRAME_SAMPLES):
+        gif_generation.create_frame(thumbnails, i * 15.0, highlight=True)
+    create_frame_ms = (time.perf_counter() - start) / CREATE_FRAME_SAMPLES * 1000
+
+    start = time.perf_counter()
+    winner_index, animation = gif_generation.generate_case_opening_gif(
+        images, output_format=output_format
+    )
+    render_s = time.perf_counter() - start
+    if winner_index is None:
+        raise RuntimeError(f"Animation failed for wheel of {wheel_size}")
+
+    frames = [
+        gif_generation.create_frame(thumbnails, i * 15.0)[0]
+        for i in range(gif_generation.FRAMES_COUNT)
+    ]
+    durations = [int(gif_generation.FRAME_TIME * 1000)] * len(frames)
+    start = time.perf_counter()
+    gif_generation.encode_within_budget(frames, durations, output_format)
+    encode_s = time.perf_counter() - start
+
+    return {
+        "decode_s": round(decode_s, 4),
+        "create_frame_ms": round(create_frame_ms, 3),
+        "render_s": round(render_s, 3),
+        "encode_s": round(encode_s, 3),
+        "output_bytes": len(animation.fp.getvalue()),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=WHEEL_SIZES)
+    parser.add_argument("--format", default="gif", choices=("gif", "webp", "mp4"))
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update", action="store_true", help="save a new baseline")
+    parser.add_argument(
+        "--check", action="store_true", help="fail if there is no baseline, for CI"
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for wheel_size in args.sizes:
+        logging.info(f"Benchmarking wheel of {wheel_size} movies ({args.format})")
+        runs = [
+            run_isolated(run_case, wheel_size, args.format)
+            for _ in range(args.repeat)
+        ]
+        results[f"{args.format}_{wheel_size}"] = {
+            metric: min(run[metric] for run in runs) for metric in runs[0]
+        }
+
+    return report("gif_generation", results, args.update, args.threshold, args.check)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    raise SystemExit(main())
@@ -0,0 +1,184 @@
+"""
+Local replay of the Kinorium list pages the scraper reads.
+
+Serves recorded pages from benchmarks/fixtures/kinorium when they exist and
+synthetic pages from parser.kinorium_pages otherwise. Latency, error rate and
+account sizes are configurable. Point the scraper at it with
+KINORIUM_BASE_URL=http://127.0.0.1:8765.
+
+    python -m benchmarks.kinorium_replay serve --account 1:50:50 --latency-ms 80
+    python -m benchmarks.kinorium_replay record 112144   # needs the live site
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+from io import BytesIO
+
+from aiohttp import web
+from PIL import Image
+
+from parser.kinorium_pages import fixture_path, render_page
+
+LIST_TYPES = ("watchlist", "ratings")
+DEFAULT_PORT = 8765
+
+
+def make_poster() -> bytes:
+    """Small grey GIF served for every poster"""
+    buffer = BytesIO()
+    Image.new("RGB", (2, 3), "grey").save(buffer, format="GIF")
+    return buffer.getvalue()
+
+
+POSTER = make_poster()
+
+
+class ReplayServer:
+    """aiohttp server that plays Kinorium list pages back"""
+
+    def __init__(
+        self,
+        accounts: dict = None,
+        default_account: tuple = (50, 50),
+        latency_ms: float = 0,
+        error_rate: float = 0,
+        seed: int = 0,
+    ):
+        self.accounts = accounts or {}  # Kinorium ID -> (watchlist, rated) movies
+        self.default_account = default_account
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self._runner = None
+
+        self.app = web.Application()
+        self.app.router.add_get("/user/{kinorium_id}/{list_type}/", self.list_page)
+        self.app.router.add_get("/poster/{name}", self.poster)
+
+    async def list_page(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.latency_ms:
+            # Exponential spread around the mean, like a real network
+            await asyncio.sleep(self.random.expovariate(1000 / self.latency_ms))
+        if self.random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=503, headers={"Retry-After": "1"})
+
+        kinorium_id = int(request.match_info["kinorium_id"])
+        list_type = request.match_info["list_type"]
+        if list_type not in LIST_TYPES:
+            raise web.HTTPNotFound()
+        page = int(request.query.get("page", 1))
+        per_page = int(request.query.get("perpage", 100))
+
+        path = fixture_path(kinorium_id, list_type, page)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                body = f.read()
+        else:
+            watchlist, rated = self.accounts.get(kinorium_id, self.default_account)
+            is_rated = list_type == "ratings"
+            total = rated if is_rated else watchlist
+            body = render_page(total, page, per_page, is_rated)
+
+        self.bytes_sent += len(body.encode("utf-8"))
+        return web.Response(text=body, content_type="text/html")
+
+    async def poster(self, request: web.Request) -> web.Response:
+        self.bytes_sent += len(POSTER)
+        return web.Response(body=POSTER, content_type="image/gif")
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving, returns the base URL. Port 0 picks a free port."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+async def record(kinorium_id: int):
+    """Save the live list pages of an account as fixtures"""
+    from parser.scraper import (
+        PER_PAGE,
+        RATEDLIST_URL,
+        WATCHLIST_URL,
+        async_playwright,
+        get_total_pages,
+        load_page,
+    )
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        for list_type, url in zip(LIST_TYPES, (WATCHLIST_URL, RATEDLIST_URL)):
+            is_rated = list_type == "ratings"
+            total_pages = await get_total_pages(kinorium_id, is_rated=is_rated)
+            url = url.format(kinorium_id=kinorium_id, PER_PAGE=PER_PAGE)
+            for number in range(1, total_pages + 1):
+                await load_page(page, f"{url}&page={number}")
+                path = fixture_path(kinorium_id, list_type, number)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(await page.content())
+                logging.info(f"Recorded {path}")
+        await browser.close()
+
+
+def parse_account(value: str) -> tuple:
+    """'ID:WATCHLIST:RATED' -> (ID, (WATCHLIST, RATED))"""
+    kinorium_id, watchlist, rated = (int(part) for part in value.split(":"))
+    return kinorium_id, (watchlist, rated)
+
+
+async def serve(args):
+    server = ReplayServer(
+        dict(args.account), latency_ms=args.latency_ms, error_rate=args.error_rate
+    )
+    base_url = await server.start(port=args.port)
+    logging.info(f"Replaying Kinorium at {base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="serve list pages")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument(
+        "--account",
+        type=parse_account,
+        action="append",
+        default=[],
+        help="ID:WATCHLIST:RATED movie counts of a synthetic account",
+    )
+    serve_parser.add_argument("--latency-ms", type=float, default=0)
+    serve_parser.add_argument("--error-rate", type=float, default=0)
+
+    record_parser = subparsers.add_parser("record", help="save live pages as fixtures")
+    record_parser.add_argument("kinorium_id", type=int)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        asyncio.run(serve(args))
+    else:
+        asyncio.run(record(args.kinorium_id))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    main()
@@ -0,0 +1,331 @@
+"""
+Load test of the bot commands with fake Discord contexts.
+
+Seeds a SQLite database in a temporary directory, builds the bot with
+create_bot() and calls the registered command callbacks and the wheel button
+callbacks directly with fake ctx and Interaction objects, nothing connects to
+Discord. Posters for !spin come from a local replay server. Reports
+throughput, latency percentiles and error rates per operation.
+
+    python -m benchmarks.load_test                          # compare with the baseline
+    python -m benchmarks.load_test --concurrency 50 --operations 5000
+    python -m benchmarks.load_test --mix random=1 search=1  # only these operations
+    python -m benchmarks.load_test --update                 # save a new baseline
+    python -m benchmarks.load_test --check                  # fail without a baseline
+"""
+import argparse
+import asyncio
+import datetime
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+
+from benchmarks.common import DEFAULT_THRESHOLD, peak_rss_mb, report, run_isolated
+from benchmarks.kinorium_replay import ReplayServer
+
+DEFAULT_MIX = {"random": 40, "search": 30, "wheel": 25, "spin": 5}
+USERS = 200
+MOVIES = 5000
+MOVIES_PER_USER = 100
+GUILDS = 20
+WHEEL_SIZE = 20  # Movies put in every guild's wheel before the run
+SEARCH_WORDS = ("Фільм", "Movie", "1", "42", "7", "Режисер", "ніщо")
+BUSY_REPLIES = ("already spinning",)  # Expected refusals, not errors
+
+
+class FakeMessage:
+    def __init__(self, channel, content=None):
+        self.channel = channel
+        self.content = content
+        self.pinned = False
+
+    async def delete(self):
+        pass
+
+    async def edit(self, **kwargs):
+        self.content = kwargs.get("content", self.content)
+
+
+class FakeChannel:
+    """Collects everything the bot sends, in place of a Discord channel"""
+
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append(content or "")
+        return FakeMessage(self, content)
+
+
+class FakeContext:
+    """The parts of commands.Context the commands use"""
+
+    def __init__(self, bot, discord_id: int, guild_id: int):
+        self.bot = bot
+        self.author = SimpleNamespace(id=discord_id, name=f"user{discord_id}")
+        self.guild = SimpleNamespace(id=guild_id)
+        self.channel = FakeChannel(guild_id * 10)
+        self.message = FakeMessage(self.channel)
+
+    async def send(self, content=None, **kwargs):
+        return await self.channel.send(content, **kwargs)
+
+
+class FakeInteraction:
+    """The parts of discord.Interaction the button callbacks use"""
+
+    def __init__(self, ctx: FakeContext):
+        self.user = ctx.author
+        self.guild = ctx.guild
+        self.channel = ctx.channel
+        self.message = ctx.message
+        self.response = SimpleNamespace(
+            edit_message=self._reply,
+            send_message=self._reply,
+            defer=self._reply,
+        )
+        self.followup = SimpleNamespace(send=self._reply)
+
+    async def _reply(self, content=None, **kwargs):
+        await self.channel.send(content, **kwargs)
+
+
+class PosterServer:
+    """Replay server on its own thread, !spin downloads posters with blocking requests"""
+
+    def __init__(self):
+        self.server = ReplayServer()
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    def start(self) -> str:
+        return self._call(self.server.start())
+
+    def stop(self):
+        self._call(self.server.stop())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+
+def seed_database(base_url: str, rng: random.Random):
+    """Users with Watch Later lists, movies with local posters and search sites"""
+    from sqlalchemy import create_engine, insert
+
+    from database.models import Movie, MovieSearchSite, User, UserMovie, UserMovieStatus
+
+    engine = create_engine("sqlite:///./movies.db")
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Movie),
+            [
+                {
+                    "title": f"Фільм {number}",
+                    "original_name": f"Movie {number}",
+                    "release_year": 1950 + number % 75,
+                    "genre": "драма",
+                    "runtime": 90 + number % 60,
+                    "director": f"Режисер {number % 500}",
+                    "kinorium_title_link": f"{base_url}/{number}/",
+                    "kinorium_rating": 5 + number % 50 / 10,
+                    "imdb_rating": 4 + number % 60 / 10,
+                    "image_url": f"{base_url}/poster/{number}.gif",
+                }
+                for number in range(1, MOVIES + 1)
+            ],
+        )
+        connection.execute(
+            insert(User),
+            [
+                {"discord_id": str(number), "kinorium_id": number, "username": f"u{number}"}
+                for number in range(1, USERS + 1)
+            ],
+        )
+        connection.execute(
+            insert(UserMovie),
+            [
+                {
+                    "user_id": user_id,
+                    "movie_id": movie_id,
+                    "status": UserMovieStatus.WATCH_LATER,
+                    "added_date": datetime.date(2024, 1, 1),
+                }
+                for user_id in range(1, USERS + 1)
+                for movie_id in rng.sample(range(1, MOVIES + 1), MOVIES_PER_USER)
+            ],
+        )
+        connection.execute(
+            insert(MovieSearchSite),
+            [
+                {"name": "Site", "query_template": "https://example.com/?q="},
+                {"name": "Other", "query_template": "https://example.org/search/"},
+            ],
+        )
+    engine.dispose()
+
+
+async def fill_wheels(rng: random.Random):
+    from services.movie_wheel_service import MovieWheelService, WheelScope
+
+    wheel_service = MovieWheelService()
+    for guild_id in range(1, GUILDS + 1):
+        scope = WheelScope(guild_id, None)
+        for movie_id in rng.sample(range(1, MOVIES + 1), WHEEL_SIZE):
+            await wheel_service.add_movie_to_wheel(
+                movie_id=movie_id, user_id=rng.randint(1, USERS), scope=scope
+            )
+
+
+def make_operations(bot, rng: random.Random) -> dict:
+    """Operation name -> coroutine function taking a fake ctx"""
+    from bot.commands import AddToWheelButton, movie_service, user_service
+
+    random_command = bot.get_command("random").callback
+    search_command = bot.get_command("search").callback
+    wheel_command = bot.get_command("wheel").callback
+    spin_command = bot.get_command("spin").callback
+
+    async def wheel(ctx):
+        # Press "Add to wheel" under a movie, then look at the wheel
+        movie_id = rng.randint(1, MOVIES)
+        movie = SimpleNamespace(id=movie_id, title=f"Фільм {movie_id}")
+        user_id = await user_service.get_user_by_discord_id(ctx.author.id)
+        sites = await movie_service.get_all_search_sites()
+        button = AddToWheelButton(user_id, movie, sites)
+        await button.callback(FakeInteraction(ctx))
+        await wheel_command(ctx)
+
+    return {
+        "random": random_command,
+        "search": lambda ctx: search_command(ctx, query=rng.choice(SEARCH_WORDS)),
+        "wheel": wheel,
+        "spin": spin_command,
+    }
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(latencies: list, errors: int, busy: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "operations": len(ordered),
+        "throughput_per_s": round(len(ordered) / elapsed, 2),
+        "p50_ms": round(percentile(ordered, 0.5) * 1000, 1),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 1),
+        "error_rate": round(errors / len(ordered), 4),
+        "busy_rate": round(busy / len(ordered), 4),
+    }
+
+
+async def run_load(operations: int, concurrency: int, mix: dict, seed: int) -> dict:
+    rng = random.Random(seed)
+    server = PosterServer()
+    base_url = server.start()
+
+    from bot.bot import create_bot
+    from database.db import connect_db, disconnect_db, ensure_schema
+
+    logging.disable(logging.WARNING)  # Commands log every miss and lookup
+    bot = create_bot()
+    await ensure_schema()
+    seed_database(base_url, rng)
+    await connect_db()
+    try:
+        await fill_wheels(rng)
+        handlers = make_operations(bot, rng)
+        names = rng.choices(list(mix), weights=list(mix.values()), k=operations)
+        latencies = defaultdict(list)
+        errors = defaultdict(int)
+        busy = defaultdict(int)
+
+        async def worker():
+            while names:
+                name = names.pop()
+                ctx = FakeContext(bot, rng.randint(1, USERS), rng.randint(1, GUILDS))
+                start = time.perf_counter()
+                try:
+                    await handlers[name](ctx)
+                    replies = ctx.channel.sent
+                    if any(r.startswith("❌") for r in replies):
+                        errors[name] += 1
+                    elif any(b in r for r in replies for b in BUSY_REPLIES):
+                        busy[name] += 1
+                except Exception as e:
+                    logging.getLogger(__name__).debug(f"{name} failed: {e}")
+                    errors[name] += 1
+                latencies[name].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await disconnect_db()
+        server.stop()
+
+    results = {
+        name: summarize(latencies[name], errors[name], busy[name], elapsed)
+        for name in mix
+        if latencies[name]
+    }
+    results["all"] = summarize(
+        [latency for values in latencies.values() for latency in values],
+        sum(errors.values()),
+        sum(busy.values()),
+        elapsed,
+    )
+    results["all"]["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return results
+
+
+def run_case(*args) -> dict:
+    """Run the load test. Runs in a separate process."""
+    os.chdir(tempfile.mkdtemp(prefix="load-test-"))  # movies.db goes here
+    return asyncio.run(run_load(*args))
+
+
+def parse_mix(values: list) -> dict:
+    """['random=40', 'spin=5'] -> {'random': 40, 'spin': 5}"""
+    mix = {}
+    for value in values:
+        name, weight = value.split("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown operation {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    default_mix = " ".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items())
+    parser.add_argument("--mix", nargs="+", help=f"NAME=WEIGHT, default {default_mix}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update", action="store_true", help="save a new baseline")
+    parser.add_argument(
+        "--check", action="store_true", help="fail if there is no baseline, for CI"
+    )
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    logging.info(
+        f"Running {args.operations} operations at concurrency {args.concurrency}"
+    )
+    results = run_isolated(run_case, args.operations, args.concurrency, mix, args.seed)
+    return report("load_test", results, args.update, args.threshold, args.check)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    raise SystemExit(main())
@@ -0,0 +1,263 @@
+"""
+Benchmark of every repository method on a large synthetic catalog.
+
+Generates the catalog with benchmarks.catalog once per size and seed and
+keeps it in benchmarks/catalogs/. Each run works on a copy in a temporary
+directory, so methods that write do not change the cached catalog. Every
+method of MovieRepository, UserRepository and WheelRepository is called with
+random arguments; the timings and the SQLite query plan of each method are
+saved with the baseline, and changed plans are reported.
+
+    python -m benchmarks.repositories                  # compare with the baseline
+    python -m benchmarks.repositories --movies 50000 --users 5000 --calls 50
+    python -m benchmarks.repositories --update         # save a new baseline
+    python -m benchmarks.repositories --check          # fail without a baseline
+"""
+import argparse
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from benchmarks import catalog
+from benchmarks.common import (
+    DEFAULT_THRESHOLD,
+    load_baseline,
+    peak_rss_mb,
+    report,
+    run_isolated,
+)
+
+CATALOG_DIR = os.path.join(os.path.dirname(__file__), "catalogs")
+CALLS = 20  # Calls per method
+METHOD_BUDGET_SECONDS = 15  # Fewer calls for methods slower than this in total
+SEARCH_WORDS = ("ніч", "Темна", "зірка", "THE", "Shadow", "мелодія", "1999", "ніщо")
+QUERY_METHODS = ("execute", "fetch_all", "fetch_one", "fetch_val")
+
+
+def catalog_path(movies: int, users: int, wheels: int, seed: int) -> str:
+    """Generate the catalog if it is not cached yet"""
+    path = os.path.join(CATALOG_DIR, f"catalog_{movies}_{users}_{wheels}_{seed}.db")
+    if not os.path.exists(path):
+        os.makedirs(CATALOG_DIR, exist_ok=True)
+        logging.info(f"Generating {movies} movies and {users} users into {path}")
+        partial = path + ".partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        catalog.generate(partial, movies, users, wheels, seed)
+        os.replace(partial, path)
+    return path
+
+
+def method_cases(sizes: tuple, database, rng: random.Random) -> dict:
+    """'Repository.method' -> function returning the arguments of the next call"""
+    from database.models import UserMovieStatus
+
+    movies, users, wheels = sizes
+
+    def discord_id():
+        return str(100000000000000000 + rng.randint(1, users))
+
+    def wheel_id():
+        return rng.randint(1, wheels)
+
+    def wheel_name():
+        return f"Guild {900000000000000000 + rng.randint(1, wheels - 1)}"
+
+    new_wheels = iter(range(1, 10**9))
+    # clear_wheel empties wheels, take them from the end so the reads still see entries
+    cleared_wheels = iter(range(wheels, 1, -1))
+
+    return {
+        "MovieRepository.search_by_title": lambda: (rng.choice(SEARCH_WORDS),),
+        "MovieRepository.get_random_movies": lambda: (rng.randint(1, users), 5),
+        "MovieRepository.add_search_site": lambda: ("Site", "https://example.com/?q="),
+        "MovieRepository.get_all_search_sites": lambda: (),
+        "UserRepository.get_user_by_discord_id": lambda: (discord_id(),),
+        "UserRepository.get_user_by_kinorium_id": lambda: (
+            1000000 + rng.randint(1, users),
+        ),
+        "UserRepository.get_kinorium_id_by_discord_id": lambda: (discord_id(),),
+        "UserRepository.get_all_users": lambda: (),
+        "UserRepository.get_movie_count_by_status": lambda: (
+            rng.randint(1, users),
+            rng.choice(list(UserMovieStatus)),
+        ),
+        "WheelRepository.get_wheel": lambda: (wheel_name(),),
+        "WheelRepository.create_wheel": lambda: (f"Benchmark {next(new_wheels)}",),
+        "WheelRepository.get_global_wheel": lambda: (),
+        "WheelRepository.create_global_wheel": lambda: (),
+        "WheelRepository.get_wheel_version": lambda: (wheel_id(),),
+        "WheelRepository.add_movie_to_wheel": lambda: (
+            rng.randint(1, movies),
+            rng.randint(1, users),
+            wheel_id(),
+        ),
+        "WheelRepository.delete_movie_from_wheel": lambda: (
+            rng.randint(1, movies),
+            wheel_id(),
+        ),
+        "WheelRepository.get_movies_in_wheel": lambda: (wheel_id(),),
+        "WheelRepository.get_wheel_entries": lambda: (wheel_id(),),
+        "WheelRepository.get_wheel_users": lambda: (wheel_id(),),
+        "WheelRepository.get_winner_user": lambda: (
+            rng.randint(1, movies),
+            wheel_id(),
+        ),
+        "WheelRepository.bump_version": lambda: (database, wheel_id()),
+        "WheelRepository.clear_wheel": lambda: (next(cleared_wheels),),
+    }
+
+
+def repository_methods() -> dict:
+    """'Repository.method' -> bound method, for every public repository method"""
+    from database.repositories.movie_repository import MovieRepository
+    from database.repositories.movie_wheel_repository import WheelRepository
+    from database.repositories.user_repository import UserRepository
+
+    methods = {}
+    for repository in (MovieRepository, UserRepository, WheelRepository):
+        for name, method in inspect.getmembers(repository, inspect.iscoroutinefunction):
+            if not name.startswith("_"):
+                methods[f"{repository.__name__}.{name}"] = method
+    return methods
+
+
+class QueryRecorder:
+    """Records the queries sent through the databases connection"""
+
+    def __init__(self, database):
+        self.queries = []
+        for method_name in QUERY_METHODS:
+            method = getattr(database, method_name)
+            setattr(database, method_name, self._wrap(method))
+
+    def _wrap(self, method):
+        @functools.wraps(method)
+        async def wrapper(query, *args, **kwargs):
+            self.queries.append(query)
+            return await method(query, *args, **kwargs)
+
+        return wrapper
+
+
+def query_plan(connection: sqlite3.Connection, query) -> str:
+    """EXPLAIN QUERY PLAN of a SQLAlchemy query, one line per step"""
+    from sqlalchemy.dialects import sqlite
+
+    if isinstance(query, str):
+        return ""  # PRAGMA and raw statements have no interesting plan
+    compiled = query.compile(
+        dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    try:
+        rows = connection.execute(f"EXPLAIN QUERY PLAN {compiled}").fetchall()
+    except sqlite3.Error as e:
+        return f"unavailable: {e}"
+    return "; ".join(detail for _, _, _, detail in rows)
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_methods(sizes: tuple, calls: int, seed: int) -> dict:
+    from database.db import connect_db, database, disconnect_db
+
+    rng = random.Random(seed)
+    methods = repository_methods()
+    cases = method_cases(sizes, database, rng)
+    missing = sorted(set(methods) - set(cases))
+    for name in missing:
+        logging.warning(f"{name} has no benchmark case, add it to method_cases")
+
+    await connect_db()
+    recorder = QueryRecorder(database)
+    plans = sqlite3.connect("movies.db")
+    results = {}
+    try:
+        for name, arguments in cases.items():
+            if name not in methods:
+                logging.warning(f"{name} no longer exists, skipped")
+                continue
+            method = methods[name]
+            timings = []
+            queries = []
+            for _ in range(calls):
+                recorder.queries = []
+                start = time.perf_counter()
+                await method(*arguments())
+                timings.append(time.perf_counter() - start)
+                queries = recorder.queries
+                if sum(timings) > METHOD_BUDGET_SECONDS:
+                    break
+            timings.sort()
+            results[name] = {
+                "calls": len(timings),
+                "p50_ms": round(percentile(timings, 0.5) * 1000, 2),
+                "p95_ms": round(percentile(timings, 0.95) * 1000, 2),
+                "plan": " | ".join(
+                    plan for plan in (query_plan(plans, q) for q in queries) if plan
+                ),
+            }
+            logging.info(f"{name}: p50 {results[name]['p50_ms']} ms")
+    finally:
+        plans.close()
+        await disconnect_db()
+    results["process"] = {"peak_rss_mb": round(peak_rss_mb(), 1)}
+    return results
+
+
+def run_case(path: str, sizes: tuple, calls: int, seed: int) -> dict:
+    """Benchmark the methods on a copy of the catalog. Runs in a separate process."""
+    os.chdir(tempfile.mkdtemp(prefix="repositories-"))
+    shutil.copyfile(path, "movies.db")  # database.db always opens ./movies.db
+    try:
+        return asyncio.run(run_methods(sizes, calls, seed))
+    finally:
+        os.remove("movies.db")
+
+
+def changed_plans(results: dict, baseline: dict) -> list:
+    changes = []
+    for name, metrics in results.items():
+        old_plan = baseline.get(name, {}).get("plan")
+        if old_plan is not None and metrics.get("plan") != old_plan:
+            changes.append(f"{name}:\n    was: {old_plan}\n    now: {metrics['plan']}")
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--movies", type=int, default=catalog.MOVIES)
+    parser.add_argument("--users", type=int, default=catalog.USERS)
+    parser.add_argument("--wheels", type=int, default=catalog.WHEELS)
+    parser.add_argument("--calls", type=int, default=CALLS, help="calls per method")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update", action="store_true", help="save a new baseline")
+    parser.add_argument(
+        "--check", action="store_true", help="fail if there is no baseline, for CI"
+    )
+    args = parser.parse_args()
+
+    sizes = (args.movies, args.users, args.wheels)
+    path = catalog_path(*sizes, args.seed)
+    results = run_isolated(run_case, path, sizes, args.calls, args.seed)
+
+    baseline = load_baseline("repositories")
+    if baseline is not None and not args.update:
+        for change in changed_plans(results, baseline):
+            logging.warning(f"Query plan changed for {change}")
+    return report("repositories", results, args.update, args.threshold, args.check)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    raise SystemExit(main())
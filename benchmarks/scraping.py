@@ -0,0 +1,128 @@
+"""
+Benchmark of a full list sync against the Kinorium replay server.
+
+Each account size runs in its own process with a fresh database in a
+temporary directory: the user is queued, the scrape workers drain the queue
+through headless Chromium, and the sync is timed end to end. Needs the
+Playwright Chromium build (playwright install chromium).
+
+    python -m benchmarks.scraping                  # compare with the baseline
+    python -m benchmarks.scraping --sizes 100 --latency-ms 150
+    python -m benchmarks.scraping --update         # save a new baseline
+    python -m benchmarks.scraping --check          # fail without a baseline
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.common import (
+    DEFAULT_THRESHOLD,
+    children_peak_rss_mb,
+    peak_rss_mb,
+    report,
+    run_isolated,
+)
+from benchmarks.kinorium_replay import ReplayServer
+
+ACCOUNT_SIZES = (100, 1000, 10000)  # Movies per account, split between both lists
+KINORIUM_ID = 1
+RETRY_DELAY = 1
+
+
+async def sync_account(
+    total_movies: int, concurrency: int, latency_ms: float, error_rate: float
+) -> dict:
+    watchlist = total_movies // 2
+    server = ReplayServer(
+        {KINORIUM_ID: (watchlist, total_movies - watchlist)},
+        latency_ms=latency_ms,
+        error_rate=error_rate,
+    )
+    # The scraper reads the base URL on import, so it is imported after this
+    os.environ["KINORIUM_BASE_URL"] = await server.start()
+
+    from sqlalchemy import func, insert, select
+
+    from database.db import connect_db, disconnect_db, get_db, init_db
+    from database.models import ScrapeTask, User, UserMovie
+    from parser.worker import queue_service, work
+    from services import scrape_queue_service
+
+    # Retry failed pages quickly instead of with the production backoff
+    scrape_queue_service.RETRY_DELAY = RETRY_DELAY
+
+    logging.disable(logging.INFO)  # The scraper logs every page and SQL statement
+    init_db()
+    await connect_db()
+    try:
+        db = await get_db()
+        user_id = await db.execute(
+            insert(User).values(discord_id="1", kinorium_id=KINORIUM_ID)
+        )
+
+        start = time.perf_counter()
+        await queue_service.enqueue_user(user_id, KINORIUM_ID)
+        await asyncio.gather(
+            *(work(slot, exit_when_empty=True) for slot in range(concurrency))
+        )
+        sync_s = time.perf_counter() - start
+
+        pages = await db.fetch_val(
+            select(func.count()).select_from(ScrapeTask).where(ScrapeTask.page > 0)
+        )
+        movies = await db.fetch_val(
+            select(func.count()).select_from(UserMovie).where(
+                UserMovie.user_id == user_id
+            )
+        )
+    finally:
+        await disconnect_db()
+        await server.stop()
+
+    if movies != total_movies:
+        logging.warning(f"Synced {movies} of {total_movies} movies")
+    return {
+        "sync_s": round(sync_s, 2),
+        "pages_per_s": round(pages / sync_s, 3),
+        "requests": server.requests,
+        "served_bytes": server.bytes_sent,
+        "browser_peak_mb": round(children_peak_rss_mb(), 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def run_case(total_movies: int, *args) -> dict:
+    """Sync one account. Runs in a separate process."""
+    os.chdir(tempfile.mkdtemp(prefix="scraping-bench-"))  # movies.db goes here
+    return asyncio.run(sync_account(total_movies, *args))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=ACCOUNT_SIZES)
+    parser.add_argument("--concurrency", type=int, default=4, help="worker slots")
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update", action="store_true", help="save a new baseline")
+    parser.add_argument(
+        "--check", action="store_true", help="fail if there is no baseline, for CI"
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for total_movies in args.sizes:
+        logging.info(f"Syncing an account of {total_movies} movies")
+        results[f"movies_{total_movies}"] = run_isolated(
+            run_case, total_movies, args.concurrency, args.latency_ms, args.error_rate
+        )
+
+    return report("scraping", results, args.update, args.threshold, args.check)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    raise SystemExit(main())
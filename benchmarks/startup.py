@@ -0,0 +1,129 @@
+"""
+Benchmark of bot startup: import time and time until the bot could connect.
+
+Import time comes from python -X importtime. Time-to-ready covers importing
+the bot, registering commands and the one-time schema setup, measured in a
+fresh process against a new database (cold) and an existing one (warm).
+Heavy modules needed only by scrapes and spins must not be loaded at startup.
+
+    python -m benchmarks.startup                  # check budgets and the baseline
+    python -m benchmarks.startup --budget 1.5
+    python -m benchmarks.startup --update         # save a new baseline
+    python -m benchmarks.startup --check          # fail without a baseline
+"""
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import DEFAULT_THRESHOLD, peak_rss_mb, report, run_isolated
+
+READY_BUDGET = 2.0  # Seconds from process start to ready, without the gateway
+# Loaded by the first scrape or spin, never by startup
+HEAVY_MODULES = ("playwright", "numpy", "PIL", "requests")
+TOP_IMPORTS = 10
+
+
+def parse_importtime(output: str) -> list:
+    """
+    Parse the stderr of python -X importtime
+
+    Returns:
+        list: (module, depth, cumulative seconds) in import order
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, int(cumulative) / 1_000_000))
+    return entries
+
+
+def measure_imports() -> dict:
+    """Import the bot module with -X importtime in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import bot.bot"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = parse_importtime(result.stderr)
+    heavy = sorted(
+        {name for name, _, _ in entries if name.split(".")[0] in HEAVY_MODULES}
+    )
+    for name in heavy:
+        logging.error(f"{name} is imported at startup")
+
+    top = sorted((entry for entry in entries if entry[1] == 0), key=lambda e: -e[2])
+    for name, _, seconds in top[:TOP_IMPORTS]:
+        logging.info(f"{seconds * 1000:8.1f} ms  {name}")
+    import_s = sum(seconds for _, depth, seconds in entries if depth == 0)
+    return {
+        "import_s": round(import_s, 3),
+        "heavy_modules": len(heavy),
+    }
+
+
+async def start_bot() -> float:
+    """Everything the bot does before connecting to the gateway"""
+    start = time.perf_counter()
+    from bot.bot import create_bot
+    from database.db import disconnect_db
+
+    bot = create_bot()
+    await bot.setup_hook()
+    ready_s = time.perf_counter() - start
+    await disconnect_db()
+    return ready_s
+
+
+def run_case(directory: str) -> dict:
+    """Start the bot once. Runs in a separate process."""
+    os.chdir(directory)  # movies.db goes here
+    return {
+        "ready_s": round(asyncio.run(start_bot()), 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--budget", type=float, default=READY_BUDGET, help="seconds to ready"
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update", action="store_true", help="save a new baseline")
+    parser.add_argument(
+        "--check", action="store_true", help="fail if there is no baseline, for CI"
+    )
+    args = parser.parse_args()
+
+    results = {"imports": measure_imports()}
+    directory = tempfile.mkdtemp(prefix="startup-bench-")
+    # The first start creates the schema, the second finds it up to date
+    results["cold"] = run_isolated(run_case, directory)
+    results["warm"] = run_isolated(run_case, directory)
+
+    over_budget = [
+        case for case in ("cold", "warm") if results[case]["ready_s"] > args.budget
+    ]
+    for case in over_budget:
+        logging.error(
+            f"{case} start took {results[case]['ready_s']}s, budget is {args.budget}s"
+        )
+
+    exit_code = report("startup", results, args.update, args.threshold, args.check)
+    if over_budget or results["imports"]["heavy_modules"]:
+        return 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    raise SystemExit(main())
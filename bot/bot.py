@@ -4,19 +4,51 @@ from dotenv import load_dotenv
 import os
 from bot import events as bot_events
 from bot import commands as bot_commands
-from database.db import init_db
+from bot.sharding import shard_options
+from config.settings import (
+    DISCORD_CACHE_MEMBERS,
+    DISCORD_MAX_MESSAGES,
+    DISCORD_SHARDING,
+)
 
 load_dotenv()
 
 TOKEN = os.getenv("DISCORD_TOKEN")
 
-intents = discord.Intents.all()
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+def gateway_options() -> dict:
+    """Intents and caches of the gateway connection"""
+    # Prefix commands need guild and message events with their content, nothing
+    # reads members or presences, so they are neither requested nor cached
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.guild_messages = True
+    intents.dm_messages = True
+    intents.message_content = True
+    intents.members = DISCORD_CACHE_MEMBERS
 
-init_db()
+    return {
+        "intents": intents,
+        "max_messages": DISCORD_MAX_MESSAGES or None,
+        "member_cache_flags": discord.MemberCacheFlags.from_intents(intents),
+        # Members are never fetched in bulk, even with the members intent
+        "chunk_guilds_at_startup": False,
+    }
 
-bot_events.register_events(bot)
-bot_commands.register_commands(bot)
 
-bot.run(f"{TOKEN}")
+def create_bot() -> commands.Bot:
+    if DISCORD_SHARDING:
+        # One gateway connection per shard, optionally only some shards per process
+        bot = commands.AutoShardedBot(
+            command_prefix="!", **gateway_options(), **shard_options()
+        )
+    else:
+        bot = commands.Bot(command_prefix="!", **gateway_options())
+
+    bot_events.register_events(bot)
+    bot_commands.register_commands(bot)
+    return bot
+
+
+if __name__ == "__main__":
+    create_bot().run(f"{TOKEN}")
@@ -0,0 +1,69 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Optional
+
+from config.settings import COMMAND_SYNC_STATE_PATH
+
+
+def command_tree_hash(tree, application_id) -> str:
+    """Hash of the global slash commands as they would be sent to Discord"""
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands()),
+        key=lambda command: (command.get("type", 1), command["name"]),
+    )
+    # The same tree under another bot account still has to be synced
+    data = json.dumps(
+        {"application_id": application_id, "commands": payload},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class CommandSync:
+    """
+    Syncs the slash command tree only when it differs from the last sync
+
+    tree.sync() is a rate-limited global call, while on_ready fires again
+    after every gateway reconnect. The hash of the last synced tree is kept
+    in a file, so restarts and reconnects with the same commands skip it.
+    """
+
+    def __init__(self, path: str = COMMAND_SYNC_STATE_PATH):
+        self.path = path
+
+    def load_hash(self) -> Optional[str]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def save_hash(self, tree_hash: str):
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            f.write(tree_hash)
+        os.replace(temporary_path, self.path)
+
+    async def sync(self, bot, force: bool = False) -> Optional[int]:
+        """
+        Sync the command tree if it changed since the last sync
+
+        Args:
+            bot: Bot whose tree is synced
+            force (bool): Sync even if the tree is unchanged
+
+        Returns:
+            Optional[int]: Number of synced commands, None if the sync was skipped
+        """
+        tree_hash = command_tree_hash(bot.tree, bot.application_id)
+        if not force and tree_hash == self.load_hash():
+            logging.info("Slash commands unchanged, skipping sync")
+            return None
+
+        synced = await bot.tree.sync()
+        self.save_hash(tree_hash)
+        logging.info(f"Synchronized {len(synced)} slash commands")
+        return len(synced)
@@ -1,26 +1,23 @@
-import asyncio
+import os
 from discord.ui import View, Button, Select
 from discord import Embed, ButtonStyle, SelectOption, Interaction, InteractionResponse
 from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError
 from services.movie_service import MovieService
-from services.movie_wheel_service import MovieWheelService
+from services.movie_wheel_service import MovieWheelService, WheelScope
 from services.user_service import UserService
-from database.models import User
-from database.db import get_db, connect_db, disconnect_db
-from parser.scraper import (
-    get_total_pages,
-    fetch_movies_from_page,
-    get_total_movies,
-    save_movies_to_db,
-)
+from services.scrape_job_service import ScrapeJobService
+from services.refresh_service import RefreshService
+from database.models import User, ScrapeJobStatus
+from database.db import get_db
 from urllib.parse import quote
-from bot.gif_generation import delete_gif
-from bot.gif_generation import (
-    send_gif,
-    anitmation_runtime,
-    create_gif_and_get_winner_movie,
-)
+from bot.spin_coordinator import SpinCoordinator
+from bot.progress_reporter import ProgressReporter
+from bot.refresh_scheduler import RefreshScheduler
+from bot.command_sync import CommandSync
+from bot.loop_monitor import LoopMonitor
+from services.tracing import traced
+from config.settings import WHEEL_PER_CHANNEL
 import logging
 from discord.ext import commands
 
@@ -28,6 +25,13 @@ from discord.ext import commands
 movie_service = MovieService()
 user_service = UserService()
 wheel_service = MovieWheelService()
+scrape_job_service = ScrapeJobService()
+spin_coordinator = SpinCoordinator()
+refresh_service = RefreshService()
+refresh_scheduler = RefreshScheduler()
+command_sync = CommandSync()
+loop_monitor = LoopMonitor()
+profile_operations = {}  # Name -> (coroutine function, description) for !profile
 
 
 async def link_user_to_kinorium(discord_id, kinorium_id, user_name):
@@ -38,102 +42,68 @@ async def link_user_to_kinorium(discord_id, kinorium_id, user_name):
             discord_id=discord_id, kinorium_id=kinorium_id, username=user_name
         )
         await db.execute(query)
+        user_service.invalidate_cache()
     except IntegrityError as e:
         logging.error(f"User with this ID already exists in database: {e}")
     except Exception as e:
         logging.error(f"Error saving connection to database: {e}")
 
 
-async def scrape_page_and_update_progress(
-    page_number: int,
-    kinorium_id: int,
-    progress_queue: asyncio.Queue,
-    is_rated: bool = False,
-) -> list:
-    """Gets movie data from a specific page and updates progress."""
-    movies_data = await fetch_movies_from_page(
-        page_number, kinorium_id, is_rated=is_rated
-    )
-    await progress_queue.put(len(movies_data))  # Update progress
-    return movies_data
-
+async def scrape_user_movies(kinorium_id: int, ctx, job_id: int):
+    """Runs the scrape job of a user and keeps a progress message in the channel."""
+    # Playwright is loaded on the first scrape, not when the bot starts
+    from parser.scrape_job import prepare_job, run_job
 
-async def scrape_user_movies(kinorium_id: int, ctx):
-    """Gets all pages and parses them asynchronously for a specific user."""
-    await connect_db()
+    progress = None
     try:
-        # Get total pages and movies count for each list
-        total_pages_watch_list = await get_total_pages(kinorium_id, is_rated=False)
-        total_movies_watch_list = await get_total_movies(kinorium_id, is_rated=False)
-        total_pages_rated_list = await get_total_pages(kinorium_id, is_rated=True)
-        total_movies_rated_list = await get_total_movies(kinorium_id, is_rated=True)
-
-        # Total movies count
-        total_movies = total_movies_watch_list + total_movies_rated_list
+        job = await prepare_job(kinorium_id, job_id)
 
         # Start parsing message
         progress_message = await ctx.send(
-            f"Parsing movies... 0 of {total_movies} completed."
+            f"Parsing movies... {job.movies_done} of {job.movies_total} completed."
         )
 
-        # Queue for progress updates
-        progress_queue = asyncio.Queue()
+        progress = ProgressReporter(
+            progress_message,
+            job.movies_total,
+            template="Parsing movies... {done} of {total} completed.",
+        )
+        progress.done = job.movies_done
 
-        # Tasks for page parsing
-        tasks = []
+        await run_job(kinorium_id, job_id, progress)
 
-        # Parse pages for "Watch Later" list
-        for page in range(1, total_pages_watch_list + 1):
-            tasks.append(
-                scrape_page_and_update_progress(
-                    page, kinorium_id, progress_queue, is_rated=False
-                )
-            )
+        logging.info(f"Found movies: {progress.done}")
+        await progress.finish(
+            f"Movie parsing completed! Total movies: {job.movies_total}."
+        )
+    except Exception as e:
+        logging.error(f"Error parsing movies: {e}")
+        if progress is not None:
+            await progress.finish()
+        await ctx.send("Error parsing movies.")
+        raise
 
-        # Parse pages for "Rated Movies" list
-        for page in range(1, total_pages_rated_list + 1):
-            tasks.append(
-                scrape_page_and_update_progress(
-                    page, kinorium_id, progress_queue, is_rated=True
-                )
-            )
 
-        # Start progress updates
-        asyncio.create_task(
-            update_progress(progress_queue, total_movies, progress_message)
-        )
+async def resume_scrape_jobs() -> int:
+    """Resumes scrape jobs a restart cut off, without a progress message."""
 
-        # Collect all movies
-        all_movies_data = await asyncio.gather(*tasks)
-        all_movies_data = [movie for sublist in all_movies_data for movie in sublist]
+    def make_runner(kinorium_id: int):
+        async def run(job_id: int):
+            from parser.scrape_job import run_job
 
-        logging.info(f"Found movies: {len(all_movies_data)}")
+            await run_job(kinorium_id, job_id)
 
-        # Save movies to database
-        user_id = await user_service.get_user_by_kinorium_id(kinorium_id)
-        await save_movies_to_db(all_movies_data, user_id)
+        return run
 
-        await progress_message.edit(
-            content=f"Movie parsing completed! Total movies: {total_movies}."
-        )
-    except Exception as e:
-        logging.error(f"Error parsing movies: {e}")
-        await ctx.send("Error parsing movies.")
-    finally:
-        await disconnect_db()
-
-
-async def update_progress(
-    progress_queue: asyncio.Queue, total_movies: int, progress_message
-):
-    """Updates progress update message."""
-    completed_movies = 0
-    while completed_movies < total_movies:
-        movies_processed = await progress_queue.get()  # Get data from queue
-        completed_movies += movies_processed  # Increment completed movies counter
-        await progress_message.edit(
-            content=f"Parsing movies... {completed_movies} of {total_movies} completed."
-        )
+    return await scrape_job_service.resume_interrupted(make_runner)
+
+
+def get_wheel_scope(source) -> WheelScope:
+    """Wheel scope of a command context or interaction"""
+    if source.guild is None:
+        return WheelScope()  # Direct messages use the global wheel
+    channel_id = source.channel.id if WHEEL_PER_CHANNEL else None
+    return WheelScope(source.guild.id, channel_id)
 
 
 async def get_random_movie(ctx, number: int = 1):
@@ -245,11 +215,13 @@ class AddToWheelButton(Button):
         self.movie = movie
         self.sites = sites
 
+    @traced("AddToWheelButton.callback", root=True)
     async def callback(self, interaction):
+        scope = get_wheel_scope(interaction)
         await wheel_service.add_movie_to_wheel(
-            user_id=self.user_id, movie_id=self.movie.id
+            user_id=self.user_id, movie_id=self.movie.id, scope=scope
         )
-        wheel_movies = await wheel_service.get_movies_in_wheel()
+        wheel_movies = await wheel_service.get_movies_in_wheel(scope)
 
         await interaction.response.edit_message(
             view=MovieView(
@@ -273,8 +245,11 @@ class RemoveFromWheelButton(Button):
         self.movie = movie
         self.sites = sites
 
+    @traced("RemoveFromWheelButton.callback", root=True)
     async def callback(self, interaction):
-        await wheel_service.delete_movie_from_wheel(movie_id=self.movie.id)
+        await wheel_service.delete_movie_from_wheel(
+            movie_id=self.movie.id, scope=get_wheel_scope(interaction)
+        )
 
         await interaction.response.edit_message(
             view=MovieView(
@@ -316,13 +291,15 @@ class MovieToDeleteSelect(Select):
             max_values=1,
         )
 
+    @traced("MovieToDeleteSelect.callback", root=True)
     async def callback(self, interaction: Interaction):
         # Get movie ID from value
         movie_id = int(self.values[0].split("_")[-1])
-        await wheel_service.delete_movie_from_wheel(movie_id=movie_id)
+        scope = get_wheel_scope(interaction)
+        await wheel_service.delete_movie_from_wheel(movie_id=movie_id, scope=scope)
 
         # Update movie list
-        updated_movies = await wheel_service.get_movies_in_wheel()
+        updated_movies = await wheel_service.get_movies_in_wheel(scope)
 
         if updated_movies:
             embed = Embed(
@@ -364,6 +341,7 @@ class MovieSearchSelect(Select):
             disabled=not movies,  # Disable only if movies is empty
         )
 
+    @traced("MovieSearchSelect.callback", root=True)
     async def callback(self, interaction: Interaction):
         if self.values[0] == "0":
             return
@@ -374,10 +352,13 @@ class MovieSearchSelect(Select):
             # Add movie to wheel
             user_id = await user_service.get_user_by_discord_id(interaction.user.id)
 
-            await wheel_service.add_movie_to_wheel(movie_id=movie_id, user_id=user_id)
+            scope = get_wheel_scope(interaction)
+            await wheel_service.add_movie_to_wheel(
+                movie_id=movie_id, user_id=user_id, scope=scope
+            )
 
             # Get updated movie list in wheel
-            updated_movies = await wheel_service.get_movies_in_wheel()
+            updated_movies = await wheel_service.get_movies_in_wheel(scope)
 
             # Create new embed for wheel
             if updated_movies:
@@ -444,11 +425,13 @@ class WheelView(View):
         spin_button.callback = self.spin_wheel
         self.add_item(spin_button)
 
+    @traced("WheelView.clear_wheel", root=True)
     async def clear_wheel(self, interaction: Interaction):
         # Clear all wheel
-        await wheel_service.clear_wheel()
+        await wheel_service.clear_wheel(get_wheel_scope(interaction))
         await interaction.response.send_message("Wheel has been cleared.", ephemeral=True)
 
+    @traced("WheelView.spin_wheel", root=True)
     async def spin_wheel(self, interaction: Interaction):
         # Send response to avoid errors
         await interaction.message.delete()
@@ -465,6 +448,104 @@ class WheelView(View):
         await self.bot.invoke(ctx)
 
 
+def profile_operation(name: str, description: str):
+    """Registers a coroutine function taking ctx and an argument for !profile"""
+
+    def decorator(func):
+        profile_operations[name] = (func, description)
+        return func
+
+    return decorator
+
+
+_profiler = None
+
+
+def get_profiler():
+    """Profiler shared by !profile, cProfile and tracemalloc load on first use"""
+    global _profiler
+    if _profiler is None:
+        from bot.profiler import OperationProfiler
+
+        _profiler = OperationProfiler(profile_operations)
+    return _profiler
+
+
+@profile_operation("spin", "download posters and render the wheel, nothing is posted")
+async def profile_spin(ctx, argument: str):
+    from bot.gif_generation import (
+        download_image,
+        generate_case_opening_gif,
+        get_slot_sizes,
+    )
+
+    movies = await wheel_service.get_movies_in_wheel(get_wheel_scope(ctx))
+    if len(movies) < 2:
+        raise ValueError("the wheel needs at least 2 movies")
+    _, zoomed_size = get_slot_sizes()
+    images = [download_image(movie.image_url, zoomed_size) for movie in movies]
+    generate_case_opening_gif(images)
+
+
+@profile_operation("search", "search movies by title, e.g. !profile search matrix")
+async def profile_search(ctx, argument: str):
+    await movie_service.search_movies(argument or "a")
+
+
+@profile_operation("random", "pick a random movie from your Watch Later list")
+async def profile_random(ctx, argument: str):
+    await get_random_movie(ctx)
+
+
+@profile_operation(
+    "scrape", "parse one list page in the browser, a recorded fixture or synthetic"
+)
+async def profile_scrape(ctx, argument: str):
+    """Parses a recorded page of Kinorium user <argument>, no network or DB"""
+    from parser.kinorium_pages import fixture_path, render_page
+    from parser.scraper import (
+        PER_PAGE,
+        async_playwright,
+        launch_browser,
+        parse_watch_list_movie_data,
+    )
+
+    path = fixture_path(int(argument), "watchlist", 1) if argument.isdigit() else ""
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+    else:
+        html = render_page(PER_PAGE, 1, PER_PAGE, rated=False)
+
+    async with async_playwright() as p:
+        browser = await launch_browser(p)
+        try:
+            page = await browser.new_page()
+            await page.set_content(html)
+            await parse_watch_list_movie_data(page)
+        finally:
+            await browser.close()
+
+
+def format_job_status(job) -> str:
+    """Describes a scrape job for the !status command"""
+    icons = {
+        ScrapeJobStatus.QUEUED: "⏳",
+        ScrapeJobStatus.RUNNING: "🔄",
+        ScrapeJobStatus.DONE: "✅",
+        ScrapeJobStatus.FAILED: "❌",
+    }
+    text = (
+        f"{icons[job.status]} Job #{job.id} for Kinorium {job.kinorium_id}: "
+        f"{job.status.value}\n"
+        f"Pages: {job.pages_done} of {job.pages_total}, "
+        f"movies: {job.movies_done} of {job.movies_total}"
+    )
+    if job.error:
+        text += f"\nError: {job.error}"
+    return text
+
+
 def create_help_embed() -> Embed:
     """Creates embed with command help"""
     embed = Embed(
@@ -476,6 +557,8 @@ def create_help_embed() -> Embed:
     commands_info = {
         "🎬 Main Commands": {
             "!register [kinorium_id]": "Link your Discord to Kinorium",
+            "!status": "Show progress of collecting your movies",
+            "!refresh": "Update your movies from Kinorium now",
             "!random or !r": "Get a random movie from your Watch Later list",
             "!search [title] or !m [title]": "Search for a movie by title",
         },
@@ -486,6 +569,8 @@ def create_help_embed() -> Embed:
         "⚙️ Admin Commands": {
             "!addsite [name] [url]": "Add new movie search site",
             "!clear": "Clear chat",
+            "!sync": "Register slash commands with Discord again",
+            "!profile [operation]": "Profile spin, search, random or scrape",
         },
     }
 
@@ -497,6 +582,15 @@ def create_help_embed() -> Embed:
 
 
 def register_commands(bot):
+    @bot.before_invoke
+    async def mark_user_active(ctx):
+        """Active users get their lists refreshed more often"""
+        if not refresh_service.should_mark_active(ctx.author.id):
+            return
+        user_id = await user_service.get_user_by_discord_id(ctx.author.id)
+        if user_id is not None:
+            refresh_service.mark_active(user_id)
+
     @bot.command()
     @commands.has_permissions(administrator=True)
     async def addsite(ctx, name: str, query_template: str):
@@ -548,12 +642,23 @@ def register_commands(bot):
             kinorium_id = extract_kinorium_id(kinorium_input)
 
             await link_user_to_kinorium(discord_user_id, kinorium_id, user_name)
+
+            async def run_job(job_id: int):
+                await scrape_user_movies(kinorium_id, ctx, job_id)
+
+            job_id, is_new = await scrape_job_service.submit(kinorium_id, run_job)
+            if not is_new:
+                await ctx.send(
+                    f"Your movies are already being collected (job #{job_id}).\n"
+                    "👉 Use `!status` to check progress."
+                )
+                return
+
             await ctx.send(
-                f"Hi, {user_name}! I've started collecting your movies from Kinorium."
-            )
-            await scrape_user_movies(kinorium_id, ctx)
-            await ctx.send(
-                "You've been successfully registered! Your Discord is linked to Kinorium"
+                f"Hi, {user_name}! I've started collecting your movies from Kinorium "
+                f"(job #{job_id}).\n"
+                "You've been successfully registered! Your Discord is linked to Kinorium\n"
+                "👉 Use `!status` to check progress."
             )
 
         except ValueError as e:
@@ -567,6 +672,49 @@ def register_commands(bot):
             logging.error(f"Registration error: {e}")
             await ctx.send("❌ Registration error")
 
+    @bot.command()
+    async def status(ctx, kinorium_input: str = None):
+        """
+        Shows progress of the latest movie collection job
+        Examples:
+        !status
+        !status 112144
+        """
+        try:
+            if kinorium_input is None:
+                kinorium_id = await user_service.get_kinorium_id_by_discord_id(
+                    ctx.author.id
+                )
+                if kinorium_id is None:
+                    await ctx.send("You are not registered yet. Use `!register`.")
+                    return
+            else:
+                kinorium_id = extract_kinorium_id(kinorium_input)
+
+            job = await scrape_job_service.get_latest_job(kinorium_id)
+            if job is None:
+                await ctx.send(f"No movie collection jobs for Kinorium {kinorium_id}.")
+                return
+
+            await ctx.send(format_job_status(job))
+        except ValueError as e:
+            await ctx.send(f"❌ Error: {e}")
+
+    @bot.command()
+    async def refresh(ctx):
+        """Updates movies of the user from Kinorium without waiting for the schedule"""
+        user_id = await user_service.get_user_by_discord_id(ctx.author.id)
+        if user_id is None:
+            await ctx.send("You are not registered yet. Use `!register`.")
+            return
+
+        try:
+            await refresh_scheduler.request_refresh(user_id)
+            await ctx.send("🔄 Your movies will be updated from Kinorium shortly.")
+        except Exception as e:
+            logging.error(f"Error requesting refresh: {e}")
+            await ctx.send("❌ Error requesting refresh")
+
     @bot.command(aliases=["r"])
     async def random(ctx):
         try:
@@ -577,7 +725,9 @@ def register_commands(bot):
                 sites = (
                     await movie_service.get_all_search_sites()
                 )  # Get sites here
-                wheel_movies = await wheel_service.get_movies_in_wheel()
+                wheel_movies = await wheel_service.get_movies_in_wheel(
+                    get_wheel_scope(ctx)
+                )
                 user_id = await user_service.get_user_by_discord_id(ctx.author.id)
 
                 view = MovieView(
@@ -601,29 +751,52 @@ def register_commands(bot):
 
         await ctx.send(content=f"🔍 Search results for '{query}'", view=view)
 
+    async def reveal_winner(ctx, message_with_gif, content, embed, view):
+        """Replaces the finished animation with the winning movie"""
+        if message_with_gif:
+            await message_with_gif.delete()
+        await ctx.send(content, embed=embed, view=view)
+
     @bot.command(aliases=["s"])
     async def spin(ctx):
+        scope = get_wheel_scope(ctx)
+        wheel_id = await wheel_service.get_or_create_wheel(scope)
+        if not await spin_coordinator.acquire(wheel_id):
+            await ctx.send("🎡 Wheel is already spinning! Wait for the current spin.")
+            return None
+
+        reveal_scheduled = False
         try:
             loading_message = await ctx.send("🎡 Spinning wheel...")
             # Send "Spinning wheel..." message
 
-            movies = await wheel_service.get_movies_in_wheel()
+            movies = await wheel_service.get_movies_in_wheel(scope)
             if not movies:
                 await loading_message.delete()
                 await ctx.send("🎡 Wheel is empty! Add movies to start the game.")
                 return None
 
-            gif_path = f"case_opening_{len(movies)}_films.gif"
+            # numpy and PIL are loaded on the first spin
+            from bot.gif_generation import (
+                anitmation_runtime,
+                create_gif_and_get_winner_movie,
+                send_gif,
+            )
 
-            winner_movie = await create_gif_and_get_winner_movie(ctx, movies, gif_path)
+            winner_movie, animation = await create_gif_and_get_winner_movie(
+                ctx, movies
+            )
 
             await loading_message.delete()
 
-            measage_with_gif = await send_gif(ctx, gif_path)
+            if winner_movie is None:
+                return None
 
-            winner_user = await wheel_service.get_winner_user(winner_movie.id)
+            measage_with_gif = await send_gif(ctx, animation)
 
-            await wheel_service.delete_movie_from_wheel(winner_movie.id)
+            winner_user = await wheel_service.get_winner_user(winner_movie.id, scope)
+
+            await wheel_service.delete_movie_from_wheel(winner_movie.id, scope)
 
             embed = create_winmovie_embed(winner_movie)
 
@@ -637,24 +810,28 @@ def register_commands(bot):
 
             gif_runtime = await anitmation_runtime()
 
-            await asyncio.sleep(gif_runtime)
-
-            await measage_with_gif.delete()
-
-            await ctx.send(
+            # The winner is revealed once the animation ends, without holding the command
+            spin_coordinator.finish_later(
+                wheel_id,
+                gif_runtime,
+                reveal_winner,
+                ctx,
+                measage_with_gif,
                 f"🎉 Spin for {winner_user.username} 🎉 \n Winning movie:",
-                embed=embed,
-                view=view,
+                embed,
+                view,
             )
-
-            await delete_gif(gif_path)
+            reveal_scheduled = True
 
         except Exception as e:
             logging.error(f"Error sending GIF {e}")
+        finally:
+            if not reveal_scheduled:
+                spin_coordinator.release(wheel_id)
 
-    async def show_wheel_logic(target):
+    async def show_wheel_logic(target, scope: WheelScope):
         """Common logic for !wheel and /wheel"""
-        wheel_movies = await wheel_service.get_movies_in_wheel()
+        wheel_movies = await wheel_service.get_movies_in_wheel(scope)
         if wheel_movies:
             embed = Embed(
                 title="🎡 Wheel of Movies",
@@ -677,13 +854,14 @@ def register_commands(bot):
 
     # Slash command /wheel
     @bot.tree.command(name="wheel", description="Show all movies in the wheel")
+    @traced("/wheel", root=True)
     async def show_wheel_slash(interaction: Interaction):
-        await show_wheel_logic(interaction.response)
+        await show_wheel_logic(interaction.response, get_wheel_scope(interaction))
 
     # Text command !wheel or !w
     @bot.command(aliases=["wheel", "w"])
     async def show_wheel(ctx):
-        await show_wheel_logic(ctx)
+        await show_wheel_logic(ctx, get_wheel_scope(ctx))
 
     @bot.command()
     @commands.has_permissions(administrator=True)
@@ -693,10 +871,65 @@ def register_commands(bot):
 
         await ctx.channel.purge(check=is_not_pinned)
 
+    @bot.command()
+    @commands.has_permissions(administrator=True)
+    async def sync(ctx):
+        """Forces a slash command sync. Available only to administrators."""
+        try:
+            synced = await command_sync.sync(bot, force=True)
+            await ctx.send(f"✅ Synchronized {synced} slash commands.")
+        except Exception as e:
+            logging.error(f"Forced command sync failed: {e}")
+            await ctx.send(f"❌ Synchronization failed: {e}")
+
+    @bot.command()
+    @commands.has_permissions(administrator=True)
+    async def profile(ctx, operation: str = None, *, argument: str = ""):
+        """Profiles an operation and attaches the report. Only for administrators."""
+        if operation not in profile_operations:
+            operations = "\n".join(
+                f"`{name}` - {description}"
+                for name, (_, description) in profile_operations.items()
+            )
+            await ctx.send(f"Usage: `!profile <operation> [argument]`\n{operations}")
+            return
+        profiler = get_profiler()
+        if profiler.is_running():
+            await ctx.send("⏱️ Another profile is running, try again later.")
+            return
+
+        await ctx.send(f"⏱️ Profiling `{operation}`...")
+        result = await profiler.profile(operation, ctx, argument)
+        outcome = (
+            f"failed after {result.elapsed:.2f}s: {result.error}"
+            if result.error
+            else f"took {result.elapsed:.2f}s under the profiler"
+        )
+        await ctx.send(
+            f"⏱️ `{operation}` {outcome}. "
+            f"The .collapsed file opens in speedscope or flamegraph.pl.",
+            files=result.files(),
+        )
+
+    @profile.error
+    async def profile_error(ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send(
+                "You don't have administrator permissions to run this command."
+            )
+
+    @sync.error
+    async def sync_error(ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send(
+                "You don't have administrator permissions to run this command."
+            )
+
     # Slash command /info
     @bot.tree.command(
         name="info", description="Get help for all available commands"
     )
+    @traced("/info", root=True)
     async def info_slash(interaction: Interaction):
         await interaction.response.send_message(embed=create_help_embed())
 
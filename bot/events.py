@@ -1,10 +1,71 @@
+import logging
+from discord import AutoShardedClient
+from database.db import database, connect_db, ensure_schema
+from bot.commands import (
+    command_sync,
+    loop_monitor,
+    refresh_scheduler,
+    resume_scrape_jobs,
+)
+from bot.sharding import is_primary_process
+from config.settings import (
+    LOOP_MONITOR_ENABLED,
+    REFRESH_SCHEDULER_ENABLED,
+    TRACING_ENABLED,
+)
+from services.tracing import instrument_database, trace_commands, tracer
+
+
+def shard_latencies(bot) -> list:
+    """(shard ID, latency in seconds) of every shard this process runs"""
+    if isinstance(bot, AutoShardedClient):
+        return sorted(bot.latencies)
+    return [(bot.shard_id or 0, bot.latency)]
+
+
 def register_events(bot):
+    async def setup_hook():
+        # Runs once after login, before the gateway connects
+        if LOOP_MONITOR_ENABLED:
+            loop_monitor.start()
+        if TRACING_ENABLED:
+            instrument_database(database)
+            trace_commands(bot)
+            tracer.start()
+        await ensure_schema()
+        # Connect once for the whole process, background jobs share the connection
+        if not database.is_connected:
+            await connect_db()
+        if is_primary_process():
+            # Jobs cut off by the restart continue from their page checkpoints
+            try:
+                await resume_scrape_jobs()
+            except Exception as e:
+                logging.error(f"Error resuming scrape jobs: {e}")
+
+    bot.setup_hook = setup_hook
+
+    @bot.event
+    async def on_shard_ready(shard_id):
+        print(f"Shard {shard_id} is ready")
+
     @bot.event
     async def on_ready():
         await bot.wait_until_ready()
+        for shard_id, latency in shard_latencies(bot):
+            guilds = sum(1 for guild in bot.guilds if guild.shard_id == shard_id)
+            print(f"Shard {shard_id}: {guilds} guilds, latency {latency * 1000:.0f} ms")
+        # Processes with other shards leave global work to the one with shard 0
+        if not is_primary_process():
+            print(f"Bot {bot.user.name} is ready to work!")
+            return
+        if REFRESH_SCHEDULER_ENABLED:
+            refresh_scheduler.start()
         try:
-            synced = await bot.tree.sync()
-            print(f"✅ Synchronized {len(synced)} slash command")
+            # Reconnects fire on_ready again, the sync runs only for a changed tree
+            synced = await command_sync.sync(bot)
+            if synced is not None:
+                print(f"✅ Synchronized {synced} slash command")
             print(f"Bot {bot.user.name} is ready to work!")
         except Exception as e:
             print(f"❌ Synchronization of teams: {e}")
@@ -1,37 +1,114 @@
-import os
 import requests
 import discord
-import imageio
 import random
 import numpy as np
 from PIL import Image, ImageDraw
 from io import BytesIO
+from fractions import Fraction
+from config.settings import SPIN_OUTPUT_FORMAT
+from services.tracing import tracer
 
 FRAMES_COUNT = 200
 FRAME_TIME = 0.03
 WIN_EXTEND_TIME = 3
+FRAME_SIZE = (500, 200)
+POSTER_ZOOM = 1.2  # Scale of the poster passing the center of the wheel
+REDUCIBLE_MODES = ("L", "LA", "RGB", "RGBA", "CMYK", "YCbCr")  # Modes reduce() averages
 
+DISCORD_UPLOAD_LIMIT = 10 * 1024 * 1024
+GIF_SIZE_BUDGET = int(DISCORD_UPLOAD_LIMIT * 0.9)
+GIF_PALETTE_COLORS = 255  # One index stays free for delta transparency
+PALETTE_SAMPLE_FRAMES = 16
+WEBP_QUALITY = 80
+MP4_CODEC = "libx264"
 
-def download_image(url):
+# (frame step, scale) pairs tried in order until the animation fits the budget
+BUDGET_FALLBACKS = ((1, 1.0), (2, 1.0), (2, 0.75), (3, 0.75), (4, 0.5))
+
+
+def download_image(url, target_size=None):
     """
     Download and convert an image from URL to PIL Image object.
     
     Args:
         url (str): URL of the image to download
+        target_size (tuple): Smallest size the image is needed at, if known
         
     Returns:
         PIL.Image: Downloaded image in RGBA format
     """
-    response = requests.get(url)
-    return Image.open(BytesIO(response.content)).convert("RGBA")
+    with tracer.span("poster.download", url=url):
+        response = requests.get(url)
+    with tracer.span("poster.decode"):
+        return load_poster(response.content, target_size)
+
+
+def load_poster(data, target_size=None):
+    """
+    Decode poster bytes, scaling the image down while decoding when possible.
+
+    JPEG posters are decoded straight at a reduced scale via draft mode, other
+    formats are shrunk with a fast integer reduce. The image is never made
+    smaller than target_size.
+
+    Args:
+        data (bytes): Encoded image
+        target_size (tuple): Smallest size the image is needed at, if known
+
+    Returns:
+        PIL.Image: Decoded image in RGBA format
+    """
+    image = Image.open(BytesIO(data))
+    if target_size:
+        image.draft("RGB", target_size)
+        factor = min(image.width // target_size[0], image.height // target_size[1])
+        if factor > 1:
+            if image.mode not in REDUCIBLE_MODES:
+                # Palette indices and 1-bit pixels can't be averaged
+                image = image.convert("RGBA")
+            image = image.reduce(factor)
+    return image.convert("RGBA")
+
+
+def get_slot_sizes(size=FRAME_SIZE):
+    """
+    Get poster sizes used in a frame of the given size.
+
+    Args:
+        size (tuple): Frame dimensions (width, height)
+
+    Returns:
+        tuple: ((width, height), (width, height)) - Normal and zoomed poster sizes
+    """
+    base_slot_width = size[0] // 5  # Fixed width for each item
+    item_height = size[1] - 40
+    zoomed_size = (int(base_slot_width * POSTER_ZOOM), int(item_height * POSTER_ZOOM))
+    return (base_slot_width, item_height), zoomed_size
 
 
-def create_frame(images, shift, size=(500, 200), highlight=False):
+def make_thumbnails(image, size=FRAME_SIZE):
+    """
+    Make both poster thumbnails used by the wheel in one pass.
+
+    Args:
+        image (PIL.Image): Decoded poster
+        size (tuple): Frame dimensions (width, height)
+
+    Returns:
+        tuple: (PIL.Image, PIL.Image) - Normal and zoomed thumbnails
+    """
+    normal_size, zoomed_size = get_slot_sizes(size)
+    zoomed = image.resize(zoomed_size, Image.Resampling.LANCZOS)
+    normal = image.resize(normal_size, Image.Resampling.LANCZOS)
+    return normal, zoomed
+
+
+def create_frame(images, shift, size=FRAME_SIZE, highlight=False):
     """
     Create a single frame for the wheel animation.
     
     Args:
-        images (list): List of PIL Image objects to use in the frame
+        images (list): List of (normal, zoomed) thumbnails from make_thumbnails
         shift (float): Current shift value for animation
         size (tuple): Frame dimensions (width, height)
         highlight (bool): Whether to highlight the winning movie
@@ -44,9 +121,7 @@ def create_frame(images, shift, size=(500, 200), highlight=False):
     draw = ImageDraw.Draw(frame)
 
     center_x = size[0] // 2
-    base_slot_width = size[0] // 5  # Fixed width for each item
-
-    item_height = size[1] - 40
+    (base_slot_width, item_height), (new_width, new_height) = get_slot_sizes(size)
     gap = 4
 
     offset = -base_slot_width * 2
@@ -59,7 +134,7 @@ def create_frame(images, shift, size=(500, 200), highlight=False):
     winner_distance = float("inf")  # Winner's distance to the center
 
 
-    for i, img in enumerate(images):
+    for i, (img, zoomed_img) in enumerate(images):
         slot_x = center_x + offset - shift
         slot_y = (size[1] - item_height) // 2
         slot_center = slot_x + base_slot_width / 2
@@ -75,8 +150,6 @@ def create_frame(images, shift, size=(500, 200), highlight=False):
 
         is_winner = abs(slot_center - center_x) < base_slot_width / 2
         if is_winner:
-            new_width = int(base_slot_width * 1.2)
-            new_height = int(item_height * 1.2)
             candidate_x = slot_center - new_width / 2
             if prev_right is not None and candidate_x < prev_right + gap:
                 new_x = prev_right + gap
@@ -95,49 +168,332 @@ def create_frame(images, shift, size=(500, 200), highlight=False):
                     outline="gold",
                     width=5,
                 )
-            img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            img_resized = zoomed_img
         else:
             new_x = slot_x
             new_y = slot_y
-            img_resized = img.resize((base_slot_width, item_height))
+            img_resized = img
 
-        frame.paste(img_resized, (int(new_x), int(new_y)), img_resized)
+        if new_x < size[0] and new_x + img_resized.width > 0:  # Skip off-screen posters
+            frame.paste(img_resized, (int(new_x), int(new_y)), img_resized)
         prev_right = new_x + img_resized.width
         offset += img_resized.width + gap
 
     return frame, winner_index
 
 
+def build_global_palette(
+    frames, colors=GIF_PALETTE_COLORS, sample_frames=PALETTE_SAMPLE_FRAMES
+):
+    """
+    Build a single palette shared by every frame of the animation.
+
+    Args:
+        frames (list): List of PIL Image frames
+        colors (int): Number of palette colors
+        sample_frames (int): How many frames to sample for the palette
+
+    Returns:
+        PIL.Image: Palette image to quantize the frames against
+    """
+    step = max(1, len(frames) // sample_frames)
+    sample = frames[::step] + [frames[-1]]
+
+    width, height = sample[0].size
+    atlas = Image.new("RGB", (width, height * len(sample)))
+    for i, frame in enumerate(sample):
+        atlas.paste(frame.convert("RGB"), (0, i * height))
+
+    return atlas.quantize(colors=colors, method=Image.Quantize.MEDIANCUT)
+
+
+def unused_color(palette_colors):
+    """
+    Find an RGB color that is not present in the palette.
+
+    Args:
+        palette_colors (list): Flat list of palette RGB values
+
+    Returns:
+        list: RGB values of an unused color
+    """
+    used = set(zip(palette_colors[::3], palette_colors[1::3], palette_colors[2::3]))
+    for value in range(256 ** 3):
+        color = (value >> 16, (value >> 8) & 0xFF, value & 0xFF)
+        if color not in used:
+            return list(color)
+
+
+def quantize_frames(frames, durations, palette, transparency):
+    """
+    Map frames onto the shared palette and keep only what changed.
+
+    Consecutive duplicate frames are merged into one longer frame, and pixels
+    that did not change since the previous frame are set to the transparent index.
+
+    Args:
+        frames (list): List of PIL Image frames
+        durations (list): Duration of each frame in milliseconds
+        palette (list): Flat list of palette RGB values the frames are mapped to
+        transparency (int): Palette index used for unchanged pixels, past the
+            colors of the palette so no real pixel is mapped to it
+
+    Returns:
+        tuple: (list, list) - Palette frames and their merged durations
+    """
+    palette_image = Image.new("P", (1, 1))
+    palette_image.putpalette(palette)
+    # The transparent index gets a color of its own only in the saved frames
+    output_palette = palette + unused_color(palette)
+
+    delta_frames = []
+    merged_durations = []
+    previous = None
+
+    for frame, duration in zip(frames, durations):
+        quantized = frame.convert("RGB").quantize(
+            palette=palette_image, dither=Image.Dither.NONE
+        )
+        current = np.asarray(quantized)
+
+        if previous is None:
+            delta = current
+        else:
+            unchanged = current == previous
+            if unchanged.all():
+                merged_durations[-1] += duration
+                continue
+            delta = np.where(unchanged, transparency, current).astype(np.uint8)
+
+        previous = current
+        delta_frame = Image.frombytes("P", quantized.size, delta.tobytes())
+        delta_frame.putpalette(output_palette)
+        delta_frames.append(delta_frame)
+        merged_durations.append(duration)
+
+    return delta_frames, merged_durations
+
+
+def encode_gif(frames, durations):
+    """
+    Encode frames as a looping GIF with a global palette.
+
+    Only the changed region of each frame is stored, and unchanged pixels
+    inside it are transparent, so the previous frame shows through.
+
+    Args:
+        frames (list): List of PIL Image frames
+        durations (list): Duration of each frame in milliseconds
+
+    Returns:
+        bytes: Encoded GIF
+    """
+    palette = build_global_palette(frames).getpalette()
+    transparency = len(palette) // 3
+
+    delta_frames, durations = quantize_frames(
+        frames, durations, palette, transparency
+    )
+
+    buffer = BytesIO()
+    delta_frames[0].save(
+        buffer,
+        format="GIF",
+        save_all=True,
+        append_images=delta_frames[1:],
+        duration=durations,
+        palette=delta_frames[0].getpalette(),
+        transparency=transparency,
+        disposal=1,
+        loop=0,
+    )
+    return buffer.getvalue()
+
+
+def decimate_frames(frames, durations, step):
+    """
+    Keep every step-th frame, folding the dropped durations into the kept ones.
+
+    The last frame of each group is kept, so the winner frame always survives.
+
+    Args:
+        frames (list): List of PIL Image frames
+        durations (list): Duration of each frame in milliseconds
+        step (int): Size of each group of frames
+
+    Returns:
+        tuple: (list, list) - Kept frames and their durations
+    """
+    kept_frames = []
+    kept_durations = []
+    for start in range(0, len(frames), step):
+        end = min(start + step, len(frames))
+        kept_frames.append(frames[end - 1])
+        kept_durations.append(sum(durations[start:end]))
+    return kept_frames, kept_durations
+
+
+def scale_frames(frames, scale):
+    """
+    Downscale frames by the given factor.
+
+    Args:
+        frames (list): List of PIL Image frames
+        scale (float): Scale factor
+
+    Returns:
+        list: Resized frames
+    """
+    width, height = frames[0].size
+    size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    return [frame.resize(size, Image.Resampling.LANCZOS) for frame in frames]
+
+
+def encode_webp(frames, durations):
+    """
+    Encode frames as a looping animated WebP.
+
+    Args:
+        frames (list): List of PIL Image frames
+        durations (list): Duration of each frame in milliseconds
+
+    Returns:
+        bytes: Encoded WebP
+    """
+    buffer = BytesIO()
+    frames[0].save(
+        buffer,
+        format="WEBP",
+        save_all=True,
+        append_images=frames[1:],
+        duration=durations,
+        quality=WEBP_QUALITY,
+        loop=0,
+    )
+    return buffer.getvalue()
+
+
+def encode_mp4(frames, durations):
+    """
+    Encode frames as an H.264 MP4 video with per-frame timestamps.
+
+    Args:
+        frames (list): List of PIL Image frames
+        durations (list): Duration of each frame in milliseconds
+
+    Returns:
+        bytes: Encoded MP4
+    """
+    import av  # Loaded on the first MP4 spin, GIF is the default
+
+    buffer = BytesIO()
+    with av.open(buffer, mode="w", format="mp4") as container:
+        stream = container.add_stream(MP4_CODEC, rate=round(1 / FRAME_TIME))
+        width, height = (side - side % 2 for side in frames[0].size)
+        stream.width, stream.height = width, height  # yuv420p needs even sides
+        stream.pix_fmt = "yuv420p"
+        stream.codec_context.time_base = Fraction(1, 1000)
+
+        # A closing copy of the last frame keeps it on screen for its full duration
+
+        timestamps = [0]
+        for duration in durations:
+            timestamps.append(timestamps[-1] + duration)
+        timestamps[-1] -= int(FRAME_TIME * 1000)
+
+        for frame, timestamp in zip(frames + frames[-1:], timestamps):
+            video_frame = av.VideoFrame.from_image(
+                frame.convert("RGB").crop((0, 0, width, height))
+            )
+            video_frame.pts = timestamp
+            video_frame.time_base = stream.codec_context.time_base
+            container.mux(stream.encode(video_frame))
+
+        container.mux(stream.encode(None))  # Flush buffered frames
+
+    return buffer.getvalue()
+
+
+ENCODERS = {
+    "gif": encode_gif,
+    "webp": encode_webp,
+    "mp4": encode_mp4,
+}
+
+
+def encode_within_budget(
+    frames, durations, output_format="gif", byte_budget=GIF_SIZE_BUDGET
+):
+    """
+    Encode an animation, lowering frame rate and resolution until it fits the budget.
+
+    Args:
+        frames (list): List of PIL Image frames
+        durations (list): Duration of each frame in milliseconds
+        output_format (str): One of the ENCODERS keys
+        byte_budget (int): Maximum size of the encoded animation in bytes
+
+    Returns:
+        bytes: Encoded animation, or None if it does not fit even at the lowest quality
+    """
+    encoder = ENCODERS[output_format]
+
+    for step, scale in BUDGET_FALLBACKS:
+        candidate_frames, candidate_durations = decimate_frames(
+            frames, durations, step
+        )
+        if scale < 1:
+            candidate_frames = scale_frames(candidate_frames, scale)
+
+        data = encoder(candidate_frames, candidate_durations)
+        if len(data) <= byte_budget:
+            return data
+
+        print(
+            f"{output_format.upper()} is {len(data)} bytes at step {step}, "
+            f"scale {scale}; budget is {byte_budget} bytes"
+        )
+
+    return None
+
+
 def generate_case_opening_gif(
     images,
-    output_path="case_opening.gif",
-    size=(500, 200),
+    output_format=SPIN_OUTPUT_FORMAT,
+    size=FRAME_SIZE,
     frames_count=FRAMES_COUNT,
     win_delay=25,
+    byte_budget=GIF_SIZE_BUDGET,
 ):
     """
-    Generate an animated GIF of the movie wheel selection process.
+    Generate an animation of the movie wheel selection process in memory.
     
     Args:
         images (list): List of PIL Image objects to use in animation
-        output_path (str): Path where to save the generated GIF
-        size (tuple): Dimensions of the GIF (width, height)
+        output_format (str): Animation format: "gif", "webp" or "mp4"
+        size (tuple): Dimensions of the animation (width, height)
         frames_count (int): Number of frames in the animation
         win_delay (int): Number of frames to show winner highlight
+        byte_budget (int): Maximum size of the animation in bytes
         
     Returns:
-        int: Index of the winning movie, or None if generation failed
+        tuple: (int, discord.File) - Index of the winning movie and the
+            animation ready for upload, or (None, None) if generation failed
     """
     if len(images) < 2:
         print("❌ Need at least 2 movies to create animation.")
-        return None
+        return None, None
+
+    if output_format not in ENCODERS:
+        print(f"❌ Unknown output format '{output_format}', falling back to GIF.")
+        output_format = "gif"
 
     # If movies are less than 4, repeat the list
 
     if len(images) < 4:
         images = images * (4 // len(images) + 1)
 
-    images = [img.resize((size[0] // 5, size[1] - 40)) for img in images]
+    images = [make_thumbnails(img, size) for img in images]
     extended_images = images * 10  # Animation cycles
 
     speeds = np.linspace(30, 1, frames_count)
@@ -153,94 +509,85 @@ def generate_case_opening_gif(
         frames.append(frame)
         shift += speed
 
-    last_frame = frames[-1]
-    delay_frames = int(WIN_EXTEND_TIME / FRAME_TIME)
-    frames.extend([last_frame] * delay_frames)
+    # The winner lingers on one long final frame instead of repeated copies
 
-    if len(frames) > 300:
-        print("❌ GIF too large, reduce frame count.")
-        return None
+    durations = [int(FRAME_TIME * 1000)] * len(frames)
+    durations[-1] += int(WIN_EXTEND_TIME * 1000)
 
-    duration = FRAME_TIME * 1000
+    try:
+        with tracer.span("spin.encode", format=output_format):
+            data = encode_within_budget(frames, durations, output_format, byte_budget)
+    except ImportError as e:
+        print(f"❌ {output_format.upper()} encoder is unavailable ({e}), using GIF.")
+        output_format = "gif"
+        data = encode_within_budget(frames, durations, output_format, byte_budget)
 
-    imageio.mimsave(output_path, frames, duration=duration, loop=0)
-    print(f"GIF '{output_path}' created!")
-    return winner_index  # We return the winning movie index
+    if data is None:
+        print("❌ Animation too large, reduce frame count.")
+        return None, None
 
+    print(f"{output_format.upper()} animation created ({len(data)} bytes)!")
+    animation = discord.File(BytesIO(data), filename=f"case_opening.{output_format}")
+    return winner_index, animation  # We return the winning movie index
 
 
-async def send_gif(ctx, gif_path):
+
+async def send_gif(ctx, animation):
     """
-    Send the generated GIF to Discord channel.
+    Send the generated animation to Discord channel.
     
     Args:
         ctx: Discord context
-        gif_path (str): Path to the GIF file
+        animation (discord.File): In-memory animation file
         
     Returns:
         Message: Sent Discord message object, or None if failed
     """
     try:
-        with open(gif_path, "rb") as f:
-            message = await ctx.send(file=discord.File(f))
-            return message
+        with tracer.span("spin.upload"):
+            return await ctx.send(file=animation)
 
     except discord.errors.HTTPException as e:
         if e.code == 40005:
             await ctx.send("❌ GIF is too large! Try reducing the size.")
         else:
             await ctx.send("❌ An error occurred while uploading the file.")
-    os.remove(gif_path)
-
-
-async def delete_gif(gif_path):
-    """
-    Delete the generated GIF file.
-    
-    Args:
-        gif_path (str): Path to the GIF file to delete
-    """
-    try:
-        os.remove(gif_path)
-        print("File successfully deleted")
-    except FileNotFoundError:
-        print("File not found")
-    except PermissionError:
-        print("No permission to delete file")
 
 
-async def create_gif_and_get_winner_movie(ctx, movies, gif_path):
+async def create_gif_and_get_winner_movie(ctx, movies):
     """
-    Create wheel animation GIF and determine the winning movie.
+    Create wheel animation and determine the winning movie.
     
     Args:
         ctx: Discord context
         movies (list): List of movies to include in the wheel
-        gif_path (str): Path where to save the generated GIF
         
     Returns:
-        Movie: The winning movie object, or None if creation failed
+        tuple: (Movie, discord.File) - The winning movie and the in-memory
+            animation, or (None, None) if creation failed
     """
     if len(movies) < 2:
         await ctx.send("❌ Need at least 2 movies to create the animation.")
-        return None
+        return None, None
 
     random.shuffle(movies)
 
-    images = [download_image(movie.image_url) for movie in movies]
+    _, zoomed_size = get_slot_sizes()
+    images = [download_image(movie.image_url, zoomed_size) for movie in movies]
 
-    winner_index = generate_case_opening_gif(images, output_path=gif_path)
+    with tracer.span("spin.render", movies=len(movies)):
+        winner_index, animation = generate_case_opening_gif(images)
 
     if winner_index is None:
         await ctx.send("❌ Failed to create GIF.")
-        return None
+        return None, None
 
     # Get the winning movie by index
 
     winner_movie = movies[winner_index % len(movies)]  # Use modulo to avoid errors
 
 
-    return winner_movie
+    return winner_movie, animation
 
 
 async def anitmation_runtime(
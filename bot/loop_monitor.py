@@ -0,0 +1,149 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+from config.settings import (
+    LOOP_ASYNCIO_DEBUG,
+    LOOP_BLOCK_THRESHOLD_SECONDS,
+    LOOP_LAG_SAMPLE_SECONDS,
+    LOOP_METRICS_EXPORT_SECONDS,
+    LOOP_METRICS_PATH,
+)
+from services.metrics import Summary, write_atomically
+
+LAG_QUANTILES = (0.5, 0.95, 0.99)
+MAX_STACK_FRAMES = 25
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LoopMonitor:
+    """
+    Measures event loop lag and catches calls that block the loop
+
+    A sampler task sleeps for a fixed interval and records how late it woke
+    up. A watchdog thread notices when the sampler is overdue by more than
+    the threshold, while the loop is still blocked, and logs the stack of the
+    loop thread, which points at the blocking call.
+    """
+
+    def __init__(
+        self,
+        interval: float = LOOP_LAG_SAMPLE_SECONDS,
+        threshold: float = LOOP_BLOCK_THRESHOLD_SECONDS,
+        export_interval: float = LOOP_METRICS_EXPORT_SECONDS,
+        path: str = LOOP_METRICS_PATH,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.export_interval = export_interval
+        self.path = path
+        self.lag = Summary()
+        self.blocks = 0
+        self.stacks = {}  # Innermost frame -> times it was caught blocking
+        self._wake_at = None  # When the sampler is due to run again
+        self._reported_wake_at = None
+        self._loop_thread_id = None
+        self._task = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start sampling on the running loop, calling it again does nothing"""
+        if self._task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        if LOOP_ASYNCIO_DEBUG:
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.threshold
+        self._loop_thread_id = threading.get_ident()
+        self._task = asyncio.create_task(self._sample())
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _sample(self):
+        exported_at = time.monotonic()
+        while True:
+            self._wake_at = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - self._wake_at)
+            self.lag.observe(lag)
+            if lag > self.threshold:
+                self.blocks += 1
+                logging.warning(f"Event loop was blocked for {lag:.2f}s")
+            if self.path and now - exported_at >= self.export_interval:
+                exported_at = now
+                try:
+                    self.export()
+                except OSError as e:
+                    logging.error(f"Failed to export loop metrics: {e}")
+
+    def _watch(self):
+        while not self._stop.wait(self.threshold / 4):
+            wake_at = self._wake_at
+            if wake_at is None or wake_at == self._reported_wake_at:
+                continue
+            overdue = time.monotonic() - wake_at
+            if overdue > self.threshold:
+                self._reported_wake_at = wake_at  # One stack per stall
+                self._report_stack(overdue)
+
+    def _report_stack(self, overdue: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame)[-MAX_STACK_FRAMES:]
+        # The blocking call is usually deep in a library, count our line that made it
+        own_frames = [
+            entry for entry in stack if entry.filename.startswith(PROJECT_DIR)
+        ]
+        innermost = (own_frames or stack)[-1]
+        location = f"{innermost.filename}:{innermost.lineno} in {innermost.name}"
+        self.stacks[location] = self.stacks.get(location, 0) + 1
+        logging.warning(
+            f"Event loop blocked for {overdue:.2f}s so far, "
+            f"loop thread stack:\n{''.join(traceback.format_list(stack))}"
+        )
+
+    def stats(self) -> dict:
+        """Lag percentiles in seconds, blocks and the most frequent blocking frames"""
+        lag = {"count": self.lag.count, "max": round(self.lag.max, 4)}
+        for fraction in LAG_QUANTILES:
+            lag[f"p{int(fraction * 100)}"] = round(self.lag.quantile(fraction), 4)
+        top_stacks = sorted(self.stacks.items(), key=lambda item: -item[1])[:10]
+        return {
+            "lag_seconds": lag,
+            "blocks": self.blocks,
+            "blocking_frames": dict(top_stacks),
+        }
+
+    def to_prometheus(self) -> str:
+        lines = ["# TYPE bot_event_loop_lag_seconds summary"]
+        for fraction in LAG_QUANTILES:
+            lines.append(
+                f'bot_event_loop_lag_seconds{{quantile="{fraction}"}} '
+                f"{self.lag.quantile(fraction):g}"
+            )
+        lines.append(f"bot_event_loop_lag_seconds_sum {self.lag.sum:g}")
+        lines.append(f"bot_event_loop_lag_seconds_count {self.lag.count}")
+        lines.append("# TYPE bot_event_loop_blocks_total counter")
+        lines.append(f"bot_event_loop_blocks_total {self.blocks}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str = None):
+        """Write the stats, Prometheus text for *.prom, JSON otherwise"""
+        path = path or self.path
+        if path.endswith(".prom"):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.stats(), indent=2)
+        write_atomically(path, content)
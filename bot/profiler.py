@@ -0,0 +1,173 @@
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+import discord
+
+from config.settings import (
+    PROFILE_SAMPLE_INTERVAL_SECONDS,
+    PROFILE_TIMEOUT_SECONDS,
+    PROFILE_TOP_FUNCTIONS,
+)
+
+MEMORY_TOP = 20
+TRACEMALLOC_FRAMES = 10
+
+
+class StackSampler:
+    """Samples the stacks of all threads into flamegraph-ready collapsed stacks"""
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    filename = os.path.basename(code.co_filename)
+                    stack.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """One 'frame;frame count' line per stack, for flamegraph.pl or speedscope"""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+class ProfileResult:
+    def __init__(
+        self, name: str, elapsed: float, report: str, collapsed: str, error=None
+    ):
+        self.name = name
+        self.elapsed = elapsed
+        self.report = report
+        self.collapsed = collapsed
+        self.error = error  # Exception raised by the operation, if any
+
+    def files(self) -> list:
+        """Report and collapsed stacks as attachments"""
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        prefix = f"profile_{self.name}_{stamp}"
+        return [
+            discord.File(io.BytesIO(self.report.encode("utf-8")), f"{prefix}.txt"),
+            discord.File(
+                io.BytesIO(self.collapsed.encode("utf-8")), f"{prefix}.collapsed"
+            ),
+        ]
+
+
+class OperationProfiler:
+    """
+    Runs named operations under cProfile, a stack sampler and tracemalloc
+
+    Operations run inside the live bot, so the numbers include whatever else
+    the event loop did meanwhile. One profile runs at a time.
+    """
+
+    def __init__(self, operations: dict = None, top: int = PROFILE_TOP_FUNCTIONS):
+        self.top = top
+        # Name -> (coroutine function, description)
+        self.operations = {} if operations is None else operations
+        self._lock = asyncio.Lock()
+
+    def is_running(self) -> bool:
+        return self._lock.locked()
+
+    async def profile(self, name: str, *args) -> ProfileResult:
+        """
+        Run an operation once while profiling it
+
+        Args:
+            name (str): Registered operation
+            *args: Passed to the operation
+
+        Returns:
+            ProfileResult: Text report and collapsed stacks
+        """
+        func, _ = self.operations[name]
+        async with self._lock:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            before = tracemalloc.take_snapshot()
+            profiler = cProfile.Profile()
+            error = None
+            start = time.perf_counter()
+            try:
+                with StackSampler() as sampler:
+                    profiler.enable()
+                    try:
+                        await asyncio.wait_for(func(*args), PROFILE_TIMEOUT_SECONDS)
+                    except Exception as e:
+                        error = e
+                    finally:
+                        profiler.disable()
+                elapsed = time.perf_counter() - start
+                after = tracemalloc.take_snapshot()
+            finally:
+                if started_tracing:
+                    tracemalloc.stop()
+
+        report = self.format_report(name, elapsed, profiler, before, after, error)
+        return ProfileResult(name, elapsed, report, sampler.collapsed(), error)
+
+    def format_report(self, name, elapsed, profiler, before, after, error) -> str:
+        out = io.StringIO()
+        out.write(f"Operation: {name}\nWall time: {elapsed:.3f}s\n")
+        if error is not None:
+            out.write(f"Failed: {type(error).__name__}: {error}\n")
+        out.write(
+            "Measured inside the running bot under cProfile, a stack sampler and "
+            "tracemalloc, absolute times are inflated.\n"
+        )
+
+        for sort_key in ("cumulative", "tottime"):
+            out.write(f"\n=== Top {self.top} functions by {sort_key} time ===\n")
+            stats = pstats.Stats(profiler, stream=out)
+            stats.strip_dirs().sort_stats(sort_key).print_stats(self.top)
+
+        ignored = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        differences = after.filter_traces(ignored).compare_to(
+            before.filter_traces(ignored), "lineno"
+        )
+        out.write(f"\n=== Top {MEMORY_TOP} allocation changes (tracemalloc) ===\n")
+        for difference in differences[:MEMORY_TOP]:
+            out.write(f"{difference}\n")
+        return out.getvalue()
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+
+import discord
+
+from config.settings import PROGRESS_UPDATE_SECONDS
+
+
+class ProgressReporter:
+    """Keeps a progress message up to date without flooding Discord with edits"""
+
+    def __init__(
+        self,
+        message,
+        total: int,
+        template: str = "{done} of {total} completed.",
+        interval: float = PROGRESS_UPDATE_SECONDS,
+    ):
+        self.message = message
+        self.total = total
+        self.done = 0
+        self.template = template
+        self.interval = interval
+        self.edits = 0
+        self._sent = message.content
+        self._last_edit = 0.0
+        self._task = None
+
+    def render(self) -> str:
+        """Text of the message for the current progress"""
+        return self.template.format(done=self.done, total=self.total)
+
+    def advance(self, amount: int = 1):
+        """
+        Count finished work and schedule an edit
+
+        Updates that arrive while an edit is pending are merged into it, so
+        the message is edited at most once per interval.
+
+        Args:
+            amount (int): How much work was finished
+        """
+        self.done += amount
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._edit_later())
+
+    async def finish(self, content: str = None):
+        """
+        Drop the pending edit and show the final state right away
+
+        Args:
+            content (str): Final text, the current progress if not given
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self._edit(content or self.render())
+
+    async def _edit_later(self):
+        loop = asyncio.get_running_loop()
+        # Progress made while an edit was in flight needs one more edit
+        while self.render() != self._sent:
+            delay = self._last_edit + self.interval - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if not await self._edit(self.render()):
+                return
+
+    async def _edit(self, content: str) -> bool:
+        if content == self._sent:
+            return True
+        self._last_edit = asyncio.get_running_loop().time()
+        try:
+            await self.message.edit(content=content)
+            self._sent = content
+            self.edits += 1
+            return True
+        except discord.HTTPException as e:
+            logging.error(f"Error updating progress message: {e}")
+            return False
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import time
+
+import schedule
+
+from config.settings import (
+    REFRESH_MAX_USERS_PER_RUN,
+    REFRESH_RUN_BUDGET_SECONDS,
+    REFRESH_TICK_MINUTES,
+)
+from parser.metrics import metrics
+from services.refresh_service import RefreshService
+from services.scrape_queue_service import ScrapeQueueService
+
+
+class RefreshScheduler:
+    """Refreshes user lists from inside the bot, each user at its own pace"""
+
+    def __init__(
+        self,
+        tick_minutes: int = REFRESH_TICK_MINUTES,
+        budget_seconds: float = REFRESH_RUN_BUDGET_SECONDS,
+        max_users: int = REFRESH_MAX_USERS_PER_RUN,
+    ):
+        self.budget_seconds = budget_seconds
+        self.max_users = max_users
+        self.refresh_service = RefreshService()
+        self.queue_service = ScrapeQueueService()
+        self._scheduler = schedule.Scheduler()
+        self._scheduler.every(tick_minutes).minutes.do(self.run_soon)
+        self._loop_task = None
+        self._run_task = None
+
+    def start(self):
+        """Start the scheduler loop, calling it again does nothing"""
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._loop())
+            self.run_soon()
+
+    def run_soon(self):
+        """Start a refresh run unless one is already going"""
+        if self._run_task is None or self._run_task.done():
+            self._run_task = asyncio.create_task(self.run())
+
+    async def request_refresh(self, user_id: int):
+        """
+        Refresh a user now instead of waiting for its turn
+
+        Args:
+            user_id (int): ID of the user
+        """
+        await self.refresh_service.request_refresh(user_id)
+        self.run_soon()
+
+    async def _loop(self):
+        while True:
+            self._scheduler.run_pending()
+            await asyncio.sleep(1)
+
+    async def run(self) -> int:
+        """
+        Queue users that are due and work the queue until the budget runs out
+
+        Returns:
+            int: Number of tasks run
+        """
+        # The worker pulls in Playwright, so it is loaded by the first run
+        from parser.worker import work
+
+        deadline = time.monotonic() + self.budget_seconds
+        try:
+            await self.refresh_service.flush_activity()
+            users = await self.refresh_service.get_due_users(self.max_users)
+            for user in users:
+                await self.queue_service.enqueue_user(user.id, user.kinorium_id)
+                # Not due again until the list check reschedules it
+                await self.refresh_service.schedule_next(
+                    user.id, user.change_score, user.last_active_at
+                )
+
+            processed = await work(0, exit_when_empty=True, deadline=deadline)
+            logging.info(
+                f"Refresh run queued {len(users)} users and ran {processed} tasks"
+            )
+            return processed
+        except Exception as e:
+            logging.error(f"Error in refresh run: {e}")
+            return 0
+        finally:
+            metrics.export()
@@ -0,0 +1,36 @@
+from config.settings import DISCORD_SHARD_COUNT, DISCORD_SHARD_IDS, DISCORD_SHARDING
+
+
+def shard_options() -> dict:
+    """
+    Arguments of AutoShardedBot for the shards this process runs
+
+    Returns:
+        dict: shard_count and shard_ids, empty to let discord.py pick both
+    """
+    if DISCORD_SHARD_IDS and not DISCORD_SHARD_COUNT:
+        # Every process has to split the same number of shards
+        raise ValueError("DISCORD_SHARD_IDS needs DISCORD_SHARD_COUNT")
+    invalid = [i for i in DISCORD_SHARD_IDS if not 0 <= i < DISCORD_SHARD_COUNT]
+    if invalid:
+        raise ValueError(
+            f"Shard IDs {invalid} are outside 0..{DISCORD_SHARD_COUNT - 1}"
+        )
+
+    options = {}
+    if DISCORD_SHARD_COUNT:
+        options["shard_count"] = DISCORD_SHARD_COUNT
+    if DISCORD_SHARD_IDS:
+        options["shard_ids"] = DISCORD_SHARD_IDS
+    return options
+
+
+def is_primary_process() -> bool:
+    """
+    Whether this process runs shard 0, or is the only process
+
+    Global work runs only here: syncing slash commands and refreshing user
+    lists. Direct messages arrive on shard 0 as well.
+    """
+    return not DISCORD_SHARDING or not DISCORD_SHARD_IDS or 0 in DISCORD_SHARD_IDS
+
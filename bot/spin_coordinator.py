@@ -0,0 +1,101 @@
+import asyncio
+import logging
+
+MAX_QUEUED_SPINS = 1  # Spins allowed to wait while another one is running
+
+
+class SpinCoordinator:
+    """Serializes wheel spins and runs their delayed steps as background tasks"""
+
+    def __init__(self, max_queued: int = MAX_QUEUED_SPINS):
+        self.max_queued = max_queued
+        # Entries exist only while a spin runs or waits, idle wheels are dropped
+        self._locks = {}
+        self._queued = {}
+        self._tasks = set()
+
+    def is_spinning(self, key) -> bool:
+        """
+        Check whether a spin is running for the key
+
+        Args:
+            key: Wheel the spin belongs to
+
+        Returns:
+            bool: True if the wheel is spinning
+        """
+        lock = self._locks.get(key)
+        return lock is not None and lock.locked()
+
+    async def acquire(self, key) -> bool:
+        """
+        Wait for the spin slot of the key
+
+        Args:
+            key: Wheel the spin belongs to
+
+        Returns:
+            bool: True once the slot is taken, False if too many spins are queued
+        """
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        if lock.locked() and self._queued.get(key, 0) >= self.max_queued:
+            logging.info(f"Spin for wheel {key} rejected, queue is full")
+            return False
+
+        self._queued[key] = self._queued.get(key, 0) + 1
+        try:
+            await lock.acquire()
+        finally:
+            self._queued[key] -= 1
+            if not self._queued[key]:
+                del self._queued[key]
+                self._forget_if_idle(key)  # A cancelled wait may leave it unused
+        return True
+
+    def release(self, key):
+        """
+        Free the spin slot of the key so the next queued spin can start
+
+        Args:
+            key: Wheel the spin belongs to
+        """
+        self._locks[key].release()
+        self._forget_if_idle(key)
+
+    def _forget_if_idle(self, key):
+        lock = self._locks.get(key)
+        if lock is not None and not lock.locked() and key not in self._queued:
+            del self._locks[key]
+
+    def finish_later(self, key, delay: float, callback, *args) -> asyncio.Task:
+        """
+        Run a coroutine function after a delay, then free the spin slot
+
+        The caller returns immediately, the slot stays taken until the
+        callback has finished.
+
+        Args:
+            key: Wheel the spin belongs to
+            delay (float): Seconds to wait before running the callback
+            callback: Coroutine function to run
+            *args: Arguments for the callback
+
+        Returns:
+            asyncio.Task: Scheduled task
+        """
+        task = asyncio.create_task(self._run_later(key, delay, callback, *args))
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run_later(self, key, delay: float, callback, *args):
+        try:
+            await asyncio.sleep(delay)
+            await callback(*args)
+        except Exception as e:
+            logging.error(f"Error finishing spin for wheel {key}: {e}")
+        finally:
+            self.release(key)
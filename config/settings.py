@@ -0,0 +1,100 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Output format of the wheel animation: "gif", "webp" or "mp4"
+SPIN_OUTPUT_FORMAT = os.getenv("SPIN_OUTPUT_FORMAT", "gif").lower()
+
+# How often a cached wheel checks its version in the database, in seconds
+WHEEL_CACHE_REVALIDATE_SECONDS = float(os.getenv("WHEEL_CACHE_REVALIDATE_SECONDS", "5"))
+# Wheels kept in memory, the least recently used one is dropped beyond the limit,
+# and how long a loaded wheel is kept before it is read again, in seconds
+WHEEL_CACHE_MAX_SIZE = int(os.getenv("WHEEL_CACHE_MAX_SIZE", "1000"))
+WHEEL_CACHE_TTL_SECONDS = float(os.getenv("WHEEL_CACHE_TTL_SECONDS", "3600"))
+
+# Lifetime of cached users and search sites, in seconds
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "300"))
+SEARCH_SITES_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_SITES_CACHE_TTL_SECONDS", "600"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+# Lifetime of cached "user not found" results. Keep it short when shards run in
+# several processes, a user registered through one is unknown to the others until then
+USER_CACHE_NEGATIVE_TTL_SECONDS = float(
+    os.getenv("USER_CACHE_NEGATIVE_TTL_SECONDS", "30")
+)
+
+# Give every channel its own wheel instead of one wheel per guild
+WHEEL_PER_CHANNEL = os.getenv("WHEEL_PER_CHANNEL", "false").lower() == "true"
+
+# Minimum time between edits of a progress message, in seconds
+PROGRESS_UPDATE_SECONDS = float(os.getenv("PROGRESS_UPDATE_SECONDS", "2"))
+
+# Adaptive refresh of user lists, run inside the bot instead of the nightly cron
+REFRESH_SCHEDULER_ENABLED = (
+    os.getenv("REFRESH_SCHEDULER_ENABLED", "true").lower() == "true"
+)
+REFRESH_TICK_MINUTES = int(os.getenv("REFRESH_TICK_MINUTES", "10"))
+REFRESH_RUN_BUDGET_SECONDS = float(os.getenv("REFRESH_RUN_BUDGET_SECONDS", "300"))
+REFRESH_MAX_USERS_PER_RUN = int(os.getenv("REFRESH_MAX_USERS_PER_RUN", "50"))
+REFRESH_MIN_INTERVAL_HOURS = float(os.getenv("REFRESH_MIN_INTERVAL_HOURS", "6"))
+REFRESH_MAX_INTERVAL_HOURS = float(os.getenv("REFRESH_MAX_INTERVAL_HOURS", "168"))
+REFRESH_DORMANT_DAYS = float(os.getenv("REFRESH_DORMANT_DAYS", "30"))
+REFRESH_JITTER = float(os.getenv("REFRESH_JITTER", "0.2"))
+
+# Where the scraper loads user lists from, point it at a replay server for benchmarks
+KINORIUM_BASE_URL = os.getenv(
+    "KINORIUM_BASE_URL", "https://ua.kinorium.com"
+).rstrip("/")
+
+# Scraper metrics written after every run, Prometheus text for *.prom, JSON otherwise
+SCRAPER_METRICS_PATH = os.getenv("SCRAPER_METRICS_PATH", "scraper_metrics.json")
+# Pages a scrape job loads at once, every page starts its own browser
+SCRAPE_JOB_PAGE_CONCURRENCY = int(os.getenv("SCRAPE_JOB_PAGE_CONCURRENCY", "2"))
+
+# Log every SQL statement of the schema setup
+DATABASE_ECHO = os.getenv("DATABASE_ECHO", "false").lower() == "true"
+
+# Hash of the last synced slash command tree, the sync is skipped while it matches
+COMMAND_SYNC_STATE_PATH = os.getenv("COMMAND_SYNC_STATE_PATH", ".command_tree_hash")
+
+# Messages discord.py keeps for edit and delete events, 0 disables the cache
+DISCORD_MAX_MESSAGES = int(os.getenv("DISCORD_MAX_MESSAGES", "100"))
+# Request the privileged members intent and cache guild members, no command needs it
+DISCORD_CACHE_MEMBERS = os.getenv("DISCORD_CACHE_MEMBERS", "false").lower() == "true"
+
+# Sharding with AutoShardedBot. DISCORD_SHARD_COUNT=0 uses Discord's recommendation.
+# To split shards between processes, give every process the same total count and
+# its own comma separated DISCORD_SHARD_IDS, e.g. "0,1" and "2,3" for 4 shards
+DISCORD_SHARDING = os.getenv("DISCORD_SHARDING", "false").lower() == "true"
+DISCORD_SHARD_COUNT = int(os.getenv("DISCORD_SHARD_COUNT", "0"))
+DISCORD_SHARD_IDS = [
+    int(shard_id)
+    for shard_id in os.getenv("DISCORD_SHARD_IDS", "").split(",")
+    if shard_id.strip()
+]
+
+# Event loop lag monitor: samples lag and logs the stack of whatever blocks the loop
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+LOOP_LAG_SAMPLE_SECONDS = float(os.getenv("LOOP_LAG_SAMPLE_SECONDS", "0.5"))
+LOOP_BLOCK_THRESHOLD_SECONDS = float(os.getenv("LOOP_BLOCK_THRESHOLD_SECONDS", "0.25"))
+LOOP_METRICS_EXPORT_SECONDS = float(os.getenv("LOOP_METRICS_EXPORT_SECONDS", "60"))
+# Prometheus text for *.prom, JSON otherwise, empty to keep the numbers in memory
+LOOP_METRICS_PATH = os.getenv("LOOP_METRICS_PATH", "loop_metrics.json")
+# asyncio debug mode also names slow callbacks, but slows the whole bot down
+LOOP_ASYNCIO_DEBUG = os.getenv("LOOP_ASYNCIO_DEBUG", "false").lower() == "true"
+
+# Tracing of bot commands and interactions down to service calls and SQL queries
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+# Finished spans are appended here as JSON lines, empty to disable the file
+TRACE_PATH = os.getenv("TRACE_PATH", "traces.jsonl")
+# OTLP/HTTP JSON endpoint of a collector, e.g. http://localhost:4318/v1/traces
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "")
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1"))
+TRACE_FLUSH_SECONDS = float(os.getenv("TRACE_FLUSH_SECONDS", "5"))
+
+# !profile: functions listed in the report, stack sampling period and time limit
+PROFILE_TOP_FUNCTIONS = int(os.getenv("PROFILE_TOP_FUNCTIONS", "30"))
+PROFILE_SAMPLE_INTERVAL_SECONDS = float(
+    os.getenv("PROFILE_SAMPLE_INTERVAL_SECONDS", "0.005")
+)
+PROFILE_TIMEOUT_SECONDS = float(os.getenv("PROFILE_TIMEOUT_SECONDS", "120"))
@@ -1,7 +1,11 @@
-from sqlalchemy import create_engine, MetaData, text
+import asyncio
+import zlib
+from sqlalchemy import create_engine, MetaData, text, inspect
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.schema import CreateIndex, CreateTable
 from databases import Database
 import logging
+from config.settings import DATABASE_ECHO
 
 DATABASE_URL = "sqlite+aiosqlite:///./movies.db"
 
@@ -10,17 +14,107 @@ metadata = MetaData()
 
 Base = declarative_base(metadata=metadata)
 
+_schema_lock = asyncio.Lock()
+_schema_ready = False
+
+
+def schema_version(engine) -> int:
+    """Checksum of the DDL of every table and index, kept in PRAGMA user_version"""
+    ddl = []
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=engine.dialect)))
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            ddl.append(str(CreateIndex(index).compile(dialect=engine.dialect)))
+    # user_version is a signed 32-bit integer, 0 means never initialized
+    return zlib.crc32("".join(ddl).encode("utf-8")) & 0x7FFFFFFF or 1
+
 
 # Database initialization
 def init_db():
-    # Create tables
     engine = create_engine(
-        "sqlite:///./movies.db", echo=True, future=True
+        "sqlite:///./movies.db", echo=DATABASE_ECHO, future=True
     )  # Using synchronous driver
-    Base.metadata.create_all(bind=engine)
+    try:
+        version = schema_version(engine)
+        with engine.connect() as connection:
+            current = connection.execute(text("PRAGMA user_version;")).scalar()
+        if current == version:
+            return  # Schema is up to date, skip inspecting every table
+
+        # Create tables
+        Base.metadata.create_all(bind=engine)
+        add_missing_columns(engine)
+        remove_duplicate_wheel_entries(engine)
+        add_missing_indexes(engine)
+
+        # Create trigger
+        create_trigger(engine)
+
+        with engine.begin() as connection:
+            connection.execute(text(f"PRAGMA user_version = {version};"))
+        logging.info(f"Database schema updated to version {version}")
+    finally:
+        engine.dispose()
+
+
+async def ensure_schema():
+    """Run init_db once per process, in a thread so the event loop keeps going"""
+    global _schema_ready
+    async with _schema_lock:
+        if not _schema_ready:
+            await asyncio.to_thread(init_db)
+            _schema_ready = True
+
+
+def add_missing_columns(engine):
+    """Add columns that were introduced after their table had been created"""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing_columns = {
+                column["name"] for column in inspector.get_columns(table.name)
+            }
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+                connection.execute(text(ddl))
+                logging.info(f"Added column {table.name}.{column.name}")
 
-    # Create trigger
-    create_trigger(engine)
+
+def add_missing_indexes(engine):
+    """Create indexes that were introduced after their table had been created"""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing_indexes = {
+                index["name"] for index in inspector.get_indexes(table.name)
+            }
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(connection)
+                    logging.info(f"Created index {index.name}")
+
+
+def remove_duplicate_wheel_entries(engine):
+    """Keep one entry per movie in each wheel so the unique index can be created"""
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                """
+                DELETE FROM movie_wheel_entries
+                WHERE id NOT IN (
+                    SELECT MIN(id) FROM movie_wheel_entries
+                    GROUP BY wheel_id, movie_id
+                );
+                """
+            )
+        )
 
 
 def create_trigger(engine):
@@ -3,6 +3,7 @@ from sqlalchemy import (
     Integer,
     String,
     Float,
+    Boolean,
     Enum,
     ForeignKey,
     Date,
@@ -22,6 +23,13 @@ class UserMovieStatus(PyEnum):
     WATCH_LATER = "watch_later"
 
 
+class ScrapeJobStatus(PyEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
 class Movie(Base):
     __tablename__ = "movies"
 
@@ -97,8 +105,13 @@ class MovieWheel(Base):
     __tablename__ = "movie_wheel"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String, nullable=False, unique=True)  # Should be only one wheel
+    name = Column(String, nullable=False, unique=True)  # One wheel per scope
+    guild_id = Column(String, nullable=True)  # None for the global wheel
+    channel_id = Column(String, nullable=True)  # Set only for per-channel wheels
     created_at = Column(DateTime, server_default=func.now())
+    version = Column(
+        Integer, nullable=False, server_default="0"
+    )  # Bumped on every change of the entries, used to invalidate caches
 
     entries = relationship(
         "MovieWheelEntry", back_populates="wheel", cascade="all, delete-orphan"
@@ -118,3 +131,104 @@ class MovieWheelEntry(Base):
     wheel = relationship("MovieWheel", back_populates="entries")
     movie = relationship("Movie")
     user = relationship("User")
+
+    __table_args__ = (
+        Index("ix_wheel_entry_wheel_movie", "wheel_id", "movie_id", unique=True),
+    )
+
+
+class ScrapeJob(Base):
+    __tablename__ = "scrape_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kinorium_id = Column(Integer, nullable=False)
+    status = Column(Enum(ScrapeJobStatus), nullable=False)
+    pages_total = Column(Integer, nullable=False, server_default="0")
+    pages_done = Column(Integer, nullable=False, server_default="0")
+    movies_total = Column(Integer, nullable=False, server_default="0")
+    movies_done = Column(Integer, nullable=False, server_default="0")
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (Index("ix_scrape_job_kinorium_status", "kinorium_id", "status"),)
+
+
+class ScrapeJobPage(Base):
+    """Checkpoint of one list page of a scrape job"""
+
+    __tablename__ = "scrape_job_pages"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(
+        Integer, ForeignKey("scrape_jobs.id", ondelete="CASCADE"), nullable=False
+    )
+    list_type = Column(Enum(UserMovieStatus), nullable=False)
+    page = Column(Integer, nullable=False)
+    done = Column(Boolean, nullable=False, server_default="0")
+    rows_committed = Column(Integer, nullable=False, server_default="0")
+    attempts = Column(Integer, nullable=False, server_default="0")
+    error = Column(String, nullable=True)
+    updated_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_scrape_job_page", "job_id", "list_type", "page", unique=True),
+    )
+
+
+class ScrapeTask(Base):
+    """Page of a user list waiting in the shared scrape queue"""
+
+    __tablename__ = "scrape_tasks"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kinorium_id = Column(Integer, nullable=False)
+    list_type = Column(Enum(UserMovieStatus), nullable=False)
+    page = Column(Integer, nullable=False)  # 0 counts the pages of the list
+    status = Column(Enum(ScrapeJobStatus), nullable=False)
+    attempts = Column(Integer, nullable=False, server_default="0")
+    available_at = Column(Float, nullable=False, server_default="0")  # Unix time
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(Float, nullable=True)  # Unix time
+    rows_committed = Column(Integer, nullable=False, server_default="0")
+    error = Column(String, nullable=True)
+    updated_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_scrape_task_user_list_page", "user_id", "list_type", "page", unique=True
+        ),
+        Index("ix_scrape_task_status_available", "status", "available_at"),
+    )
+
+
+class HostThrottle(Base):
+    """Pause of every scraper process against a host that throttles or fails"""
+
+    __tablename__ = "host_throttles"
+
+    host = Column(String, primary_key=True)
+    open_until = Column(Float, nullable=False, server_default="0")  # Unix time
+    reason = Column(String, nullable=True)
+    updated_at = Column(DateTime, server_default=func.now())
+
+
+class UserRefreshState(Base):
+    """How often the lists of a user change and when to refresh them next"""
+
+    __tablename__ = "user_refresh_state"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    change_score = Column(
+        Float, nullable=False, server_default="0.5"
+    )  # Higher of the two list scores below, drives the schedule
+    watch_later_change_score = Column(Float, nullable=False, server_default="0.5")
+    watched_change_score = Column(Float, nullable=False, server_default="0.5")
+    last_refresh_at = Column(Float, nullable=True)  # Unix time
+    next_refresh_at = Column(Float, nullable=False, server_default="0")  # Unix time
+    last_active_at = Column(Float, nullable=True)  # Unix time
+
+    __table_args__ = (Index("ix_user_refresh_next", "next_refresh_at"),)
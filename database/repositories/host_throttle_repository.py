@@ -0,0 +1,33 @@
+from sqlalchemy import select, func
+from sqlalchemy.dialects.sqlite import insert
+from database.db import get_db
+from database.models import HostThrottle
+
+
+class HostThrottleRepository:
+    @staticmethod
+    async def get_throttle(host: str):
+        """Get the pause recorded for a host"""
+        db = await get_db()
+        async with db.transaction():
+            query = select(HostThrottle).where(HostThrottle.host == host)
+            return await db.fetch_one(query)
+
+    @staticmethod
+    async def open(host: str, open_until: float, reason: str):
+        """Pause a host until the given Unix time, a longer pause already set wins"""
+        db = await get_db()
+        async with db.transaction():
+            query = insert(HostThrottle).values(
+                host=host, open_until=open_until, reason=reason
+            )
+            query = query.on_conflict_do_update(
+                index_elements=["host"],
+                set_={
+                    "open_until": query.excluded.open_until,
+                    "reason": query.excluded.reason,
+                    "updated_at": func.now(),
+                },
+                where=HostThrottle.open_until < query.excluded.open_until,
+            )
+            await db.execute(query)
@@ -1,28 +1,64 @@
-from sqlalchemy import select, insert, delete
+from sqlalchemy import select, delete, update
+from sqlalchemy.dialects.sqlite import insert
 from database.db import get_db
 from database.models import Movie, MovieWheel, MovieWheelEntry, User
 
 
+GLOBAL_WHEEL_NAME = "Global Wheel"
+
+
 class WheelRepository:
     @staticmethod
-    async def get_global_wheel():
-        """Get a global wheel"""
+    async def get_wheel(name: str):
+        """Get a wheel ID by its name"""
         db = await get_db()
         async with db.transaction():
-            query = select(MovieWheel).where(MovieWheel.name == "Global Wheel")
-            wheel = await db.fetch_one(query)
-            return wheel.id if wheel else None
+            query = select(MovieWheel.id).where(MovieWheel.name == name)
+            return await db.fetch_val(query)
 
     @staticmethod
-    async def create_global_wheel():
-        """Create a global wheel"""
+    async def create_wheel(name: str, guild_id: str = None, channel_id: str = None):
+        """Create a wheel, or get the existing one if it was created concurrently"""
         db = await get_db()
         async with db.transaction():
             query = (
-                insert(MovieWheel).values(name="Global Wheel").returning(MovieWheel.id)
+                insert(MovieWheel)
+                .values(name=name, guild_id=guild_id, channel_id=channel_id)
+                .on_conflict_do_nothing(index_elements=["name"])
             )
+            await db.execute(query)
+            query = select(MovieWheel.id).where(MovieWheel.name == name)
             return await db.fetch_val(query)
 
+    @classmethod
+    async def get_global_wheel(cls):
+        """Get a global wheel"""
+        return await cls.get_wheel(GLOBAL_WHEEL_NAME)
+
+    @classmethod
+    async def create_global_wheel(cls):
+        """Create a global wheel"""
+        return await cls.create_wheel(GLOBAL_WHEEL_NAME)
+
+    @staticmethod
+    async def get_wheel_version(wheel_id: int):
+        """Get the version counter of the wheel"""
+        db = await get_db()
+        async with db.transaction():
+            query = select(MovieWheel.version).where(MovieWheel.id == wheel_id)
+            return await db.fetch_val(query)
+
+    @staticmethod
+    async def bump_version(db, wheel_id: int):
+        """Increment the version counter of the wheel and return the new value"""
+        query = (
+            update(MovieWheel)
+            .where(MovieWheel.id == wheel_id)
+            .values(version=MovieWheel.version + 1)
+            .returning(MovieWheel.version)
+        )
+        return await db.fetch_val(query)
+
     @classmethod
     async def add_movie_to_wheel(
         cls, movie_id: int, user_id: int, wheel_id: int = None
@@ -32,10 +68,13 @@ class WheelRepository:
         async with db.transaction():
             wheel_id = await cls.get_global_wheel() if wheel_id is None else wheel_id
 
-            query = insert(MovieWheelEntry).values(
-                wheel_id=wheel_id, movie_id=movie_id, user_id=user_id
+            query = (
+                insert(MovieWheelEntry)
+                .values(wheel_id=wheel_id, movie_id=movie_id, user_id=user_id)
+                .on_conflict_do_nothing(index_elements=["wheel_id", "movie_id"])
             )
             await db.execute(query)
+            return await cls.bump_version(db, wheel_id)
 
     @classmethod
     async def delete_movie_from_wheel(cls, movie_id: int, wheel_id: int = None):
@@ -49,6 +88,7 @@ class WheelRepository:
                 MovieWheelEntry.movie_id == movie_id,
             )
             await db.execute(query)
+            return await cls.bump_version(db, wheel_id)
 
     @classmethod
     async def clear_wheel(cls, wheel_id: int = None):
@@ -59,6 +99,7 @@ class WheelRepository:
 
             query = delete(MovieWheelEntry).where(MovieWheelEntry.wheel_id == wheel_id)
             await db.execute(query)
+            return await cls.bump_version(db, wheel_id)
 
     @classmethod
     async def get_movies_in_wheel(cls, wheel_id: int = None):
@@ -73,6 +114,36 @@ class WheelRepository:
             )
             return await db.fetch_all(query)
 
+    @classmethod
+    async def get_wheel_entries(cls, wheel_id: int = None, movie_id: int = None):
+        """Get movies in the wheel in the order they were added, with who added them"""
+        db = await get_db()
+        wheel_id = await cls.get_global_wheel() if wheel_id is None else wheel_id
+        async with db.transaction():
+            query = (
+                select(Movie, MovieWheelEntry.user_id.label("added_by"))
+                .join(MovieWheelEntry)
+                .where(MovieWheelEntry.wheel_id == wheel_id)
+                .order_by(MovieWheelEntry.id)
+            )
+            if movie_id is not None:
+                query = query.where(MovieWheelEntry.movie_id == movie_id)
+            return await db.fetch_all(query)
+
+    @classmethod
+    async def get_wheel_users(cls, wheel_id: int = None):
+        """Get users who added movies to the wheel"""
+        db = await get_db()
+        wheel_id = await cls.get_global_wheel() if wheel_id is None else wheel_id
+        async with db.transaction():
+            query = (
+                select(User)
+                .join(MovieWheelEntry)
+                .where(MovieWheelEntry.wheel_id == wheel_id)
+                .distinct()
+            )
+            return await db.fetch_all(query)
+
     @classmethod
     async def get_winner_user(cls, movie_id: int, wheel_id: int = None):
         """We get a winning movie user"""
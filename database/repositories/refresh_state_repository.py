@@ -0,0 +1,118 @@
+from sqlalchemy import select, func, update
+from sqlalchemy.dialects.sqlite import insert
+from database.db import get_db
+from database.models import User, UserMovieStatus, UserRefreshState
+
+
+# List -> (its change score, the score of the other list)
+LIST_SCORES = {
+    UserMovieStatus.WATCH_LATER: (
+        UserRefreshState.watch_later_change_score,
+        UserRefreshState.watched_change_score,
+    ),
+    UserMovieStatus.WATCHED: (
+        UserRefreshState.watched_change_score,
+        UserRefreshState.watch_later_change_score,
+    ),
+}
+
+
+class RefreshStateRepository:
+    @staticmethod
+    async def get_state(user_id: int):
+        """Get the refresh state of a user"""
+        db = await get_db()
+        async with db.transaction():
+            query = select(UserRefreshState).where(
+                UserRefreshState.user_id == user_id
+            )
+            return await db.fetch_one(query)
+
+    @staticmethod
+    async def get_due_users(now: float, limit: int):
+        """Get users whose refresh is due, most overdue first, new users included"""
+        db = await get_db()
+        async with db.transaction():
+            next_refresh_at = func.coalesce(UserRefreshState.next_refresh_at, 0)
+            query = (
+                select(
+                    User.id,
+                    User.kinorium_id,
+                    UserRefreshState.change_score,
+                    UserRefreshState.last_active_at,
+                )
+                .outerjoin(UserRefreshState, UserRefreshState.user_id == User.id)
+                .where(next_refresh_at <= now)
+                .order_by(next_refresh_at)
+                .limit(limit)
+            )
+            return await db.fetch_all(query)
+
+    @staticmethod
+    async def save_state(user_id: int, **values):
+        """Create or update the refresh state of a user"""
+        db = await get_db()
+        async with db.transaction():
+            query = insert(UserRefreshState).values(user_id=user_id, **values)
+            query = query.on_conflict_do_update(
+                index_elements=["user_id"], set_=values
+            )
+            await db.execute(query)
+
+    @staticmethod
+    async def record_list_check(
+        user_id: int,
+        list_type: UserMovieStatus,
+        changed: bool,
+        weight: float,
+        now: float,
+    ):
+        """
+        Move the change score of one list towards the result of its check
+
+        The update is a single statement, so the check of the other list or a
+        check by another worker is never overwritten. The user's change_score
+        becomes the higher of both list scores: the user changed if any list did.
+
+        Returns:
+            Record: The new change_score and last_active_at
+        """
+        score, other_score = LIST_SCORES[list_type]
+        new_score = score + weight * (float(changed) - score)
+        db = await get_db()
+        async with db.transaction():
+            query = insert(UserRefreshState).values(user_id=user_id)
+            await db.execute(query.on_conflict_do_nothing(index_elements=["user_id"]))
+            query = (
+                update(UserRefreshState)
+                .where(UserRefreshState.user_id == user_id)
+                .values(
+                    {
+                        score: new_score,
+                        UserRefreshState.change_score: func.max(new_score, other_score),
+                        UserRefreshState.last_refresh_at: now,
+                    }
+                )
+                .returning(
+                    UserRefreshState.change_score, UserRefreshState.last_active_at
+                )
+            )
+            return await db.fetch_one(query)
+
+    @staticmethod
+    async def save_activity(last_active: dict):
+        """Store when users last used the bot, as user ID -> Unix time"""
+        db = await get_db()
+        async with db.transaction():
+            query = insert(UserRefreshState)
+            query = query.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={"last_active_at": query.excluded.last_active_at},
+            )
+            await db.execute_many(
+                query,
+                values=[
+                    {"user_id": user_id, "last_active_at": active_at}
+                    for user_id, active_at in last_active.items()
+                ],
+            )
@@ -0,0 +1,177 @@
+from sqlalchemy import select, update, func, or_
+from sqlalchemy.dialects.sqlite import insert
+from database.db import get_db
+from database.models import ScrapeJob, ScrapeJobPage, ScrapeJobStatus
+
+ACTIVE_STATUSES = (ScrapeJobStatus.QUEUED, ScrapeJobStatus.RUNNING)
+
+
+class ScrapeJobRepository:
+    @staticmethod
+    async def create_job(kinorium_id: int):
+        """Create a queued job and return its ID"""
+        db = await get_db()
+        async with db.transaction():
+            query = (
+                insert(ScrapeJob)
+                .values(kinorium_id=kinorium_id, status=ScrapeJobStatus.QUEUED)
+                .returning(ScrapeJob.id)
+            )
+            return await db.fetch_val(query)
+
+    @staticmethod
+    async def get_job(job_id: int):
+        """Get a job by ID"""
+        db = await get_db()
+        async with db.transaction():
+            query = select(ScrapeJob).where(ScrapeJob.id == job_id)
+            return await db.fetch_one(query)
+
+    @staticmethod
+    async def get_active_job(kinorium_id: int):
+        """Get the queued or running job of a Kinorium user"""
+        db = await get_db()
+        async with db.transaction():
+            query = (
+                select(ScrapeJob)
+                .where(
+                    ScrapeJob.kinorium_id == kinorium_id,
+                    # IN () parameters skip the Enum conversion, compare one by one
+                    or_(*(ScrapeJob.status == status for status in ACTIVE_STATUSES)),
+                )
+                .order_by(ScrapeJob.id.desc())
+            )
+            return await db.fetch_one(query)
+
+    @staticmethod
+    async def get_interrupted_jobs():
+        """Get queued or running jobs, at startup no task runs them any more"""
+        db = await get_db()
+        async with db.transaction():
+            query = (
+                select(ScrapeJob)
+                .where(or_(*(ScrapeJob.status == status for status in ACTIVE_STATUSES)))
+                .order_by(ScrapeJob.id)
+            )
+            return await db.fetch_all(query)
+
+    @staticmethod
+    async def get_latest_job(kinorium_id: int):
+        """Get the most recent job of a Kinorium user"""
+        db = await get_db()
+        async with db.transaction():
+            query = (
+                select(ScrapeJob)
+                .where(ScrapeJob.kinorium_id == kinorium_id)
+                .order_by(ScrapeJob.id.desc())
+            )
+            return await db.fetch_one(query)
+
+    @staticmethod
+    async def update_job(job_id: int, **values):
+        """Update job fields"""
+        db = await get_db()
+        async with db.transaction():
+            query = (
+                update(ScrapeJob)
+                .where(ScrapeJob.id == job_id)
+                .values(updated_at=func.now(), **values)
+            )
+            await db.execute(query)
+
+    @staticmethod
+    async def get_resumable_job(kinorium_id: int):
+        """Get the latest job of a Kinorium user if it did not finish"""
+        db = await get_db()
+        async with db.transaction():
+            query = (
+                select(ScrapeJob)
+                .where(ScrapeJob.kinorium_id == kinorium_id)
+                .order_by(ScrapeJob.id.desc())
+            )
+            job = await db.fetch_one(query)
+            if job is None or job.status == ScrapeJobStatus.DONE:
+                return None
+            return job
+
+    @staticmethod
+    async def add_pages(job_id: int, pages: list):
+        """Record the pages a job has to scrape, as (list type, page) pairs"""
+        db = await get_db()
+        async with db.transaction():
+            query = insert(ScrapeJobPage).on_conflict_do_nothing(
+                index_elements=["job_id", "list_type", "page"]
+            )
+            await db.execute_many(
+                query,
+                values=[
+                    {"job_id": job_id, "list_type": list_type, "page": page}
+                    for list_type, page in pages
+                ],
+            )
+
+    @staticmethod
+    async def get_pending_pages(job_id: int):
+        """Get pages of the job that have not been committed yet"""
+        db = await get_db()
+        async with db.transaction():
+            query = (
+                select(ScrapeJobPage)
+                .where(ScrapeJobPage.job_id == job_id, ScrapeJobPage.done.is_(False))
+                .order_by(ScrapeJobPage.id)
+            )
+            return await db.fetch_all(query)
+
+    @staticmethod
+    async def complete_page(
+        job_id: int, list_type, page: int, movies_count: int, rows_committed: int
+    ):
+        """Checkpoint a committed page and count it in the job progress"""
+        db = await get_db()
+        async with db.transaction():
+            query = (
+                update(ScrapeJobPage)
+                .where(
+                    ScrapeJobPage.job_id == job_id,
+                    ScrapeJobPage.list_type == list_type,
+                    ScrapeJobPage.page == page,
+                )
+                .values(
+                    done=True,
+                    rows_committed=rows_committed,
+                    attempts=ScrapeJobPage.attempts + 1,
+                    error=None,
+                    updated_at=func.now(),
+                )
+            )
+            await db.execute(query)
+            query = (
+                update(ScrapeJob)
+                .where(ScrapeJob.id == job_id)
+                .values(
+                    pages_done=ScrapeJob.pages_done + 1,
+                    movies_done=ScrapeJob.movies_done + movies_count,
+                    updated_at=func.now(),
+                )
+            )
+            await db.execute(query)
+
+    @staticmethod
+    async def fail_page(job_id: int, list_type, page: int, error: str):
+        """Record a failed attempt at a page"""
+        db = await get_db()
+        async with db.transaction():
+            query = (
+                update(ScrapeJobPage)
+                .where(
+                    ScrapeJobPage.job_id == job_id,
+                    ScrapeJobPage.list_type == list_type,
+                    ScrapeJobPage.page == page,
+                )
+                .values(
+                    attempts=ScrapeJobPage.attempts + 1,
+                    error=error,
+                    updated_at=func.now(),
+                )
+            )
+            await db.execute(query)
@@ -0,0 +1,182 @@
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.dialects.sqlite import insert
+from database.db import get_db
+from database.models import ScrapeTask, ScrapeJobStatus
+
+
+class ScrapeTaskRepository:
+    @staticmethod
+    async def enqueue(tasks: list, now: float):
+        """
+        Queue tasks given as dicts with user_id, kinorium_id, list_type and page
+
+        A task that is already queued, done or failed is queued again from
+        scratch, one that a worker still holds a lease on is left alone.
+        """
+        db = await get_db()
+        async with db.transaction():
+            query = insert(ScrapeTask)
+            query = query.on_conflict_do_update(
+                index_elements=["user_id", "list_type", "page"],
+                set_={
+                    "kinorium_id": query.excluded.kinorium_id,
+                    "status": ScrapeJobStatus.QUEUED,
+                    "attempts": 0,
+                    "available_at": now,
+                    "lease_owner": None,
+                    "lease_expires_at": None,
+                    "error": None,
+                    "updated_at": func.now(),
+                },
+                where=or_(
+                    ScrapeTask.status != ScrapeJobStatus.RUNNING,
+                    ScrapeTask.lease_expires_at < now,
+                ),
+            )
+            await db.execute_many(
+                query,
+                values=[
+                    dict(task, status=ScrapeJobStatus.QUEUED, available_at=now)
+                    for task in tasks
+                ],
+            )
+
+    @staticmethod
+    async def claim(
+        worker_id: str, now: float, lease_seconds: float, max_attempts: int
+    ):
+        """
+        Lease the next available task to a worker
+
+        Runs as a single UPDATE, so two workers never get the same task.
+        Tasks whose lease expired are handed out again.
+
+        Returns:
+            ScrapeTask: Claimed task, or None if there is nothing to do
+        """
+        db = await get_db()
+        async with db.transaction():
+            # Leases that ran out on the last attempt will not be retried
+            query = (
+                update(ScrapeTask)
+                .where(
+                    ScrapeTask.status == ScrapeJobStatus.RUNNING,
+                    ScrapeTask.lease_expires_at < now,
+                    ScrapeTask.attempts >= max_attempts,
+                )
+                .values(
+                    status=ScrapeJobStatus.FAILED,
+                    error="Lease expired",
+                    lease_owner=None,
+                    updated_at=func.now(),
+                )
+            )
+            await db.execute(query)
+
+            candidate = (
+                select(ScrapeTask.id)
+                .where(
+                    or_(
+                        and_(
+                            ScrapeTask.status == ScrapeJobStatus.QUEUED,
+                            ScrapeTask.available_at <= now,
+                        ),
+                        and_(
+                            ScrapeTask.status == ScrapeJobStatus.RUNNING,
+                            ScrapeTask.lease_expires_at < now,
+                        ),
+                    )
+                )
+                .order_by(ScrapeTask.available_at, ScrapeTask.id)
+                .limit(1)
+                .scalar_subquery()
+            )
+            query = (
+                update(ScrapeTask)
+                .where(ScrapeTask.id == candidate)
+                .values(
+                    status=ScrapeJobStatus.RUNNING,
+                    lease_owner=worker_id,
+                    lease_expires_at=now + lease_seconds,
+                    attempts=ScrapeTask.attempts + 1,
+                    updated_at=func.now(),
+                )
+                .returning(*ScrapeTask.__table__.columns)
+            )
+            return await db.fetch_one(query)
+
+    @staticmethod
+    async def heartbeat(task_id: int, worker_id: str, lease_expires_at: float):
+        """Extend the lease of a task, returns False if the worker lost it"""
+        db = await get_db()
+        async with db.transaction():
+            query = (
+                update(ScrapeTask)
+                .where(
+                    ScrapeTask.id == task_id,
+                    ScrapeTask.lease_owner == worker_id,
+                    ScrapeTask.status == ScrapeJobStatus.RUNNING,
+                )
+                .values(lease_expires_at=lease_expires_at)
+                .returning(ScrapeTask.id)
+            )
+            return await db.fetch_val(query) is not None
+
+    @staticmethod
+    async def complete(task_id: int, worker_id: str, rows_committed: int):
+        """Mark a leased task as done, returns False if the worker lost the lease"""
+        db = await get_db()
+        async with db.transaction():
+            query = (
+                update(ScrapeTask)
+                .where(
+                    ScrapeTask.id == task_id,
+                    ScrapeTask.lease_owner == worker_id,
+                    ScrapeTask.status == ScrapeJobStatus.RUNNING,
+                )
+                .values(
+                    status=ScrapeJobStatus.DONE,
+                    rows_committed=rows_committed,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    error=None,
+                    updated_at=func.now(),
+                )
+                .returning(ScrapeTask.id)
+            )
+            return await db.fetch_val(query) is not None
+
+    @staticmethod
+    async def fail(task_id: int, worker_id: str, error: str, retry_at: float = None):
+        """Give a leased task back for a retry at retry_at, or fail it for good"""
+        db = await get_db()
+        async with db.transaction():
+            values = (
+                {"status": ScrapeJobStatus.FAILED}
+                if retry_at is None
+                else {"status": ScrapeJobStatus.QUEUED, "available_at": retry_at}
+            )
+            query = (
+                update(ScrapeTask)
+                .where(
+                    ScrapeTask.id == task_id,
+                    ScrapeTask.lease_owner == worker_id,
+                    ScrapeTask.status == ScrapeJobStatus.RUNNING,
+                )
+                .values(
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    error=error,
+                    updated_at=func.now(),
+                    **values,
+                )
+            )
+            await db.execute(query)
+
+    @staticmethod
+    async def count_by_status():
+        """Count tasks in each status"""
+        db = await get_db()
+        async with db.transaction():
+            query = select(ScrapeTask.status, func.count()).group_by(ScrapeTask.status)
+            return {row[0]: row[1] for row in await db.fetch_all(query)}
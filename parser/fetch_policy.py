@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from config.settings import KINORIUM_BASE_URL
+from database.repositories.host_throttle_repository import HostThrottleRepository
+from parser.metrics import metrics
+
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 2  # Seconds before the first retry, doubled with every attempt
+BACKOFF_CAP = 60  # Longest pause between two attempts at one URL
+THROTTLE_STATUSES = (429, 503)
+KINORIUM_HOST = urlparse(KINORIUM_BASE_URL).netloc
+
+LATENCY_WINDOW = 200  # Navigations the timeout is derived from
+LATENCY_MIN_SAMPLES = 10  # Below this the default timeout is used
+TIMEOUT_PERCENTILE = 0.99
+TIMEOUT_MULTIPLIER = 3  # Timeout is this many times the observed percentile
+DEFAULT_TIMEOUT = 60  # Seconds
+MIN_TIMEOUT = 15
+MAX_TIMEOUT = 120
+
+BREAKER_FAILURE_THRESHOLD = 5  # Failures in a row that open the breaker
+BREAKER_COOLDOWN = 30  # Seconds the breaker stays open the first time
+BREAKER_COOLDOWN_CAP = 600
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter, so retrying workers spread out"""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header, given in seconds or as a date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class LatencyTracker:
+    """Keeps recent navigation times and derives a timeout from them"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, fraction: float):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def timeout(self) -> float:
+        """Timeout for the next navigation in seconds"""
+        if len(self.samples) < LATENCY_MIN_SAMPLES:
+            return DEFAULT_TIMEOUT
+        timeout = self.percentile(TIMEOUT_PERCENTILE) * TIMEOUT_MULTIPLIER
+        return min(MAX_TIMEOUT, max(MIN_TIMEOUT, timeout))
+
+
+class CircuitBreaker:
+    """
+    Pauses every navigation to a host while it throttles or keeps failing
+
+    The pause is kept in the host_throttles table, so one throttled response
+    stops the other scrape tasks and worker processes from piling more
+    requests on the host. Failures in a row are counted per process.
+    """
+
+    def __init__(self, host: str, repository=None):
+        self.host = host
+        self.repository = repository or HostThrottleRepository()
+        self.open_until = 0.0  # Unix time, the latest pause of any process
+        self.failures = 0
+        self.cooldown = BREAKER_COOLDOWN
+
+    def is_open(self) -> bool:
+        return time.time() < self.open_until
+
+    async def refresh(self):
+        """Pick up a pause that another process has set"""
+        try:
+            throttle = await self.repository.get_throttle(self.host)
+        except Exception as e:
+            logging.error(f"Error reading the throttle of {self.host}: {e}")
+            return
+        if throttle is not None and throttle.open_until > self.open_until:
+            self.open_until = throttle.open_until
+            if self.is_open():
+                logging.warning(
+                    f"Circuit open for {self.open_until - time.time():.0f}s: "
+                    f"{throttle.reason}"
+                )
+
+    async def wait(self):
+        """Wait until the host may be called again"""
+        await self.refresh()
+        while self.is_open():
+            await asyncio.sleep(self.open_until - time.time())
+            await self.refresh()
+
+    async def open(self, seconds: float, reason: str):
+        until = time.time() + seconds
+        if until <= self.open_until:
+            return
+        self.open_until = until
+        logging.warning(f"Circuit open for {seconds:.0f}s: {reason}")
+        try:
+            await self.repository.open(self.host, until, reason)
+        except Exception as e:
+            logging.error(f"Error sharing the throttle of {self.host}: {e}")
+
+    def record_success(self):
+        self.failures = 0
+        self.cooldown = BREAKER_COOLDOWN
+
+    async def record_failure(self, reason: str):
+        self.failures += 1
+        if self.failures >= BREAKER_FAILURE_THRESHOLD:
+            await self.open(
+                self.cooldown, f"{self.failures} failures in a row, {reason}"
+            )
+            self.failures = 0
+            self.cooldown = min(BREAKER_COOLDOWN_CAP, self.cooldown * 2)
+
+    async def record_throttle(self, retry_after):
+        """The host asked us to slow down, honour Retry-After if it sent one"""
+        seconds = self.cooldown if retry_after is None else retry_after
+        await self.open(seconds, "host is throttling")
+        self.cooldown = min(BREAKER_COOLDOWN_CAP, self.cooldown * 2)
+
+
+class FetchPolicy:
+    """Retries, backoff, throttling and timeouts of scraper navigations"""
+
+    def __init__(self, max_attempts: int = MAX_ATTEMPTS, host: str = KINORIUM_HOST):
+        self.max_attempts = max_attempts
+        self.latency = LatencyTracker()
+        self.breaker = CircuitBreaker(host)
+
+    async def goto(self, page, url: str, wait_until: str = "networkidle"):
+        """
+        Navigate to a URL, retrying failures and throttled responses
+
+        Args:
+            page: Playwright page
+            url (str): URL to open
+            wait_until (str): Playwright load state to wait for
+
+        Returns:
+            Response: Successful response, or None after the last attempt failed
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            await self.breaker.wait()
+            timeout = self.latency.timeout()
+            delay = backoff_delay(attempt)
+            start = time.monotonic()
+            metrics.inc("navigations_total")
+            if attempt > 1:
+                metrics.inc("retries_total")
+            try:
+                logging.info(f"Loading {url} (attempt {attempt})...")
+                response = await page.goto(
+                    url, wait_until=wait_until, timeout=timeout * 1000
+                )
+                if response is not None and response.ok:
+                    self.latency.record(time.monotonic() - start)
+                    metrics.observe("navigation_seconds", time.monotonic() - start)
+                    self.breaker.record_success()
+                    logging.info(f"Successfully loaded {url}")
+                    return response
+
+                status = response.status if response is not None else None
+                if status in THROTTLE_STATUSES:
+                    retry_after = parse_retry_after(
+                        await response.header_value("retry-after")
+                    )
+                    await self.breaker.record_throttle(retry_after)
+                    metrics.inc("throttled_total")
+                    delay = 0  # The breaker already holds us back
+                elif status is not None and status >= 500:
+                    # Deleted lists answer 404, only server errors count for the host
+                    await self.breaker.record_failure(f"status {status}")
+                logging.warning(
+                    f"Unsuccessful load (attempt {attempt}, status {status}) for {url}"
+                )
+            except Exception as e:
+                if isinstance(e, PlaywrightTimeoutError):
+                    # A slow host has to raise the timeout, not only fail
+                    self.latency.record(time.monotonic() - start)
+                    await self.breaker.record_failure(type(e).__name__)
+                logging.error(
+                    f"Attempt {attempt} failed for {url} "
+                    f"after {time.monotonic() - start:.1f}s: {e}"
+                )
+            if attempt < self.max_attempts:
+                await asyncio.sleep(delay)
+        metrics.inc("failed_navigations_total")
+        logging.error(f"Failed to load {url} after {self.max_attempts} attempts")
+        return None
@@ -0,0 +1,71 @@
+"""
+Kinorium list pages with the markup the scraper reads.
+
+Recorded pages live in benchmarks/fixtures/kinorium, synthetic pages are
+rendered with the same selectors as the live site. The replay server serves
+them to the scraper and !profile scrape parses them without the network.
+"""
+import os
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "benchmarks",
+    "fixtures",
+    "kinorium",
+)
+ITEM_HEIGHT = 150  # Pixels per movie, close to the live layout, drives scroll time
+GENRES = ("драма", "комедія", "трилер", "фантастика", "мультфільм", "жахи")
+
+
+def fixture_path(kinorium_id: int, list_type: str, page: int) -> str:
+    return os.path.join(FIXTURES_DIR, str(kinorium_id), f"{list_type}_{page}.html")
+
+
+def render_movie(number: int, rated: bool) -> str:
+    """Markup of one list item, with the selectors parse_movie_data reads"""
+    year = 1950 + number % 75
+    genres = ", ".join(GENRES[(number + i) % len(GENRES)] for i in range(2))
+    runtime = f"{1 + number % 2} година {number % 60} хв"
+    status = "status_done" if rated else "status_future"
+    rating_widget = (
+        '<div class="statusWidgetData statusWidget done">'
+        f'<span class="number-{1 + number % 10}"></span></div>'
+        if rated
+        else ""
+    )
+    return f"""
+<div class="item user-status-list {status}">
+  <div class="poster"><img src="/poster/{number}.gif"></div>
+  <a class="filmList__item-title-link" href="/{1000000 + number}/">
+    <span class="movie-title__text">Фільм {number}</span>
+  </a>
+  <span class="item__name-orig">Movie {number}, {year}</span>
+  <div class="filmList__extra-info">{genres}, {runtime}</div>
+  <div class="filmList__extra-info-director"><a>Режисер {number % 500}</a></div>
+  <div class="rating_kinorium">
+    <span class="rating__value">{5 + number % 50 / 10:.1f}</span>
+  </div>
+  <div class="rating_imdb"><span class="value">{4 + number % 60 / 10:.1f}</span></div>
+  {rating_widget}
+</div>"""
+
+
+def render_page(total_movies: int, page: int, per_page: int, rated: bool) -> str:
+    """Synthetic list page with pagination and total count like the live site"""
+    total_pages = max(1, -(-total_movies // per_page))
+    first = (page - 1) * per_page
+    numbers = range(first, min(first + per_page, total_movies))
+    # Rated and watchlist movies of one account never overlap
+    offset = 1_000_000 if rated else 0
+    items = "".join(render_movie(offset + number, rated) for number in numbers)
+    pages = "".join(
+        f'<li><a href="?page={number}">{number}</a></li>'
+        for number in sorted({1, page, total_pages})
+    )
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8">
+<style>.item {{ height: {ITEM_HEIGHT}px; }}</style></head>
+<body>
+<div class="filmList">{items}</div>
+<div id="pagesSelect"><span>Фільмів: {total_movies}</span><ul>{pages}</ul></div>
+</body></html>"""
@@ -0,0 +1,105 @@
+import contextvars
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from config.settings import SCRAPER_METRICS_PATH
+from services.metrics import QUANTILES, Summary, write_atomically
+
+UNLABELLED = "all"
+
+# List the current scrape task works on, so deep calls can label their metrics
+current_list = contextvars.ContextVar("current_list", default=UNLABELLED)
+
+
+class ScrapeMetrics:
+    """Counters and timings of the scraper, labelled by list type"""
+
+    def __init__(self):
+        self.counters = defaultdict(lambda: defaultdict(float))
+        self.summaries = defaultdict(lambda: defaultdict(Summary))
+        self.started_at = time.time()
+
+    @contextmanager
+    def list_type(self, name: str):
+        """Label metrics recorded inside the block with a list type"""
+        token = current_list.set(name)
+        try:
+            yield
+        finally:
+            current_list.reset(token)
+
+    def inc(self, name: str, value: float = 1):
+        self.counters[name][current_list.get()] += value
+
+    def observe(self, name: str, value: float):
+        self.summaries[name][current_list.get()].observe(value)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Observe how long the block took, in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def reset(self):
+        self.counters.clear()
+        self.summaries.clear()
+        self.started_at = time.time()
+
+    def to_json(self) -> str:
+        data = {
+            "started_at": self.started_at,
+            "exported_at": time.time(),
+            "counters": {
+                name: dict(series) for name, series in sorted(self.counters.items())
+            },
+            "summaries": {
+                name: {label: summary.as_dict() for label, summary in series.items()}
+                for name, series in sorted(self.summaries.items())
+            },
+        }
+        return json.dumps(data, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Metrics in the Prometheus text format, e.g. for the textfile collector"""
+        lines = []
+        for name, series in sorted(self.counters.items()):
+            lines.append(f"# TYPE scraper_{name} counter")
+            for label, value in sorted(series.items()):
+                lines.append(f'scraper_{name}{{list_type="{label}"}} {value:g}')
+        for name, series in sorted(self.summaries.items()):
+            lines.append(f"# TYPE scraper_{name} summary")
+            for label, summary in sorted(series.items()):
+                for fraction in QUANTILES:
+                    lines.append(
+                        f'scraper_{name}{{list_type="{label}",quantile="{fraction}"}} '
+                        f"{summary.quantile(fraction):g}"
+                    )
+                lines.append(
+                    f'scraper_{name}_sum{{list_type="{label}"}} {summary.sum:g}'
+                )
+                lines.append(
+                    f'scraper_{name}_count{{list_type="{label}"}} {summary.count}'
+                )
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str = SCRAPER_METRICS_PATH):
+        """
+        Write the metrics to a file, Prometheus text for *.prom, JSON otherwise
+
+        Args:
+            path (str): Target file, nothing is written if empty
+        """
+        if not path:
+            return
+        content = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        write_atomically(path, content)
+        logging.info(f"Scraper metrics written to {path}")
+
+
+metrics = ScrapeMetrics()
@@ -0,0 +1,158 @@
+"""
+Checkpointed scrape jobs over the lists of one user.
+
+Each page is checkpointed in the job once its movies are saved, so a job that
+was cut off by a restart or failed continues with the pages it has left. The
+bot runs these jobs for !register and resumes interrupted ones at startup.
+"""
+import asyncio
+import logging
+
+from database.models import UserMovieStatus
+from parser.metrics import metrics
+from config.settings import SCRAPE_JOB_PAGE_CONCURRENCY
+from parser.scraper import (
+    count_pages,
+    fetch_movies_from_page,
+    get_total_movies,
+    list_label,
+    save_movies_to_db,
+)
+from services.refresh_service import RefreshService
+from services.scrape_job_service import ScrapeJobService
+from services.user_service import UserService
+
+PAGE_RETRIES = 3  # Attempts per page before the job gives up on it
+PAGE_RETRY_DELAY = 5  # Seconds between attempts at a page
+
+scrape_job_service = ScrapeJobService()
+user_service = UserService()
+refresh_service = RefreshService()
+
+
+async def scrape_page(
+    page_number: int,
+    kinorium_id: int,
+    user_id: int,
+    job_id: int,
+    list_type: UserMovieStatus,
+    progress=None,
+) -> bool:
+    """Scrapes, saves and checkpoints a page. Retries only this page on failure."""
+    is_rated = list_type == UserMovieStatus.WATCHED
+    for attempt in range(1, PAGE_RETRIES + 1):
+        try:
+            with metrics.list_type(list_label(is_rated)):
+                movies_data = await fetch_movies_from_page(
+                    page_number, kinorium_id, is_rated=is_rated
+                )
+                if movies_data is None:
+                    raise RuntimeError("page could not be loaded")
+                rows = await save_movies_to_db(movies_data, user_id)
+            # Saving is idempotent, a crash before the checkpoint only repeats the page
+            await scrape_job_service.page_done(
+                job_id, list_type, page_number, len(movies_data), rows
+            )
+            if progress is not None:
+                progress.advance(len(movies_data))
+            return True
+        except Exception as e:
+            logging.error(
+                f"Attempt {attempt} at page {page_number} ({list_type.value}) "
+                f"of job {job_id} failed: {e}"
+            )
+            await scrape_job_service.page_failed(
+                job_id, list_type, page_number, str(e)
+            )
+        if attempt < PAGE_RETRIES:
+            await asyncio.sleep(PAGE_RETRY_DELAY)
+    return False
+
+
+async def plan_job(kinorium_id: int, job_id: int, movie_totals: dict):
+    """
+    Records the pages and movies of the lists in the job
+
+    Args:
+        kinorium_id (int): Kinorium ID of the user
+        job_id (int): ID of the job
+        movie_totals (dict): List type -> movies in it, None where not counted yet
+    """
+    pages = []
+    movies_total = 0
+    for list_type, total_movies in movie_totals.items():
+        if total_movies is None:
+            is_rated = list_type == UserMovieStatus.WATCHED
+            total_movies = await get_total_movies(kinorium_id, is_rated=is_rated)
+        movies_total += total_movies
+        pages += [
+            (list_type, page) for page in range(1, count_pages(total_movies) + 1)
+        ]
+    await scrape_job_service.plan_pages(job_id, pages)
+    await scrape_job_service.set_totals(job_id, len(pages), movies_total)
+
+
+async def prepare_job(kinorium_id: int, job_id: int, movie_totals: dict = None):
+    """Get the job, planning its pages first if it has none yet."""
+    job = await scrape_job_service.get_job(job_id)
+    if job.pages_total == 0:
+        await plan_job(
+            kinorium_id, job_id, movie_totals or dict.fromkeys(UserMovieStatus)
+        )
+        job = await scrape_job_service.get_job(job_id)
+    return job
+
+
+async def run_job(
+    kinorium_id: int,
+    job_id: int,
+    progress=None,
+    movie_totals: dict = None,
+):
+    """
+    Scrapes all pages not yet checkpointed in the job
+
+    Args:
+        kinorium_id (int): Kinorium ID of the user
+        job_id (int): ID of the job
+        progress (ProgressReporter): Told about every finished page, optional
+        movie_totals (dict): List type -> movies in it, the lists to plan if
+            the job has no pages yet. Both lists, counted here, if not given.
+
+    Raises:
+        RuntimeError: If some pages failed every attempt
+    """
+    try:
+        job = await prepare_job(kinorium_id, job_id, movie_totals)
+        pending_pages = await scrape_job_service.get_pending_pages(job_id)
+        if job.pages_done:
+            logging.info(
+                f"Job {job_id} resumes after {job.pages_done} "
+                f"of {job.pages_total} pages"
+            )
+
+        user_id = await user_service.get_user_by_kinorium_id(kinorium_id)
+        # Every page starts its own browser, so only a few run at once
+        slots = asyncio.Semaphore(SCRAPE_JOB_PAGE_CONCURRENCY)
+
+        async def scrape_in_slot(page) -> bool:
+            async with slots:
+                return await scrape_page(
+                    page.page, kinorium_id, user_id, job_id, page.list_type, progress
+                )
+
+        results = await asyncio.gather(
+            *(scrape_in_slot(page) for page in pending_pages)
+        )
+
+        failed_pages = results.count(False)
+        if failed_pages:
+            raise RuntimeError(
+                f"{failed_pages} pages failed, run !register again to retry them"
+            )
+
+        # The lists are fresh, the scheduler takes over from here
+        for list_type in movie_totals or UserMovieStatus:
+            await refresh_service.record_refresh(user_id, list_type, changed=True)
+    finally:
+        metrics.export()
@@ -1,12 +1,21 @@
 import asyncio
 import logging
 import re
+import time
 from playwright.async_api import async_playwright
-from database.models import Movie, UserMovie, User, InsertedMovies, UserMovieStatus
-from database.db import get_db
+from database.models import (
+    Movie,
+    UserMovie,
+    InsertedMovies,
+    UserMovieStatus,
+)
+from database.db import get_db, init_db
 from sqlalchemy import select, and_, or_
 from sqlalchemy.dialects.sqlite import insert
 from asyncio import Semaphore
+from config.settings import KINORIUM_BASE_URL
+from parser.fetch_policy import FetchPolicy
+from parser.metrics import metrics
 
 # Logging configuration
 
@@ -16,51 +25,80 @@ logging.basicConfig(
 logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
 
 semaphore = Semaphore(1)
+fetch_policy = FetchPolicy()  # Shared, so throttling pauses every scrape task
 
 PER_PAGE = 100
 PAGE_NUMBER_ONE = 1
 
-FIRST_PAGE_WATCHLIST = "https://ua.kinorium.com/user/{kinorium_id}/watchlist/?order=date&page=1&perpage={PER_PAGE}&mode=movie&nav_type=movie%2Canimation&company_type=production"
-WATCHLIST_URL = "https://ua.kinorium.com/user/{kinorium_id}/watchlist/?order=date&&perpage={PER_PAGE}&mode=movie&nav_type=movie%2Canimation&company_type=production"
+FIRST_PAGE_WATCHLIST = KINORIUM_BASE_URL + "/user/{kinorium_id}/watchlist/?order=date&page=1&perpage={PER_PAGE}&mode=movie&nav_type=movie%2Canimation&company_type=production"
+WATCHLIST_URL = KINORIUM_BASE_URL + "/user/{kinorium_id}/watchlist/?order=date&&perpage={PER_PAGE}&mode=movie&nav_type=movie%2Canimation&company_type=production"
 
-FIRST_PAGE_RATEDLIST = "https://ua.kinorium.com/user/{kinorium_id}/ratings/?mode=movie&nav_type=movie%2Canimation&company_type=production&perpage={PER_PAGE}&order=date&page=1"
-RATEDLIST_URL = "https://ua.kinorium.com/user/{kinorium_id}/ratings/?mode=movie&nav_type=movie%2Canimation&company_type=production&perpage={PER_PAGE}&order=date"
+FIRST_PAGE_RATEDLIST = KINORIUM_BASE_URL + "/user/{kinorium_id}/ratings/?mode=movie&nav_type=movie%2Canimation&company_type=production&perpage={PER_PAGE}&order=date&page=1"
+RATEDLIST_URL = KINORIUM_BASE_URL + "/user/{kinorium_id}/ratings/?mode=movie&nav_type=movie%2Canimation&company_type=production&perpage={PER_PAGE}&order=date"
 
 
-async def safe_goto(page, url, wait_until="networkidle", timeout=60000, retries=3, delay=5):
-    for attempt in range(1, retries + 1):
-        try:
-            logging.info(f"Loading {url} (attempt {attempt})...")
-            response = await page.goto(url, wait_until=wait_until, timeout=timeout)
-            if response is None or not response.ok:
-                logging.warning(f"Unsuccessful load (attempt {attempt}) for {url}")
-            else:
-                logging.info(f"Successfully loaded {url}")
-                return response
-        except Exception as e:
-            logging.error(f"Attempt {attempt} failed for {url}: {e}")
-        if attempt < retries:
-            await asyncio.sleep(delay)
-    logging.error(f"Failed to load {url} after {retries} attempts")
-    return None
+async def safe_goto(page, url, wait_until="networkidle"):
+    """Navigate with retries and throttling, returns None if every attempt failed"""
+    return await fetch_policy.goto(page, url, wait_until=wait_until)
+
+
+async def goto_or_raise(page, url, wait_until="networkidle"):
+    response = await safe_goto(page, url, wait_until=wait_until)
+    if response is None:
+        raise RuntimeError(f"Failed to load {url}")
+    return response
+
+
+def count_pages(total_movies: int) -> int:
+    """Pages of a list with this many movies, an empty list still has one"""
+    return max(1, -(-total_movies // PER_PAGE))
+
+
+def list_label(is_rated: bool) -> str:
+    """Metrics label of a list"""
+    return "rated" if is_rated else "watchlist"
+
+
+async def launch_browser(p):
+    metrics.inc("browser_launches_total")
+    return await p.chromium.launch(headless=True)
+
+
+async def record_transfer(page):
+    """Count bytes the page and its resources took over the network"""
+    try:
+        transferred = await page.evaluate(
+            """
+            () => performance.getEntriesByType("navigation")
+                .concat(performance.getEntriesByType("resource"))
+                .reduce((total, entry) => total + (entry.transferSize || 0), 0)
+            """
+        )
+        metrics.inc("bytes_total", transferred)
+    except Exception as e:
+        logging.warning(f"Could not measure transferred bytes: {e}")
 
 
 async def get_total_pages(kinorium_id, is_rated: bool = False):
     """Get the number of pages from the first page for a specific user"""
     url = FIRST_PAGE_RATEDLIST if is_rated else FIRST_PAGE_WATCHLIST
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.goto(url.format(kinorium_id=kinorium_id, PER_PAGE=PER_PAGE))
+    with metrics.list_type(list_label(is_rated)):
+        async with async_playwright() as p:
+            browser = await launch_browser(p)
+            page = await browser.new_page()
+            await goto_or_raise(
+                page, url.format(kinorium_id=kinorium_id, PER_PAGE=PER_PAGE), "load"
+            )
+            await record_transfer(page)
 
-        last_page_elem = await page.query_selector(
-            "#pagesSelect > ul > li:last-child > a"
-        )
-        total_pages = await last_page_elem.inner_text() if last_page_elem else 1
-        result = int(total_pages)
+            last_page_elem = await page.query_selector(
+                "#pagesSelect > ul > li:last-child > a"
+            )
+            total_pages = await last_page_elem.inner_text() if last_page_elem else 1
+            result = int(total_pages)
 
-        await browser.close()
-        return result
+            await browser.close()
+            return result
 
 
 async def get_total_movies(kinorium_id, is_rated: bool = False):
@@ -78,19 +116,23 @@ async def get_total_movies(kinorium_id, is_rated: bool = False):
                 return int(part)
         return None
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.goto(url.format(kinorium_id=kinorium_id, PER_PAGE=PER_PAGE))
-        total_movies_elem = await page.query_selector("#pagesSelect > span")
-        total_movies = get_last_number(await total_movies_elem.inner_text())
-        await browser.close()
-        return total_movies
+    with metrics.list_type(list_label(is_rated)):
+        async with async_playwright() as p:
+            browser = await launch_browser(p)
+            page = await browser.new_page()
+            await goto_or_raise(
+                page, url.format(kinorium_id=kinorium_id, PER_PAGE=PER_PAGE), "load"
+            )
+            await record_transfer(page)
+            total_movies_elem = await page.query_selector("#pagesSelect > span")
+            total_movies = get_last_number(await total_movies_elem.inner_text())
+            await browser.close()
+            return total_movies
 
 
 async def load_page(page, url):
     """Load a page and perform smooth scrolling"""
-    await safe_goto(page, url, wait_until="networkidle")
+    await goto_or_raise(page, url, wait_until="networkidle")
     await page.evaluate(
         """
         () => {
@@ -250,7 +292,14 @@ async def parse_rated_movie_data(page):
 
 
 async def save_movies_to_db(movies_data, user_id, batch_size=250):
-    """Save movies to the database in batches"""
+    """
+    Save movies to the database in batches
+
+    Saving is idempotent, so a page can be saved again after a crash.
+    Returns the number of user movie rows written, errors are raised.
+    """
+    rows_committed = 0
+    start = time.perf_counter()
     async with semaphore:
         try:
             db = await get_db()
@@ -264,6 +313,9 @@ async def save_movies_to_db(movies_data, user_id, batch_size=250):
                 )
 
                 async with db.transaction():
+                    # Writing first takes the write lock before anything is read,
+                    # so concurrent writers wait for it instead of failing
+                    await db.execute("DELETE FROM temp_inserted_movies;")
                     existing_movies = await get_existing_movies(db, batch)
                     new_movies = filter_new_movies(batch, existing_movies)
                     new_movies_ids = (
@@ -285,11 +337,16 @@ async def save_movies_to_db(movies_data, user_id, batch_size=250):
                             f"Established {len(user_movie_values)} links in batch {i//batch_size + 1}"
                         )
                         await save_user_movie_links(db, user_movie_values)
+                        rows_committed += len(user_movie_values)
 
         except Exception as e:
             logging.error(f"Error saving movies to database: {e}")
+            raise
 
+    metrics.observe("db_save_seconds", time.perf_counter() - start)
+    metrics.observe("rows_per_save", rows_committed)
     logging.info(f"Processed all {len(movies_data)} movies for user {user_id}")
+    return rows_committed
 
 
 async def get_existing_movies(db, movies_data):
@@ -428,95 +485,37 @@ async def fetch_movies_from_page(
     url += f"&page={page_num}"
 
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            await load_page(page, url)
-
-            # We use the appropriate Parsing function
-
-            movies_data = await (
-                parse_rated_movie_data(page)
-                if is_rated
-                else parse_watch_list_movie_data(page)
-            )
+        with metrics.list_type(list_label(is_rated)):
+            async with async_playwright() as p:
+                browser = await launch_browser(p)
+                page = await browser.new_page()
+                await load_page(page, url)
+                await record_transfer(page)
+
+                # We use the appropriate Parsing function
+
+                with metrics.timer("extraction_seconds"):
+                    movies_data = await (
+                        parse_rated_movie_data(page)
+                        if is_rated
+                        else parse_watch_list_movie_data(page)
+                    )
+                metrics.inc("pages_total")
+                metrics.observe("movies_per_page", len(movies_data))
 
-            await browser.close()
-            logging.info(
-                f"Completed processing page {page_num} for {'rated' if is_rated else 'watchlist'} movies"
-            )
-            return movies_data
+                await browser.close()
+                logging.info(
+                    f"Completed processing page {page_num} for {'rated' if is_rated else 'watchlist'} movies"
+                )
+                return movies_data
     except Exception as e:
         logging.error(f"Error processing page {page_num}: {e}")
 
 
-async def scrape_user_movies(*user_data):
-    """Scrape movies for a specific user"""
-    user_id, kinorium_id = user_data
-
-    # We run a few asynchronous tasks in parallel
-
-    get_total_movies_rated_task = get_total_movies(kinorium_id, is_rated=True)
-    get_total_movies_watchlist_task = get_total_movies(kinorium_id)
-    total_watchlist_movies_on_db_task = UserMovie.get_movie_count_by_status(
-        user_id, UserMovieStatus.WATCH_LATER
-    )
-    total_rated_movies_on_db_task = UserMovie.get_movie_count_by_status(
-        user_id, UserMovieStatus.WATCHED
-    )
-
-    # Looking forward to all tasks
-
-    total_rated_movies_on_site, total_watchlist_movies_on_site = await asyncio.gather(
-        get_total_movies_rated_task, get_total_movies_watchlist_task
-    )
-    total_watchlist_movies_on_db, total_rated_movies_on_db = await asyncio.gather(
-        total_watchlist_movies_on_db_task, total_rated_movies_on_db_task
-    )
-
-    if (
-        total_rated_movies_on_site != total_rated_movies_on_db
-        or total_watchlist_movies_on_site != total_watchlist_movies_on_db
-    ):
-        # Start parallel to the task to get movies
-
-        movies_rated_task = fetch_movies_from_page(
-            PAGE_NUMBER_ONE, kinorium_id, is_rated=True
-        )
-        movies_watchlist_task = fetch_movies_from_page(PAGE_NUMBER_ONE, kinorium_id)
-
-        # Looking forward to completing both requests
-
-        movies_rated, movies_watchlist = await asyncio.gather(
-            movies_rated_task, movies_watchlist_task
-        )
-
-        # We combine movies and keep them in a database
-
-        movies_all = movies_rated + movies_watchlist
-        await save_movies_to_db(movies_all, user_id)
-    else:
-        logging.info(f"User {user_id} does not need to update lists")
-
-    print(
-        total_rated_movies_on_site,
-        total_rated_movies_on_db,
-        total_watchlist_movies_on_site,
-        total_watchlist_movies_on_db,
-    )
-
-
-async def scrape_all_users():
-    """Scrape movies for all users"""
-    users = [(user.id, user.kinorium_id) for user in await User.get_all_users()]
-
-    tasks = [scrape_user_movies(*user) for user in users]
-    await asyncio.gather(*tasks)
-
-    logging.info(
-        "Completed scraping and saving movies to database for all users"
-    )
-
-
 if __name__ == "__main__":
-    asyncio.run(scrape_all_users())
+    # Old entry point of the nightly run, it drains the leased queue like
+    # python -m parser.worker --enqueue-all --exit-when-empty
+    from parser.worker import run_worker
+
+    init_db()
+    asyncio.run(run_worker(concurrency=1, enqueue_all=True, exit_when_empty=True))
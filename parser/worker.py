@@ -0,0 +1,169 @@
+"""
+Scrape worker for the shared queue in the scrape_tasks table.
+
+Any number of copies can run at once, on one machine or several that share
+the database. Each claimed task is leased, a crashed worker's tasks are
+picked up by the others once the lease runs out.
+
+    python -m parser.worker --enqueue-all --exit-when-empty   # nightly run
+    python -m parser.worker --concurrency 2                   # long-running worker
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import time
+
+from database.db import init_db, connect_db, disconnect_db
+from database.models import UserMovieStatus
+from database.repositories.scrape_job_repository import ACTIVE_STATUSES
+from database.repositories.user_repository import UserRepository
+from parser.metrics import metrics
+from parser.scraper import (
+    fetch_movies_from_page,
+    fetch_policy,
+    list_label,
+    get_total_movies,
+    get_total_pages,
+    save_movies_to_db,
+)
+from services.refresh_service import RefreshService
+from services.scrape_queue_service import (
+    DISCOVER_PAGE,
+    LEASE_SECONDS,
+    ScrapeQueueService,
+)
+
+POLL_INTERVAL = 5  # Seconds to wait when the queue is empty
+
+queue_service = ScrapeQueueService()
+refresh_service = RefreshService()
+
+
+def make_worker_id(slot: int) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{slot}"
+
+
+async def discover_pages(task) -> int:
+    """Queue the pages of a list if it changed since the last scrape"""
+    is_rated = task.list_type == UserMovieStatus.WATCHED
+    total_on_site = await get_total_movies(task.kinorium_id, is_rated=is_rated)
+    total_on_db = await UserRepository.get_movie_count_by_status(
+        task.user_id, task.list_type
+    )
+    changed = total_on_site != total_on_db
+    await refresh_service.record_refresh(task.user_id, task.list_type, changed)
+    if not changed:
+        logging.info(
+            f"User {task.user_id} does not need to update {task.list_type.value}"
+        )
+        return 0
+
+    total_pages = await get_total_pages(task.kinorium_id, is_rated=is_rated)
+    await queue_service.enqueue_pages(task, total_pages)
+    logging.info(
+        f"Queued {total_pages} {task.list_type.value} pages of user {task.user_id}"
+    )
+    return 0
+
+
+async def scrape_page(task) -> int:
+    """Scrape one page of a list and save its movies"""
+    is_rated = task.list_type == UserMovieStatus.WATCHED
+    with metrics.list_type(list_label(is_rated)):
+        movies_data = await fetch_movies_from_page(
+            task.page, task.kinorium_id, is_rated=is_rated
+        )
+        if movies_data is None:
+            raise RuntimeError("page could not be loaded")
+        return await save_movies_to_db(movies_data, task.user_id)
+
+
+async def keep_lease(task, worker_id: str):
+    """Renew the lease until cancelled"""
+    while True:
+        await asyncio.sleep(LEASE_SECONDS / 3)
+        if not await queue_service.heartbeat(task.id, worker_id):
+            logging.warning(f"Worker {worker_id} lost the lease on task {task.id}")
+            return
+
+
+async def run_task(task, worker_id: str):
+    heartbeat = asyncio.create_task(keep_lease(task, worker_id))
+    try:
+        if task.page == DISCOVER_PAGE:
+            rows = await discover_pages(task)
+        else:
+            rows = await scrape_page(task)
+        if not await queue_service.complete(task.id, worker_id, rows):
+            logging.warning(f"Task {task.id} finished after its lease was lost")
+    except Exception as e:
+        logging.error(f"Task {task.id} failed (attempt {task.attempts}): {e}")
+        metrics.inc("task_failures_total")
+        await queue_service.fail(task, worker_id, str(e))
+    finally:
+        heartbeat.cancel()
+
+
+async def has_pending_tasks() -> bool:
+    """Whether tasks are waiting for a retry or still running somewhere"""
+    counts = await queue_service.get_counts()
+    return any(counts.get(status) for status in ACTIVE_STATUSES)
+
+
+async def work(slot: int, exit_when_empty: bool, deadline: float = None) -> int:
+    """
+    Claim and run tasks one by one, returns how many were run
+
+    With a deadline (time.monotonic() value) no new task is claimed after it,
+    unfinished tasks stay in the queue for the next run.
+    """
+    worker_id = make_worker_id(slot)
+    processed = 0
+    while deadline is None or time.monotonic() < deadline:
+        # A host paused by any worker is not called, so leave its tasks unclaimed
+        await fetch_policy.breaker.wait()
+        task = await queue_service.claim(worker_id)
+        if task is None:
+            if exit_when_empty and not await has_pending_tasks():
+                return processed
+            await asyncio.sleep(POLL_INTERVAL)
+            continue
+        await run_task(task, worker_id)
+        processed += 1
+    return processed
+
+
+async def run_worker(concurrency: int, enqueue_all: bool, exit_when_empty: bool):
+    await connect_db()
+    try:
+        if enqueue_all:
+            await queue_service.enqueue_all_users()
+        processed = await asyncio.gather(
+            *(work(slot, exit_when_empty) for slot in range(concurrency))
+        )
+        logging.info(f"Worker finished after {sum(processed)} tasks")
+        logging.info(f"Queue: {await queue_service.get_counts()}")
+    finally:
+        metrics.export()
+        await disconnect_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=1, help="tasks at once")
+    parser.add_argument(
+        "--enqueue-all", action="store_true", help="queue every user before working"
+    )
+    parser.add_argument(
+        "--exit-when-empty", action="store_true", help="stop once the queue is empty"
+    )
+    args = parser.parse_args()
+
+    init_db()
+    asyncio.run(run_worker(args.concurrency, args.enqueue_all, args.exit_when_empty))
+
+
+if __name__ == "__main__":
+    main()
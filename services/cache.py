@@ -0,0 +1,153 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+# Every cache registers itself here so their counters can be reported together
+caches = {}
+
+
+class AsyncTTLCache:
+    """
+    Async cache with TTL expiry and LRU eviction.
+
+    Concurrent misses for the same key share a single load, so a burst of
+    requests after an expiry hits the database once. Loads that return None
+    expire after negative_ttl, if given, instead of ttl.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int = 1024,
+        ttl: float = 60.0,
+        negative_ttl: float = None,
+    ):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0  # Misses that waited for a load already in flight
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._loads = {}  # key -> asyncio.Task
+        self._generation = 0  # Bumped on invalidation to drop in-flight loads
+        caches[name] = self
+
+    def get(self, key, default=None):
+        """
+        Get a cached value without loading it
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return default
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key, value):
+        """
+        Store a value, evicting the least recently used one when full
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        ttl = self.negative_ttl if value is None else self.ttl
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(self, key, loader):
+        """
+        Get a cached value or load it with the given coroutine function
+
+        Args:
+            key: Cache key
+            loader: Coroutine function without arguments that returns the value
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        task = self._loads.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader, self._generation))
+            self._loads[key] = task
+            task.add_done_callback(lambda done: self._forget_load(key, done))
+        else:
+            self.coalesced += 1
+        # A cancelled caller must not cancel the load other callers are waiting on
+        return await asyncio.shield(task)
+
+    async def _load(self, key, loader, generation: int):
+        value = await loader()
+        if generation == self._generation:
+            self.set(key, value)
+        return value
+
+    def _forget_load(self, key, task):
+        # An invalidation may have started a newer load for the key meanwhile
+        if self._loads.get(key) is task:
+            del self._loads[key]
+
+    def invalidate(self, key=_MISSING):
+        """
+        Drop one key, or the whole cache when no key is given
+
+        Loads in flight finish for the callers already waiting on them, but
+        their values are not cached and later misses start a new load.
+
+        Args:
+            key: Cache key to drop
+        """
+        self._generation += 1
+        if key is _MISSING:
+            self._entries.clear()
+            self._loads.clear()
+        else:
+            self._entries.pop(key, None)
+            self._loads.pop(key, None)
+
+    def stats(self) -> dict:
+        """
+        Get cache counters
+
+        Returns:
+            dict: Hits, misses, coalesced misses, evictions, size and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+def cache_stats() -> dict:
+    """
+    Get counters of all caches
+
+    Returns:
+        dict: Cache name -> counters
+    """
+    return {name: cache.stats() for name, cache in caches.items()}
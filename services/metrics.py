@@ -0,0 +1,44 @@
+import os
+from collections import deque
+
+SAMPLE_WINDOW = 1000  # Latest observations kept per series for quantiles
+QUANTILES = (0.5, 0.95)
+
+
+def write_atomically(path: str, content: str):
+    """Write and rename, so a collector never reads a half-written file"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(temporary_path, path)
+
+
+class Summary:
+    """Count, sum, max and quantiles of recent observations"""
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self.samples.append(value)
+
+    def quantile(self, fraction: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def as_dict(self) -> dict:
+        data = {"count": self.count, "sum": round(self.sum, 4), "max": self.max}
+        for fraction in QUANTILES:
+            data[f"p{int(fraction * 100)}"] = round(self.quantile(fraction), 4)
+        return data
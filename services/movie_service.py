@@ -1,18 +1,26 @@
 from typing import Optional
 import logging
+from config.settings import SEARCH_SITES_CACHE_TTL_SECONDS
 from database.repositories.movie_repository import MovieRepository
+from services.cache import AsyncTTLCache
+from services.tracing import traced_methods
 
 
+@traced_methods
 class MovieService:
     """Service class for managing movie operations"""
     _instance: Optional["MovieService"] = None
     repository: MovieRepository
+    search_sites_cache: AsyncTTLCache
 
     def __new__(cls):
         """Singleton pattern implementation for MovieService"""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.repository = MovieRepository()
+            cls._instance.search_sites_cache = AsyncTTLCache(
+                "search_sites", max_size=1, ttl=SEARCH_SITES_CACHE_TTL_SECONDS
+            )
         return cls._instance
 
     async def search_movies(self, search_query: str):
@@ -76,6 +84,7 @@ class MovieService:
         """
         try:
             await self.repository.add_search_site(name, query_template)
+            self.search_sites_cache.invalidate()
             logging.info(f"Search site {name} added successfully")
         except Exception as e:
             logging.error(f"Error adding search site {name}: {e}")
@@ -89,7 +98,9 @@ class MovieService:
             list: List of all search sites
         """
         try:
-            sites = await self.repository.get_all_search_sites()
+            sites = await self.search_sites_cache.get_or_load(
+                "all", self.repository.get_all_search_sites
+            )
             logging.info(f"Retrieved {len(sites)} search sites")
             return sites
         except Exception as e:
@@ -1,32 +1,85 @@
-from typing import Optional
+import asyncio
+from contextlib import asynccontextmanager
+from typing import NamedTuple, Optional
 import logging
-from database.repositories.movie_wheel_repository import WheelRepository
+from config.settings import (
+    WHEEL_CACHE_MAX_SIZE,
+    WHEEL_CACHE_REVALIDATE_SECONDS,
+    WHEEL_CACHE_TTL_SECONDS,
+)
+from database.repositories.movie_wheel_repository import (
+    GLOBAL_WHEEL_NAME,
+    WheelRepository,
+)
+from services.cache import AsyncTTLCache
+from services.wheel_cache import WheelState
+from services.tracing import traced_methods
 
 
+class WheelScope(NamedTuple):
+    """Guild and optionally channel a wheel belongs to, empty for the global wheel"""
+    guild_id: Optional[int] = None
+    channel_id: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        """Unique wheel name for the scope"""
+        if self.guild_id is None:
+            return GLOBAL_WHEEL_NAME
+        if self.channel_id is None:
+            return f"Guild {self.guild_id}"
+        return f"Guild {self.guild_id} / Channel {self.channel_id}"
+
+
+GLOBAL_SCOPE = WheelScope()
+
+
+@traced_methods
 class MovieWheelService:
     """Service class for managing movie wheel operations"""
     _instance: Optional["MovieWheelService"] = None
     repository: WheelRepository
+    states: AsyncTTLCache
+    state_locks: dict
 
     def __new__(cls) -> "MovieWheelService":
         """Singleton pattern implementation for MovieWheelService"""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.repository = WheelRepository()
+            # Scope -> WheelState, idle guilds and channels are dropped
+            cls._instance.states = AsyncTTLCache(
+                "wheels", max_size=WHEEL_CACHE_MAX_SIZE, ttl=WHEEL_CACHE_TTL_SECONDS
+            )
+            # Scope -> (asyncio.Lock, callers holding or waiting for it)
+            cls._instance.state_locks = {}
         return cls._instance
 
-    async def get_or_create_global_wheel(self):
+    async def get_or_create_wheel(self, scope: WheelScope = GLOBAL_SCOPE):
         """
-        Retrieve the global wheel or create a new one if it doesn't exist
-        
+        Retrieve the wheel of the scope or create a new one if it doesn't exist
+
+        Args:
+            scope (WheelScope): Guild and channel of the wheel
+
         Returns:
-            int: The ID of the global wheel
+            int: The ID of the wheel
         """
+        state = self.states.get(scope)
+        if state is not None:
+            return state.wheel_id
+
         try:
-            wheel_id = await self.repository.get_global_wheel()
+            wheel_id = await self.repository.get_wheel(scope.name)
             if wheel_id is None:
-                wheel_id = await self.repository.create_global_wheel()
-                logging.info("A new global wheel was created")
+                wheel_id = await self.repository.create_wheel(
+                    scope.name,
+                    guild_id=None if scope.guild_id is None else str(scope.guild_id),
+                    channel_id=(
+                        None if scope.channel_id is None else str(scope.channel_id)
+                    ),
+                )
+                logging.info(f"A new wheel '{scope.name}' was created")
                 return wheel_id
             return wheel_id
 
@@ -34,60 +87,174 @@ class MovieWheelService:
             logging.error(f"Error when receiving/creating a wheel: {e}")
             raise
 
-    async def add_movie_to_wheel(self, movie_id: int, user_id: int):
+    async def get_or_create_global_wheel(self):
+        """
+        Retrieve the global wheel or create a new one if it doesn't exist
+        
+        Returns:
+            int: The ID of the global wheel
+        """
+        return await self.get_or_create_wheel(GLOBAL_SCOPE)
+
+    async def get_wheel_state(self, scope: WheelScope = GLOBAL_SCOPE) -> WheelState:
+        """
+        Get the cached wheel state, loading it on first use
+
+        The version counter is compared with the database at most once per
+        WHEEL_CACHE_REVALIDATE_SECONDS, so changes made by other processes
+        are picked up without a read on every call.
+
+        Args:
+            scope (WheelScope): Guild and channel of the wheel
+
+        Returns:
+            WheelState: Current state of the wheel
+        """
+        state = self.states.get(scope)
+        if (
+            state is not None
+            and not state.stale
+            and not state.needs_check(WHEEL_CACHE_REVALIDATE_SECONDS)
+        ):
+            return state
+
+        async with self.state_lock(scope):
+            state = self.states.get(scope)
+            if state is not None and not state.stale:
+                if not state.needs_check(WHEEL_CACHE_REVALIDATE_SECONDS):
+                    return state
+                version = await self.repository.get_wheel_version(state.wheel_id)
+                if version == state.version:
+                    state.mark_checked()
+                    return state
+
+            state = await self.load_wheel_state(scope)
+            self.states.set(scope, state)
+            return state
+
+    @asynccontextmanager
+    async def state_lock(self, scope: WheelScope):
+        """Hold the lock of a scope, it is dropped once nobody holds or waits for it"""
+        lock, users = self.state_locks.get(scope, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self.state_locks[scope] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self.state_locks[scope]
+            if users == 1:
+                del self.state_locks[scope]
+            else:
+                self.state_locks[scope] = (lock, users - 1)
+
+    async def load_wheel_state(self, scope: WheelScope = GLOBAL_SCOPE) -> WheelState:
+        """
+        Read the whole wheel from the database
+
+        Args:
+            scope (WheelScope): Guild and channel of the wheel
+
+        Returns:
+            WheelState: Fresh state of the wheel
+        """
+        wheel_id = await self.get_or_create_wheel(scope)
+        # The version is read first, so a concurrent write can only cause an extra reload
+        version = await self.repository.get_wheel_version(wheel_id)
+        entries = await self.repository.get_wheel_entries(wheel_id)
+        users = await self.repository.get_wheel_users(wheel_id)
+        logging.info(f"Loaded wheel {wheel_id} (version {version}) into cache")
+        return WheelState(wheel_id, version, entries, users)
+
+    def invalidate(self, scope: WheelScope = GLOBAL_SCOPE):
+        """Drop the cached wheel state so the next call reloads it"""
+        state = self.states.get(scope)
+        if state is not None:
+            state.stale = True
+
+    async def add_movie_to_wheel(
+        self, movie_id: int, user_id: int, scope: WheelScope = GLOBAL_SCOPE
+    ):
         """
         Add a movie to the wheel
         
         Args:
             movie_id (int): ID of the movie to add
             user_id (int): ID of the user adding the movie
+            scope (WheelScope): Guild and channel of the wheel
         """
         try:
-            wheel_id = await self.get_or_create_global_wheel()
-            await self.repository.add_movie_to_wheel(movie_id, user_id, wheel_id)
+            state = await self.get_wheel_state(scope)
+            version = await self.repository.add_movie_to_wheel(
+                movie_id, user_id, state.wheel_id
+            )
+            entries = await self.repository.get_wheel_entries(state.wheel_id, movie_id)
+            user = None
+            if user_id not in state.users:
+                user = await self.repository.get_winner_user(movie_id, state.wheel_id)
+            state.add(version, entries[-1:], user)
             logging.info(f"The movie {movie_id} was added to the wheel by user {user_id}")
 
         except Exception as e:
+            self.invalidate(scope)
             logging.error(f"Error when adding a movie to the wheel: {e}")
             raise
 
-    async def delete_movie_from_wheel(self, movie_id: int):
+    async def delete_movie_from_wheel(
+        self, movie_id: int, scope: WheelScope = GLOBAL_SCOPE
+    ):
         """
         Remove a movie from the wheel
         
         Args:
             movie_id (int): ID of the movie to remove
+            scope (WheelScope): Guild and channel of the wheel
         """
         try:
-            wheel_id = await self.get_or_create_global_wheel()
-            await self.repository.delete_movie_from_wheel(movie_id, wheel_id)
+            state = await self.get_wheel_state(scope)
+            version = await self.repository.delete_movie_from_wheel(
+                movie_id, state.wheel_id
+            )
+            state.remove(version, movie_id)
             logging.info(f"The movie {movie_id} is removed from the wheel")
 
         except Exception as e:
+            self.invalidate(scope)
             logging.error(f"Error when the movie is removed from the wheel: {e}")
             raise
 
-    async def clear_wheel(self):
-        """Clear all movies from the wheel"""
+    async def clear_wheel(self, scope: WheelScope = GLOBAL_SCOPE):
+        """
+        Clear all movies from the wheel
+
+        Args:
+            scope (WheelScope): Guild and channel of the wheel
+        """
         try:
-            wheel_id = await self.get_or_create_global_wheel()
-            await self.repository.clear_wheel(wheel_id)
+            state = await self.get_wheel_state(scope)
+            version = await self.repository.clear_wheel(state.wheel_id)
+            state.clear(version)
             logging.info("The wheel is cleaned")
 
         except Exception as e:
+            self.invalidate(scope)
             logging.error(f"Error when cleaning the wheel: {e}")
             raise
 
-    async def get_movies_in_wheel(self):
+    async def get_movies_in_wheel(self, scope: WheelScope = GLOBAL_SCOPE):
         """
         Get a list of all movies currently in the wheel
         
+        Args:
+            scope (WheelScope): Guild and channel of the wheel
+
         Returns:
             list: List of movies in the wheel
         """
         try:
-            wheel_id = await self.get_or_create_global_wheel()
-            movies = await self.repository.get_movies_in_wheel(wheel_id)
+            state = await self.get_wheel_state(scope)
+            movies = list(state.entries)  # Callers may shuffle the list
             logging.info(f"Obtained {len(movies)} movies from the wheel")
             return movies
 
@@ -95,19 +262,22 @@ class MovieWheelService:
             logging.error(f"Error when receiving movies from a wheel: {e}")
             return []
 
-    async def get_winner_user(self, movie_id: int):
+    async def get_winner_user(self, movie_id: int, scope: WheelScope = GLOBAL_SCOPE):
         """
         Get the user who added the winning movie
         
         Args:
             movie_id (int): ID of the winning movie
+            scope (WheelScope): Guild and channel of the wheel
             
         Returns:
             User: User who added the movie, or None if not found
         """
         try:
-            wheel_id = await self.get_or_create_global_wheel()
-            user = await self.repository.get_winner_user(movie_id, wheel_id)
+            state = await self.get_wheel_state(scope)
+            user = state.get_adder(movie_id)
+            if user is None:
+                user = await self.repository.get_winner_user(movie_id, state.wheel_id)
             if user:
                 logging.info(f"The winner found for the movie {movie_id}")
             else:
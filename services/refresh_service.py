@@ -0,0 +1,177 @@
+import math
+import random
+import time
+import logging
+from typing import Optional
+from database.models import UserMovieStatus
+from database.repositories.refresh_state_repository import RefreshStateRepository
+from config.settings import (
+    REFRESH_DORMANT_DAYS,
+    REFRESH_JITTER,
+    REFRESH_MAX_INTERVAL_HOURS,
+    REFRESH_MIN_INTERVAL_HOURS,
+)
+
+CHANGE_SCORE_WEIGHT = 0.3  # Weight of the newest observation in the change score
+ACTIVITY_HALF_LIFE_DAYS = 7  # Idle time that halves how often a user is refreshed
+DEFAULT_CHANGE_SCORE = 0.5
+ACTIVITY_DEBOUNCE_SECONDS = 3600  # Commands of a user update its activity this often
+
+
+def refresh_interval(
+    change_score: float, last_active_at: Optional[float], now: float
+) -> float:
+    """
+    Seconds until the next refresh of a user
+
+    Users whose lists change often and who used the bot recently get the
+    minimum interval, dormant users the maximum. Jitter spreads users that
+    would otherwise be due at the same moment.
+
+    Args:
+        change_score (float): 0 if the lists never change, 1 if they always do
+        last_active_at (float): When the user last used the bot, Unix time
+        now (float): Current Unix time
+
+    Returns:
+        float: Interval in seconds
+    """
+    min_interval = REFRESH_MIN_INTERVAL_HOURS * 3600
+    max_interval = REFRESH_MAX_INTERVAL_HOURS * 3600
+
+    idle_days = (now - last_active_at) / 86400 if last_active_at else math.inf
+    if idle_days > REFRESH_DORMANT_DAYS:
+        interval = max_interval
+    else:
+        activity = 0.5 ** (idle_days / ACTIVITY_HALF_LIFE_DAYS)
+        # Geometric interpolation, so each step of the score matters equally
+        interval = max_interval * (min_interval / max_interval) ** (
+            change_score * activity
+        )
+
+    return interval * random.uniform(1 - REFRESH_JITTER, 1 + REFRESH_JITTER)
+
+
+class RefreshService:
+    """Service class for adaptive scheduling of user list refreshes"""
+    _instance: Optional["RefreshService"] = None
+    repository: RefreshStateRepository
+    last_active: dict
+    marked_at: dict
+
+    def __new__(cls):
+        """Singleton pattern implementation for RefreshService"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.repository = RefreshStateRepository()
+            cls._instance.last_active = {}  # User ID -> Unix time, not saved yet
+            cls._instance.marked_at = {}  # Discord ID -> monotonic time of the mark
+        return cls._instance
+
+    def mark_active(self, user_id: int):
+        """
+        Remember that a user used the bot, saved on the next flush
+
+        Args:
+            user_id (int): ID of the user
+        """
+        self.last_active[user_id] = time.time()
+
+    def should_mark_active(self, discord_id: int) -> bool:
+        """
+        Whether a command of this Discord user should update its activity
+
+        Activity only needs hour precision, so the user lookup behind the
+        mark runs at most once per ACTIVITY_DEBOUNCE_SECONDS per user.
+
+        Args:
+            discord_id (int): Discord ID of the user
+        """
+        now = time.monotonic()
+        marked_at = self.marked_at.get(discord_id)
+        if marked_at is not None and now - marked_at < ACTIVITY_DEBOUNCE_SECONDS:
+            return False
+        self.marked_at[discord_id] = now
+        return True
+
+    async def flush_activity(self):
+        """Save activity collected since the last flush"""
+        expired = time.monotonic() - ACTIVITY_DEBOUNCE_SECONDS
+        self.marked_at = {
+            discord_id: marked_at
+            for discord_id, marked_at in self.marked_at.items()
+            if marked_at > expired
+        }
+        if not self.last_active:
+            return
+        last_active, self.last_active = self.last_active, {}
+        try:
+            await self.repository.save_activity(last_active)
+        except Exception as e:
+            logging.error(f"Error saving user activity: {e}")
+
+    async def get_due_users(self, limit: int):
+        """
+        Get users whose refresh is due
+
+        Args:
+            limit (int): Maximum number of users
+
+        Returns:
+            list: Records with id, kinorium_id, change_score and last_active_at
+        """
+        return await self.repository.get_due_users(time.time(), limit)
+
+    async def schedule_next(self, user_id: int, change_score, last_active_at):
+        """
+        Push the next refresh of a user out by its current interval
+
+        Args:
+            user_id (int): ID of the user
+            change_score (float): Current change score, None for new users
+            last_active_at (float): When the user last used the bot
+        """
+        now = time.time()
+        if change_score is None:
+            change_score = DEFAULT_CHANGE_SCORE
+        await self.repository.save_state(
+            user_id,
+            change_score=change_score,
+            next_refresh_at=now + refresh_interval(change_score, last_active_at, now),
+        )
+
+    async def record_refresh(
+        self, user_id: int, list_type: UserMovieStatus, changed: bool
+    ):
+        """
+        Learn from a finished list check and schedule the next refresh
+
+        Each list keeps its own score, so an unchanged list checked after a
+        changed one does not cancel it out.
+
+        Args:
+            user_id (int): ID of the user
+            list_type (UserMovieStatus): List that was checked
+            changed (bool): Whether the list had changed since the last check
+        """
+        try:
+            now = time.time()
+            state = await self.repository.record_list_check(
+                user_id, list_type, changed, CHANGE_SCORE_WEIGHT, now
+            )
+            await self.repository.save_state(
+                user_id,
+                next_refresh_at=now
+                + refresh_interval(state.change_score, state.last_active_at, now),
+            )
+        except Exception as e:
+            logging.error(f"Error recording refresh of user {user_id}: {e}")
+
+    async def request_refresh(self, user_id: int):
+        """
+        Make a user due right away
+
+        Args:
+            user_id (int): ID of the user
+        """
+        await self.repository.save_state(user_id, next_refresh_at=0)
@@ -0,0 +1,206 @@
+import asyncio
+from typing import Optional
+import logging
+from database.models import ScrapeJobStatus
+from database.repositories.scrape_job_repository import ScrapeJobRepository
+from services.tracing import traced_methods
+
+
+@traced_methods
+class ScrapeJobService:
+    """Service class for running tracked background scrape jobs"""
+    _instance: Optional["ScrapeJobService"] = None
+    repository: ScrapeJobRepository
+    tasks: dict
+    submit_lock: asyncio.Lock
+
+    def __new__(cls):
+        """Singleton pattern implementation for ScrapeJobService"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.repository = ScrapeJobRepository()
+            cls._instance.tasks = {}  # Kinorium ID -> asyncio.Task
+            cls._instance.submit_lock = asyncio.Lock()
+        return cls._instance
+
+    async def submit(self, kinorium_id: int, runner):
+        """
+        Start a background scrape job, or join the one already running
+
+        The job runs as its own task, so it keeps going after the command
+        that submitted it has returned or timed out. A job that was cut off
+        by a restart or failed is resumed from its page checkpoints.
+
+        Args:
+            kinorium_id (int): Kinorium ID of the user to scrape
+            runner: Coroutine function taking the job ID that does the scraping
+
+        Returns:
+            tuple: (int, bool) - Job ID and whether a new job was started
+        """
+        async with self.submit_lock:
+            active_job = await self.repository.get_active_job(kinorium_id)
+            task = self.tasks.get(kinorium_id)
+            if active_job is not None and task is not None and not task.done():
+                logging.info(
+                    f"Scrape of {kinorium_id} joined running job {active_job.id}"
+                )
+                return active_job.id, False
+
+            unfinished_job = await self.repository.get_resumable_job(kinorium_id)
+            if unfinished_job is not None:
+                job_id = unfinished_job.id
+                await self.repository.update_job(
+                    job_id, status=ScrapeJobStatus.QUEUED, error=None
+                )
+                logging.info(f"Resuming scrape job {job_id} for {kinorium_id}")
+            else:
+                job_id = await self.repository.create_job(kinorium_id)
+            task = asyncio.create_task(self._run(job_id, runner))
+            self.tasks[kinorium_id] = task
+            task.add_done_callback(lambda _: self.tasks.pop(kinorium_id, None))
+            logging.info(f"Scrape job {job_id} for {kinorium_id} submitted")
+            return job_id, True
+
+    async def run(self, kinorium_id: int, runner):
+        """
+        Submit a scrape job and wait until it ends
+
+        Args:
+            kinorium_id (int): Kinorium ID of the user to scrape
+            runner: Coroutine function taking the job ID that does the scraping
+
+        Returns:
+            ScrapeJob: Job record as the job left it, DONE or FAILED
+        """
+        job_id, _ = await self.submit(kinorium_id, runner)
+        task = self.tasks.get(kinorium_id)
+        if task is not None:
+            await task
+        return await self.repository.get_job(job_id)
+
+    async def resume_interrupted(self, make_runner) -> int:
+        """
+        Resume the jobs a restart cut off while they were queued or running
+
+        Args:
+            make_runner: Function taking a Kinorium ID and returning the runner
+
+        Returns:
+            int: Number of jobs resumed
+        """
+        jobs = await self.repository.get_interrupted_jobs()
+        resumed = 0
+        for kinorium_id in dict.fromkeys(job.kinorium_id for job in jobs):
+            _, is_new = await self.submit(kinorium_id, make_runner(kinorium_id))
+            resumed += is_new
+        if resumed:
+            logging.info(f"Resumed {resumed} interrupted scrape jobs")
+        return resumed
+
+    async def _run(self, job_id: int, runner):
+        try:
+            await self.repository.update_job(job_id, status=ScrapeJobStatus.RUNNING)
+            await runner(job_id)
+            await self.repository.update_job(job_id, status=ScrapeJobStatus.DONE)
+            logging.info(f"Scrape job {job_id} finished")
+        except Exception as e:
+            logging.error(f"Scrape job {job_id} failed: {e}")
+            await self.repository.update_job(
+                job_id, status=ScrapeJobStatus.FAILED, error=str(e)
+            )
+
+    async def set_totals(self, job_id: int, pages_total: int, movies_total: int):
+        """
+        Record how much work the job has
+
+        Args:
+            job_id (int): ID of the job
+            pages_total (int): Number of pages to scrape
+            movies_total (int): Number of movies on those pages
+        """
+        await self.repository.update_job(
+            job_id, pages_total=pages_total, movies_total=movies_total
+        )
+
+    async def get_job(self, job_id: int):
+        """
+        Get a job by ID
+
+        Args:
+            job_id (int): ID of the job
+
+        Returns:
+            ScrapeJob: Job record
+        """
+        return await self.repository.get_job(job_id)
+
+    async def plan_pages(self, job_id: int, pages: list):
+        """
+        Record the pages a job has to scrape
+
+        Args:
+            job_id (int): ID of the job
+            pages (list): (UserMovieStatus, int) pairs of list type and page number
+        """
+        await self.repository.add_pages(job_id, pages)
+
+    async def get_pending_pages(self, job_id: int):
+        """
+        Get pages that still have to be scraped, so a resumed job skips the rest
+
+        Args:
+            job_id (int): ID of the job
+
+        Returns:
+            list: ScrapeJobPage records
+        """
+        return await self.repository.get_pending_pages(job_id)
+
+    async def page_done(
+        self, job_id: int, list_type, page: int, movies_count: int, rows: int
+    ):
+        """
+        Checkpoint a page whose movies have been committed
+
+        Args:
+            job_id (int): ID of the job
+            list_type (UserMovieStatus): List the page belongs to
+            page (int): Page number
+            movies_count (int): Movies found on the page
+            rows (int): User movie rows written for the page
+        """
+        await self.repository.complete_page(
+            job_id, list_type, page, movies_count, rows
+        )
+
+    async def page_failed(self, job_id: int, list_type, page: int, error: str):
+        """
+        Record a failed attempt at a page
+
+        Args:
+            job_id (int): ID of the job
+            list_type (UserMovieStatus): List the page belongs to
+            page (int): Page number
+            error (str): What went wrong
+        """
+        try:
+            await self.repository.fail_page(job_id, list_type, page, error)
+        except Exception as e:
+            logging.error(f"Error recording failed page of job {job_id}: {e}")
+
+    async def get_latest_job(self, kinorium_id: int):
+        """
+        Get the most recent job of a Kinorium user
+
+        Args:
+            kinorium_id (int): Kinorium ID of the user
+
+        Returns:
+            ScrapeJob: Job record, or None if the user was never scraped
+        """
+        try:
+            return await self.repository.get_latest_job(kinorium_id)
+        except Exception as e:
+            logging.error(f"Error getting scrape job of {kinorium_id}: {e}")
+            return None
@@ -0,0 +1,147 @@
+import time
+import logging
+from typing import Optional
+from database.models import UserMovieStatus
+from database.repositories.scrape_task_repository import ScrapeTaskRepository
+from database.repositories.user_repository import UserRepository
+
+DISCOVER_PAGE = 0  # Task page that counts the pages of a list and queues them
+LEASE_SECONDS = 120  # How long a claimed task stays with its worker without heartbeats
+MAX_ATTEMPTS = 5  # Attempts at a task before it fails for good
+RETRY_DELAY = 30  # Seconds before the first retry, doubled with every attempt
+
+
+class ScrapeQueueService:
+    """Service class for the shared queue of pages to scrape"""
+    _instance: Optional["ScrapeQueueService"] = None
+    repository: ScrapeTaskRepository
+    user_repository: UserRepository
+
+    def __new__(cls):
+        """Singleton pattern implementation for ScrapeQueueService"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.repository = ScrapeTaskRepository()
+            cls._instance.user_repository = UserRepository()
+        return cls._instance
+
+    async def enqueue_user(self, user_id: int, kinorium_id: int):
+        """
+        Queue both lists of a user, the workers find out how many pages they have
+
+        Args:
+            user_id (int): ID of the user
+            kinorium_id (int): Kinorium ID of the user
+        """
+        await self.repository.enqueue(
+            [
+                {
+                    "user_id": user_id,
+                    "kinorium_id": kinorium_id,
+                    "list_type": list_type,
+                    "page": DISCOVER_PAGE,
+                }
+                for list_type in (UserMovieStatus.WATCH_LATER, UserMovieStatus.WATCHED)
+            ],
+            time.time(),
+        )
+
+    async def enqueue_all_users(self) -> int:
+        """
+        Queue lists of every registered user
+
+        Returns:
+            int: Number of users queued
+        """
+        users = await self.user_repository.get_all_users()
+        for user in users:
+            await self.enqueue_user(user.id, user.kinorium_id)
+        logging.info(f"Queued lists of {len(users)} users")
+        return len(users)
+
+    async def enqueue_pages(self, task, total_pages: int):
+        """
+        Queue every page of the list a discovery task counted
+
+        Args:
+            task (ScrapeTask): Discovery task of the list
+            total_pages (int): Number of pages in the list
+        """
+        await self.repository.enqueue(
+            [
+                {
+                    "user_id": task.user_id,
+                    "kinorium_id": task.kinorium_id,
+                    "list_type": task.list_type,
+                    "page": page,
+                }
+                for page in range(1, total_pages + 1)
+            ],
+            time.time(),
+        )
+
+    async def claim(self, worker_id: str):
+        """
+        Lease the next task to a worker
+
+        Args:
+            worker_id (str): Unique name of the worker
+
+        Returns:
+            ScrapeTask: Claimed task, or None if the queue is empty
+        """
+        return await self.repository.claim(
+            worker_id, time.time(), LEASE_SECONDS, MAX_ATTEMPTS
+        )
+
+    async def heartbeat(self, task_id: int, worker_id: str) -> bool:
+        """
+        Keep the lease of a task that is still being worked on
+
+        Args:
+            task_id (int): ID of the task
+            worker_id (str): Worker holding the lease
+
+        Returns:
+            bool: False if the lease expired and the task was handed to another worker
+        """
+        return await self.repository.heartbeat(
+            task_id, worker_id, time.time() + LEASE_SECONDS
+        )
+
+    async def complete(self, task_id: int, worker_id: str, rows_committed: int = 0):
+        """
+        Mark a task as done
+
+        Args:
+            task_id (int): ID of the task
+            worker_id (str): Worker holding the lease
+            rows_committed (int): User movie rows the task wrote
+
+        Returns:
+            bool: False if the lease had been lost before completion
+        """
+        return await self.repository.complete(task_id, worker_id, rows_committed)
+
+    async def fail(self, task, worker_id: str, error: str):
+        """
+        Give a task back for a later retry, or fail it after MAX_ATTEMPTS
+
+        Args:
+            task (ScrapeTask): Claimed task
+            worker_id (str): Worker holding the lease
+            error (str): What went wrong
+        """
+        retry_at = None
+        if task.attempts < MAX_ATTEMPTS:
+            retry_at = time.time() + RETRY_DELAY * 2 ** (task.attempts - 1)
+        await self.repository.fail(task.id, worker_id, error, retry_at)
+
+    async def get_counts(self) -> dict:
+        """
+        Count tasks in each status
+
+        Returns:
+            dict: ScrapeJobStatus -> number of tasks
+        """
+        return await self.repository.count_by_status()
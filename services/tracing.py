@@ -0,0 +1,363 @@
+"""
+Lightweight tracing of bot commands and interactions.
+
+A root span is opened for every prefix command and traced interaction
+callback. Service methods, SQL queries, poster downloads and rendering open
+child spans while a trace is active, so a slow !random or !spin shows which
+step used up the interaction deadline. Finished spans are appended to a JSONL
+file and/or sent to an OTLP/HTTP collector.
+
+    python -m services.tracing summary traces.jsonl   # slowest steps per command
+"""
+import argparse
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from config.settings import (
+    TRACE_FLUSH_SECONDS,
+    TRACE_OTLP_ENDPOINT,
+    TRACE_PATH,
+    TRACE_SAMPLE_RATE,
+    TRACING_ENABLED,
+)
+
+SERVICE_NAME = "futurewatch-bot"
+MAX_STATEMENT_LENGTH = 200
+MAX_BUFFERED_SPANS = 10000  # Spans dropped beyond this if exports fall behind
+DATABASE_METHODS = ("execute", "execute_many", "fetch_all", "fetch_one", "fetch_val")
+
+_NOT_SAMPLED = object()
+current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed step of a trace"""
+
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "attributes",
+        "start_time",
+        "duration",
+        "error",
+        "_started",
+    )
+
+    def __init__(self, name: str, parent: "Span" = None, attributes: dict = None):
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.attributes = attributes or {}
+        self.start_time = time.time()
+        self.duration = None
+        self.error = None
+        self._started = time.perf_counter()
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def end(self):
+        self.duration = time.perf_counter() - self._started
+
+    def as_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start_time, 6),
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def as_otlp(self) -> dict:
+        start_ns = int(self.start_time * 1e9)
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(self.duration * 1e9)),
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class Tracer:
+    """Creates spans and exports finished ones in the background"""
+
+    def __init__(
+        self,
+        enabled: bool = TRACING_ENABLED,
+        path: str = TRACE_PATH,
+        otlp_endpoint: str = TRACE_OTLP_ENDPOINT,
+        sample_rate: float = TRACE_SAMPLE_RATE,
+        flush_interval: float = TRACE_FLUSH_SECONDS,
+    ):
+        self.enabled = enabled
+        self.path = path
+        self.otlp_endpoint = otlp_endpoint
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.finished = []
+        self.dropped = 0
+        self._flush_task = None
+
+    @contextmanager
+    def span(self, name: str, root: bool = False, **attributes):
+        """
+        Time the block as a span of the current trace
+
+        Args:
+            name (str): Span name, e.g. "MovieService.search_movies"
+            root (bool): Start a new trace if none is active, otherwise the
+                span is only recorded inside an existing trace
+            **attributes: Values attached to the span
+
+        Yields:
+            Span: The open span, or None if it is not recorded
+        """
+        parent = current_span.get()
+        outside_trace = parent is None and not root
+        if not self.enabled or parent is _NOT_SAMPLED or outside_trace:
+            yield None
+            return
+        if parent is None and random.random() >= self.sample_rate:
+            token = current_span.set(_NOT_SAMPLED)
+            try:
+                yield None
+            finally:
+                current_span.reset(token)
+            return
+
+        span = Span(name, parent, attributes)
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end()
+            current_span.reset(token)
+            if len(self.finished) < MAX_BUFFERED_SPANS:
+                self.finished.append(span)
+            else:
+                self.dropped += 1
+
+    def start(self):
+        """Start exporting finished spans, calling it again does nothing"""
+        if self.enabled and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logging.error(f"Failed to export traces: {e}")
+
+    async def flush(self):
+        """Export the spans finished since the last flush"""
+        spans, self.finished = self.finished, []
+        if not spans:
+            return
+        if self.path:
+            lines = "".join(
+                json.dumps(span.as_dict(), ensure_ascii=False) + "\n" for span in spans
+            )
+            await asyncio.to_thread(self._append, lines)
+        if self.otlp_endpoint:
+            await self._send_otlp(spans)
+
+    def _append(self, lines: str):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    async def _send_otlp(self, spans: list):
+        import aiohttp
+
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": SERVICE_NAME},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [span.as_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        async with aiohttp.ClientSession() as session:
+            async with session.post(self.otlp_endpoint, json=payload) as response:
+                if response.status >= 400:
+                    logging.error(f"Trace collector answered {response.status}")
+
+
+tracer = Tracer()
+
+
+def traced(name: str = None, root: bool = False):
+    """Record every call of the decorated function as a span"""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.span(span_name, root=root):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(span_name, root=root):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def traced_methods(cls):
+    """Class decorator that traces every public coroutine method"""
+    for attribute, value in list(vars(cls).items()):
+        if attribute.startswith("_"):
+            continue
+        if isinstance(value, staticmethod):
+            if inspect.iscoroutinefunction(value.__func__):
+                traced_func = traced(f"{cls.__name__}.{attribute}")(value.__func__)
+                setattr(cls, attribute, staticmethod(traced_func))
+        elif inspect.iscoroutinefunction(value):
+            setattr(cls, attribute, traced(f"{cls.__name__}.{attribute}")(value))
+    return cls
+
+
+def describe_query(query) -> str:
+    """Short description of a query without compiling it, e.g. 'SELECT movies'"""
+    if isinstance(query, str):
+        return " ".join(query.split())[:MAX_STATEMENT_LENGTH]
+    kind = type(query).__name__.upper()
+    table = getattr(query, "table", None)
+    if table is not None:
+        return f"{kind} {table.name}"
+    try:
+        froms = query.get_final_froms()
+        return f"{kind} {', '.join(getattr(f, 'name', str(f)) for f in froms)}"
+    except AttributeError:
+        return kind
+
+
+def instrument_database(database):
+    """Record a span for every query made through the databases connection"""
+    for method_name in DATABASE_METHODS:
+        method = getattr(database, method_name)
+        if getattr(method, "_traced", False):
+            continue
+
+        def make_wrapper(method, method_name):
+            @functools.wraps(method)
+            async def wrapper(query, *args, **kwargs):
+                with tracer.span("sql", method=method_name) as span:
+                    if span is not None:
+                        span.set(statement=describe_query(query))
+                    return await method(query, *args, **kwargs)
+
+            wrapper._traced = True
+            return wrapper
+
+        setattr(database, method_name, make_wrapper(method, method_name))
+
+
+def trace_commands(bot):
+    """Open a root span for every prefix command the bot invokes"""
+    invoke = bot.invoke
+
+    async def traced_invoke(ctx):
+        name = ctx.command.qualified_name if ctx.command else ctx.invoked_with
+        guild_id = ctx.guild.id if ctx.guild else None
+        with tracer.span(f"!{name}", root=True, user=ctx.author.id, guild=guild_id):
+            return await invoke(ctx)
+
+    bot.invoke = traced_invoke
+
+
+def summarize(path: str, top: int = 5):
+    """Print duration percentiles per root span and the slowest steps inside them"""
+    with open(path, encoding="utf-8") as f:
+        spans = [json.loads(line) for line in f if line.strip()]
+    by_id = {span["span_id"]: span for span in spans}
+
+    def root_of(span):
+        while span["parent_id"] in by_id:
+            span = by_id[span["parent_id"]]
+        return span
+
+    roots = defaultdict(list)
+    steps = defaultdict(lambda: defaultdict(list))
+    for span in spans:
+        if span["parent_id"] is None:
+            roots[span["name"]].append(span["duration_ms"])
+        else:
+            root = root_of(span)
+            statement = span["attributes"].get("statement")
+            step = f"{span['name']} {statement}" if statement else span["name"]
+            steps[root["name"]][step].append(span["duration_ms"])
+
+    for name, durations in sorted(roots.items(), key=lambda item: -max(item[1])):
+        durations.sort()
+        p50 = durations[len(durations) // 2]
+        p95 = durations[min(len(durations) - 1, int(0.95 * len(durations)))]
+        print(f"{name}: {len(durations)} calls, p50 {p50:.0f} ms, p95 {p95:.0f} ms")
+        slowest = sorted(
+            steps[name].items(), key=lambda item: -sum(item[1]) / len(durations)
+        )
+        for step, step_durations in slowest[:top]:
+            per_call = sum(step_durations) / len(durations)
+            print(f"    {per_call:8.1f} ms per call  {step} ({len(step_durations)}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    summary_parser = subparsers.add_parser("summary", help="slowest steps per command")
+    summary_parser.add_argument("path", nargs="?", default=TRACE_PATH)
+    summary_parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+    summarize(args.path, args.top)
+
+
+if __name__ == "__main__":
+    main()
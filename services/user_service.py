@@ -1,20 +1,39 @@
 from typing import Optional
+from config.settings import (
+    USER_CACHE_MAX_SIZE,
+    USER_CACHE_NEGATIVE_TTL_SECONDS,
+    USER_CACHE_TTL_SECONDS,
+)
 from database.repositories.user_repository import UserRepository
+from services.cache import AsyncTTLCache
 import logging
+from services.tracing import traced_methods
 
 
+@traced_methods
 class UserService:
     """Service class for managing user operations"""
     _instance: Optional["UserService"] = None
     repository: UserRepository
+    cache: AsyncTTLCache
 
     def __new__(cls):
         """Singleton pattern implementation for UserService"""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.repository = UserRepository()
+            cls._instance.cache = AsyncTTLCache(
+                "users",
+                max_size=USER_CACHE_MAX_SIZE,
+                ttl=USER_CACHE_TTL_SECONDS,
+                negative_ttl=USER_CACHE_NEGATIVE_TTL_SECONDS,
+            )
         return cls._instance
 
+    def invalidate_cache(self):
+        """Drop cached users, must be called after users are added or changed"""
+        self.cache.invalidate()
+
     async def get_user_by_discord_id(self, discord_id):
         """
         Get a user by their Discord ID
@@ -26,7 +45,10 @@ class UserService:
             User: User object if found, None otherwise
         """
         try:
-            user = await self.repository.get_user_by_discord_id(discord_id)
+            user = await self.cache.get_or_load(
+                ("discord_id", str(discord_id)),
+                lambda: self.repository.get_user_by_discord_id(discord_id),
+            )
             if user is None:
                 logging.warning(f"User with discord_id {discord_id} not found.")
             return user
@@ -48,7 +70,10 @@ class UserService:
             User: User object if found, None otherwise
         """
         try:
-            user = await self.repository.get_user_by_kinorium_id(kinorium_id)
+            user = await self.cache.get_or_load(
+                ("kinorium_id", int(kinorium_id)),
+                lambda: self.repository.get_user_by_kinorium_id(kinorium_id),
+            )
             if user is None:
                 logging.warning(f"User with kinorium_id {kinorium_id} not found.")
             return user
@@ -70,7 +95,10 @@ class UserService:
             str: Kinorium ID if found, None otherwise
         """
         try:
-            user = await self.repository.get_kinorium_id_by_discord_id(discord_id)
+            user = await self.cache.get_or_load(
+                ("kinorium_id_by_discord_id", str(discord_id)),
+                lambda: self.repository.get_kinorium_id_by_discord_id(discord_id),
+            )
             if user is None:
                 logging.warning(f"User with discord_id {discord_id} not found.")
             return user
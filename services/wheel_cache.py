@@ -0,0 +1,95 @@
+import time
+from typing import Optional
+
+
+class WheelState:
+    """In-memory copy of a wheel: its ID, ordered entries and who added them"""
+
+    def __init__(self, wheel_id: int, version: int, entries: list, users: list):
+        self.wheel_id = wheel_id
+        self.version = version
+        self.entries = list(entries)  # Movie records with an extra "added_by"
+        self.users = {user.id: user for user in users}
+        self.stale = False
+        self.checked_at = time.monotonic()
+
+    def needs_check(self, max_age: float) -> bool:
+        """
+        Whether the version should be compared with the database
+
+        Args:
+            max_age (float): Seconds a checked state is trusted for
+
+        Returns:
+            bool: True if the last check is older than max_age
+        """
+        return time.monotonic() - self.checked_at >= max_age
+
+    def mark_checked(self):
+        """Remember that the version matched the database just now"""
+        self.checked_at = time.monotonic()
+
+    def apply_version(self, version: Optional[int]):
+        """
+        Accept the version returned by a write made by this process
+
+        If another process changed the wheel in between, the version skips
+        ahead and the state is marked stale so it gets reloaded.
+
+        Args:
+            version (int): Version of the wheel after the write
+        """
+        if version != self.version + 1:
+            self.stale = True
+        self.version = version
+
+    def add(self, version: int, entries: list, user=None):
+        """
+        Add new entries after a write
+
+        Args:
+            version (int): Version of the wheel after the write
+            entries (list): Added movie records
+            user: User who added the movies, if known
+        """
+        self.apply_version(version)
+        cached_ids = {entry.id for entry in self.entries}
+        self.entries.extend(entry for entry in entries if entry.id not in cached_ids)
+        if user is not None:
+            self.users[user.id] = user
+
+    def remove(self, version: int, movie_id: int):
+        """
+        Remove every entry of a movie after a write
+
+        Args:
+            version (int): Version of the wheel after the write
+            movie_id (int): ID of the removed movie
+        """
+        self.apply_version(version)
+        self.entries = [entry for entry in self.entries if entry.id != movie_id]
+
+    def clear(self, version: int):
+        """
+        Remove all entries after a write
+
+        Args:
+            version (int): Version of the wheel after the write
+        """
+        self.apply_version(version)
+        self.entries = []
+
+    def get_adder(self, movie_id: int):
+        """
+        Get the user who added the movie
+
+        Args:
+            movie_id (int): ID of the movie
+
+        Returns:
+            User: User record, or None if the movie or user is not cached
+        """
+        for entry in self.entries:
+            if entry.id == movie_id:
+                return self.users.get(entry.added_by)
+        return None
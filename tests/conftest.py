@@ -0,0 +1,79 @@
+import asyncio
+import os
+import socket
+import threading
+
+import pytest
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# The scraper builds its URLs on import, so the replay server address is fixed
+# before any test module imports it
+KINORIUM_PORT = free_port()
+os.environ["KINORIUM_BASE_URL"] = f"http://127.0.0.1:{KINORIUM_PORT}"
+
+
+@pytest.fixture
+def movies_db(tmp_path, monkeypatch):
+    """Fresh movies.db in a temporary directory, the bot always opens ./movies.db"""
+    monkeypatch.chdir(tmp_path)
+    import database.models  # noqa: F401 Registers the tables
+    from database.db import init_db
+
+    init_db()
+    return tmp_path
+
+
+@pytest.fixture
+def run_db():
+    """Run a coroutine function with the database connected"""
+    from database.db import connect_db, disconnect_db
+
+    def run(func, *args):
+        async def connected():
+            await connect_db()
+            try:
+                return await func(*args)
+            finally:
+                await disconnect_db()
+
+        return asyncio.run(connected())
+
+    return run
+
+
+@pytest.fixture(scope="session")
+def kinorium_server():
+    """Kinorium replay server on its own thread, the scraper's browser calls it"""
+    from benchmarks.kinorium_replay import ReplayServer
+
+    server = ReplayServer(accounts={1: (30, 20)})
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    start = server.start(port=KINORIUM_PORT)
+    asyncio.run_coroutine_threadsafe(start, loop).result()
+    yield server
+    asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+
+
+@pytest.fixture(scope="session")
+def chromium():
+    """Skip tests that scrape through a browser when Chromium is not installed"""
+    from playwright.async_api import async_playwright
+
+    async def launch():
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            await browser.close()
+
+    try:
+        asyncio.run(launch())
+    except Exception as e:
+        pytest.skip(f"Chromium is not available: {e}")
@@ -0,0 +1,37 @@
+from benchmarks.common import find_regressions
+
+
+def test_only_timings_sizes_and_rates_regress():
+    baseline = {
+        "search": {"calls": 20, "p50_ms": 10.0, "peak_rss_mb": 100.0},
+        "all": {"operations": 2000, "throughput_per_s": 50.0, "error_rate": 0.01},
+    }
+    faster = {
+        "search": {"calls": 40, "p50_ms": 5.0, "peak_rss_mb": 100.0},
+        "all": {"operations": 5000, "throughput_per_s": 80.0, "error_rate": 0.01},
+    }
+    assert find_regressions(faster, baseline, 0.25) == []
+
+    slower = {
+        "search": {"calls": 10, "p50_ms": 20.0, "peak_rss_mb": 200.0},
+        "all": {"operations": 500, "throughput_per_s": 20.0, "error_rate": 0.05},
+    }
+    regressions = find_regressions(slower, baseline, 0.25)
+    assert [line.split(":")[0] for line in regressions] == [
+        "search p50_ms",
+        "search peak_rss_mb",
+        "all throughput_per_s",
+        "all error_rate",
+    ]
+
+
+def test_missing_baseline_fails_only_the_check(tmp_path, monkeypatch):
+    from benchmarks import common
+
+    monkeypatch.setattr(common, "BASELINE_DIR", str(tmp_path))
+    results = {"search": {"p50_ms": 10.0}}
+    assert common.report("missing", results, update=False, threshold=0.25) == 0
+    assert common.report("missing", results, False, 0.25, check=True) == 1
+
+    common.report("missing", results, update=True, threshold=0.25)
+    assert common.report("missing", results, False, 0.25, check=True) == 0
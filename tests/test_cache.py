@@ -0,0 +1,105 @@
+import asyncio
+
+from services import cache as cache_module
+from services.cache import AsyncTTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Loader:
+    """Loader that counts its calls and returns whatever value is current"""
+
+    def __init__(self, value=None):
+        self.value = value
+        self.calls = 0
+        self.release = None
+
+    async def __call__(self):
+        self.calls += 1
+        value = self.value
+        if self.release is not None:
+            await self.release.wait()
+        return value
+
+
+def test_concurrent_misses_share_one_load():
+    cache = AsyncTTLCache("test-coalesce")
+    loader = Loader("movie")
+
+    async def scenario():
+        loader.release = asyncio.Event()
+        waiting = [
+            asyncio.ensure_future(cache.get_or_load("key", loader)) for _ in range(10)
+        ]
+        await asyncio.sleep(0.01)  # Let the load start
+        loader.release.set()
+        return await asyncio.gather(*waiting)
+
+    assert asyncio.run(scenario()) == ["movie"] * 10
+    assert loader.calls == 1
+    assert cache.stats()["coalesced"] == 9
+    assert cache.get("key") == "movie"
+
+
+def test_invalidation_drops_the_load_in_flight():
+    cache = AsyncTTLCache("test-invalidate")
+    old_loader, new_loader, other_loader = Loader("old"), Loader("new"), Loader()
+
+    async def scenario():
+        old_loader.release = asyncio.Event()
+        new_loader.release = asyncio.Event()
+        stale = asyncio.ensure_future(cache.get_or_load("key", old_loader))
+        await asyncio.sleep(0.01)  # Let the load start
+        cache.invalidate("key")
+
+        fresh = asyncio.ensure_future(cache.get_or_load("key", new_loader))
+        await asyncio.sleep(0.01)
+        old_loader.release.set()
+        stale_value = await stale
+        # The stale load finishing must not forget the newer one
+        joined = asyncio.ensure_future(cache.get_or_load("key", other_loader))
+        await asyncio.sleep(0.01)
+        new_loader.release.set()
+        return stale_value, await fresh, await joined
+
+    assert asyncio.run(scenario()) == ("old", "new", "new")
+    assert (old_loader.calls, new_loader.calls, other_loader.calls) == (1, 1, 0)
+    assert cache.get("key") == "new"
+
+
+def test_entries_expire(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    cache = AsyncTTLCache("test-expiry", ttl=60, negative_ttl=5)
+    loader = Loader("movie")
+
+    async def scenario():
+        await cache.get_or_load("key", loader)
+        await cache.get_or_load("missing", Loader())
+        clock.now += 30
+        assert await cache.get_or_load("key", loader) == "movie"
+        assert cache.get("missing", "expired") == "expired"
+        clock.now += 30
+        assert cache.get("key", "expired") == "expired"
+        await cache.get_or_load("key", loader)
+
+    asyncio.run(scenario())
+    assert loader.calls == 2
+
+
+def test_least_recently_used_is_evicted():
+    cache = AsyncTTLCache("test-eviction", max_size=3)
+    for key in "abc":
+        cache.set(key, key.upper())
+    assert cache.get("a") == "A"  # Now b is the least recently used
+
+    cache.set("d", "D")
+    cache.set("e", "E")
+    assert [cache.get(key) for key in "abcde"] == ["A", None, None, "D", "E"]
+    assert cache.stats()["evictions"] == 2
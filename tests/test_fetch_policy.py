@@ -0,0 +1,182 @@
+import asyncio
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+
+from parser import fetch_policy
+from parser.fetch_policy import (
+    BACKOFF_CAP,
+    BREAKER_COOLDOWN,
+    BREAKER_FAILURE_THRESHOLD,
+    DEFAULT_TIMEOUT,
+    LATENCY_MIN_SAMPLES,
+    MAX_TIMEOUT,
+    MIN_TIMEOUT,
+    CircuitBreaker,
+    FetchPolicy,
+    LatencyTracker,
+    backoff_delay,
+    parse_retry_after,
+)
+
+
+class MemoryThrottles:
+    """host_throttles table of the processes that share it"""
+
+    def __init__(self):
+        self.rows = {}
+
+    async def get_throttle(self, host):
+        return self.rows.get(host)
+
+    async def open(self, host, open_until, reason):
+        row = self.rows.get(host)
+        if row is None or row.open_until < open_until:
+            self.rows[host] = SimpleNamespace(open_until=open_until, reason=reason)
+
+
+class FakeResponse:
+    def __init__(self, status: int, retry_after: str = None):
+        self.status = status
+        self.ok = 200 <= status < 300
+        self.retry_after = retry_after
+
+    async def header_value(self, name):
+        return self.retry_after
+
+
+class FakePage:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+
+    async def goto(self, url, wait_until, timeout):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, None), ("", None), ("120", 120.0), ("0", 0.0), ("-5", 0.0), ("soon", None)],
+)
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_date():
+    seconds = parse_retry_after(formatdate(time.time() + 60, usegmt=True))
+    assert 55 <= seconds <= 60
+    assert parse_retry_after(formatdate(time.time() - 60, usegmt=True)) == 0.0
+
+
+def test_backoff_doubles_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(fetch_policy.random, "uniform", lambda low, high: high)
+    delays = [backoff_delay(attempt) for attempt in range(1, 10)]
+    assert delays[:3] == [2, 4, 8]
+    assert max(delays) == BACKOFF_CAP
+
+
+def test_latency_tracker_timeout():
+    tracker = LatencyTracker(window=100)
+    assert tracker.percentile(0.5) is None
+    for _ in range(LATENCY_MIN_SAMPLES - 1):
+        tracker.record(1.0)
+    assert tracker.timeout() == DEFAULT_TIMEOUT
+
+    tracker.record(1.0)
+    assert tracker.timeout() == MIN_TIMEOUT  # 3 x 1s is below the floor
+    for _ in range(100):
+        tracker.record(10.0)
+    assert tracker.percentile(0.5) == 10.0
+    assert tracker.timeout() == 30.0
+    tracker.record(100.0)
+    assert tracker.timeout() == MAX_TIMEOUT
+
+
+def test_breaker_opens_after_failures_in_a_row():
+    breaker = CircuitBreaker("kinorium", MemoryThrottles())
+
+    async def scenario():
+        for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+            await breaker.record_failure("status 500")
+        breaker.record_success()
+        for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+            await breaker.record_failure("status 500")
+        assert not breaker.is_open()
+
+        await breaker.record_failure("status 500")
+        assert breaker.is_open()
+        assert breaker.cooldown == 2 * BREAKER_COOLDOWN
+
+    asyncio.run(scenario())
+
+
+def test_breaker_honours_retry_after():
+    breaker = CircuitBreaker("kinorium", MemoryThrottles())
+
+    async def scenario():
+        await breaker.record_throttle(0)  # An explicit zero is not a missing header
+        assert not breaker.is_open()
+
+        await breaker.record_throttle(None)
+        remaining = breaker.open_until - time.time()
+        assert 0 < remaining <= 2 * BREAKER_COOLDOWN
+
+    asyncio.run(scenario())
+
+
+def test_breaker_pause_is_shared_between_processes():
+    throttles = MemoryThrottles()
+    throttled = CircuitBreaker("kinorium", throttles)
+    other = CircuitBreaker("kinorium", throttles)
+    other_host = CircuitBreaker("example.com", throttles)
+
+    async def scenario():
+        await throttled.record_throttle(0.2)
+        await other.refresh()
+        await other_host.refresh()
+        assert other.is_open()
+        assert not other_host.is_open()
+
+        start = time.monotonic()
+        await other.wait()
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) >= 0.15
+
+
+def test_only_server_errors_and_timeouts_open_the_breaker(monkeypatch):
+    monkeypatch.setattr(fetch_policy, "backoff_delay", lambda attempt: 0)
+    policy = FetchPolicy(max_attempts=BREAKER_FAILURE_THRESHOLD)
+    policy.breaker = CircuitBreaker("kinorium", MemoryThrottles())
+
+    async def scenario():
+        missing = FakePage(*[FakeResponse(404)] * BREAKER_FAILURE_THRESHOLD)
+        assert await policy.goto(missing, "/user/1/watchlist/") is None
+        assert not policy.breaker.is_open()
+
+        timeout = fetch_policy.PlaywrightTimeoutError("Timeout")
+        failing = FakePage(
+            *[FakeResponse(500)] * (BREAKER_FAILURE_THRESHOLD - 1), timeout
+        )
+        assert await policy.goto(failing, "/user/1/watchlist/") is None
+        assert policy.breaker.is_open()
+
+    asyncio.run(scenario())
+
+
+def test_host_throttles_table(movies_db, run_db):
+    async def scenario():
+        breaker = CircuitBreaker("kinorium")
+        await breaker.open(60, "host is throttling")
+        await breaker.open(1, "shorter pause")  # Does not shorten the first one
+
+        other = CircuitBreaker("kinorium")
+        await other.refresh()
+        return breaker.open_until, other.open_until
+
+    open_until, seen_until = run_db(scenario)
+    assert seen_until == pytest.approx(open_until)
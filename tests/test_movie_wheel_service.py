@@ -0,0 +1,40 @@
+import asyncio
+
+from services.cache import AsyncTTLCache
+from services.movie_wheel_service import MovieWheelService, WheelScope
+
+
+class FreshState:
+    stale = False
+
+    def needs_check(self, interval):
+        return False
+
+
+def test_idle_scopes_are_forgotten(monkeypatch):
+    service = MovieWheelService()
+    monkeypatch.setattr(service, "states", AsyncTTLCache("test-wheels", max_size=2))
+    loads = []
+
+    async def load_wheel_state(scope):
+        loads.append(scope)
+        await asyncio.sleep(0.01)
+        return FreshState()
+
+    monkeypatch.setattr(service, "load_wheel_state", load_wheel_state)
+    scopes = [WheelScope(guild_id) for guild_id in range(3)]
+
+    async def scenario():
+        # Callers of one scope share a lock and a load
+        first = await asyncio.gather(
+            *(service.get_wheel_state(scopes[0]) for _ in range(3))
+        )
+        assert first[0] is first[1] is first[2]
+        for scope in scopes[1:]:
+            await service.get_wheel_state(scope)
+
+    asyncio.run(scenario())
+    assert loads == scopes
+    assert service.states.get(scopes[0]) is None  # Evicted by the newer ones
+    assert service.states.stats()["evictions"] == 1
+    assert service.state_locks == {}
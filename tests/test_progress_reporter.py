@@ -0,0 +1,32 @@
+import asyncio
+
+from bot.progress_reporter import ProgressReporter
+
+
+class SlowMessage:
+    """Message whose edits take a while, like a rate limited Discord request"""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.edits = []
+
+    async def edit(self, content: str):
+        await asyncio.sleep(0.05)
+        self.content = content
+        self.edits.append(content)
+
+
+def test_progress_during_an_edit_is_shown():
+    message = SlowMessage("0 of 3 completed.")
+    progress = ProgressReporter(message, 3, interval=0.01)
+
+    async def scenario():
+        progress.advance()
+        await asyncio.sleep(0.02)  # The first edit is in flight now
+        progress.advance()
+        progress.advance()
+        await asyncio.sleep(0.2)
+
+    asyncio.run(scenario())
+    assert message.edits == ["1 of 3 completed.", "3 of 3 completed."]
+    assert progress.edits == 2
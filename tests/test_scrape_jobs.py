@@ -0,0 +1,90 @@
+import asyncio
+
+from database.models import ScrapeJobStatus
+from database.repositories.scrape_job_repository import ScrapeJobRepository
+from services.scrape_job_service import ScrapeJobService
+
+scrape_job_service = ScrapeJobService()
+
+
+def test_interrupted_jobs_are_resumed(movies_db, run_db):
+    runs = []
+
+    def make_runner(kinorium_id):
+        async def runner(job_id):
+            runs.append((kinorium_id, job_id))
+
+        return runner
+
+    async def scenario():
+        running = await ScrapeJobRepository.create_job(1)
+        await ScrapeJobRepository.update_job(running, status=ScrapeJobStatus.RUNNING)
+        queued = await ScrapeJobRepository.create_job(2)
+        done = await ScrapeJobRepository.create_job(3)
+        await ScrapeJobRepository.update_job(done, status=ScrapeJobStatus.DONE)
+
+        resumed = await scrape_job_service.resume_interrupted(make_runner)
+        while scrape_job_service.tasks:
+            await asyncio.sleep(0.01)
+        jobs = [
+            await ScrapeJobRepository.get_job(job_id)
+            for job_id in (running, queued, done)
+        ]
+        return resumed, (running, queued), jobs
+
+    resumed, job_ids, jobs = run_db(scenario)
+    assert resumed == 2
+    assert sorted(runs) == [(1, job_ids[0]), (2, job_ids[1])]
+    assert all(job.status == ScrapeJobStatus.DONE for job in jobs)
+
+
+def test_run_waits_for_the_job(movies_db, run_db):
+    async def failing(job_id):
+        raise RuntimeError("2 pages failed")
+
+    async def scenario():
+        failed = await scrape_job_service.run(1, failing)
+
+        async def finishing(job_id):
+            assert job_id == failed.id  # The failed job is resumed, not replaced
+
+        return failed, await scrape_job_service.run(1, finishing)
+
+    failed, finished = run_db(scenario)
+    assert failed.status == ScrapeJobStatus.FAILED
+    assert failed.error == "2 pages failed"
+    assert finished.status == ScrapeJobStatus.DONE
+
+
+def test_job_pages_run_a_few_at_a_time(movies_db, run_db, monkeypatch):
+    import parser.scrape_job as scrape_job
+    from database.models import UserMovieStatus
+
+    running = []
+    peak = []
+
+    async def fake_scrape_page(page_number, *args):
+        running.append(page_number)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(page_number)
+        return True
+
+    async def not_counted_again(kinorium_id, is_rated=False):
+        raise AssertionError("the totals were already known")
+
+    monkeypatch.setattr(scrape_job, "scrape_page", fake_scrape_page)
+    monkeypatch.setattr(scrape_job, "get_total_movies", not_counted_again)
+    monkeypatch.setattr(scrape_job, "SCRAPE_JOB_PAGE_CONCURRENCY", 2)
+
+    async def scenario():
+        job_id = await ScrapeJobRepository.create_job(1)
+        await scrape_job.run_job(
+            1, job_id, movie_totals={UserMovieStatus.WATCHED: 450}
+        )
+        return await ScrapeJobRepository.get_job(job_id)
+
+    job = run_db(scenario)
+    assert (job.pages_total, job.movies_total) == (5, 450)
+    assert len(peak) == 5
+    assert max(peak) == 2
@@ -0,0 +1,183 @@
+import asyncio
+import time
+
+from sqlalchemy import func, insert, select, update
+
+from database.db import get_db
+from database.models import (
+    ScrapeJobStatus,
+    ScrapeTask,
+    User,
+    UserMovie,
+    UserMovieStatus,
+)
+from database.repositories.scrape_task_repository import ScrapeTaskRepository
+from services import scrape_queue_service
+from services.scrape_queue_service import LEASE_SECONDS, MAX_ATTEMPTS
+
+KINORIUM_ID = 1  # Account of the replay server with 30 + 20 movies
+
+
+async def add_user(kinorium_id: int = KINORIUM_ID) -> int:
+    db = await get_db()
+    return await db.execute(
+        insert(User).values(discord_id=str(kinorium_id), kinorium_id=kinorium_id)
+    )
+
+
+async def get_tasks():
+    db = await get_db()
+    return await db.fetch_all(select(ScrapeTask).order_by(ScrapeTask.id))
+
+
+async def expire_lease(task_id: int):
+    """What a crashed worker leaves behind once its lease runs out"""
+    db = await get_db()
+    await db.execute(
+        update(ScrapeTask)
+        .where(ScrapeTask.id == task_id)
+        .values(lease_expires_at=time.time() - 1)
+    )
+
+
+def test_expired_lease_is_reclaimed(movies_db, run_db):
+    from parser.worker import queue_service
+
+    async def scenario():
+        user_id = await add_user()
+        await queue_service.enqueue_user(user_id, KINORIUM_ID)
+        crashed = await queue_service.claim("crashed")
+
+        # Held by its worker: nobody else gets it
+        other = await queue_service.claim("rescuer")
+        assert other.id != crashed.id
+        await queue_service.complete(other.id, "rescuer")
+        assert await queue_service.claim("rescuer") is None
+
+        await expire_lease(crashed.id)
+        reclaimed = await queue_service.claim("rescuer")
+        assert reclaimed.id == crashed.id
+        assert reclaimed.attempts == 2
+        assert reclaimed.lease_owner == "rescuer"
+
+        # The crashed worker comes back too late
+        assert not await queue_service.heartbeat(crashed.id, "crashed")
+        assert not await queue_service.complete(crashed.id, "crashed")
+        assert await queue_service.complete(reclaimed.id, "rescuer")
+
+    run_db(scenario)
+
+
+def test_workers_never_claim_the_same_task(movies_db, run_db, monkeypatch):
+    import parser.worker as worker
+
+    runs = []
+
+    async def unchanged_list(task):
+        runs.append(task.id)
+        await asyncio.sleep(0.01)  # Let the other workers claim meanwhile
+        return 0
+
+    monkeypatch.setattr(worker, "discover_pages", unchanged_list)
+
+    async def scenario():
+        for kinorium_id in range(1, 21):
+            user_id = await add_user(kinorium_id)
+            await worker.queue_service.enqueue_user(user_id, kinorium_id)
+        processed = await asyncio.gather(
+            *(worker.work(slot, exit_when_empty=True) for slot in range(4))
+        )
+        return processed, await get_tasks()
+
+    processed, tasks = run_db(scenario)
+    assert sum(processed) == len(tasks) == 40
+    assert sorted(runs) == [task.id for task in tasks]
+    assert all(task.status == ScrapeJobStatus.DONE for task in tasks)
+    assert all(task.attempts == 1 for task in tasks)
+
+
+def test_task_fails_after_max_attempts(movies_db, run_db, monkeypatch):
+    import parser.worker as worker
+
+    async def site_down(kinorium_id, is_rated=False):
+        raise RuntimeError("page could not be loaded")
+
+    monkeypatch.setattr(worker, "get_total_movies", site_down)
+    monkeypatch.setattr(scrape_queue_service, "RETRY_DELAY", 0)
+
+    async def scenario():
+        user_id = await add_user()
+        await worker.queue_service.enqueue_user(user_id, KINORIUM_ID)
+        processed = await worker.work(0, exit_when_empty=True)
+        return processed, await get_tasks()
+
+    processed, tasks = run_db(scenario)
+    assert processed == 2 * MAX_ATTEMPTS
+    for task in tasks:
+        assert task.status == ScrapeJobStatus.FAILED
+        assert task.attempts == MAX_ATTEMPTS
+        assert "could not be loaded" in task.error
+
+
+def test_expired_last_attempt_is_not_retried(movies_db, run_db):
+    async def scenario():
+        user_id = await add_user()
+        await ScrapeTaskRepository.enqueue(
+            [
+                {
+                    "user_id": user_id,
+                    "kinorium_id": KINORIUM_ID,
+                    "list_type": UserMovieStatus.WATCHED,
+                    "page": 1,
+                }
+            ],
+            time.time(),
+        )
+        now = time.time()
+        for _ in range(MAX_ATTEMPTS):
+            task = await ScrapeTaskRepository.claim(
+                "crashed", now, LEASE_SECONDS, MAX_ATTEMPTS
+            )
+            assert task is not None
+            now += LEASE_SECONDS + 1  # The worker crashes, its lease runs out
+
+        assert (
+            await ScrapeTaskRepository.claim(
+                "rescuer", now, LEASE_SECONDS, MAX_ATTEMPTS
+            )
+            is None
+        )
+        return await get_tasks()
+
+    (task,) = run_db(scenario)
+    assert task.status == ScrapeJobStatus.FAILED
+    assert task.error == "Lease expired"
+
+
+def test_workers_sync_a_list_after_a_crash(
+    chromium, kinorium_server, movies_db, run_db
+):
+    import parser.worker as worker
+
+    async def scenario():
+        user_id = await add_user()
+        await worker.queue_service.enqueue_user(user_id, KINORIUM_ID)
+        crashed = await worker.queue_service.claim("crashed")
+        await expire_lease(crashed.id)
+
+        await asyncio.gather(
+            *(worker.work(slot, exit_when_empty=True) for slot in range(2))
+        )
+        db = await get_db()
+        movies = await db.fetch_val(
+            select(func.count()).select_from(UserMovie).where(
+                UserMovie.user_id == user_id
+            )
+        )
+        return crashed, movies, await get_tasks()
+
+    crashed, movies, tasks = run_db(scenario)
+    assert movies == 50
+    assert all(task.status == ScrapeJobStatus.DONE for task in tasks)
+    (reclaimed,) = [task for task in tasks if task.id == crashed.id]
+    assert reclaimed.attempts == 2
@@ -0,0 +1,36 @@
+import asyncio
+
+from bot.spin_coordinator import SpinCoordinator
+
+
+def test_idle_wheels_are_forgotten():
+    coordinator = SpinCoordinator(max_queued=1)
+
+    async def scenario():
+        assert not coordinator.is_spinning("wheel")
+        assert await coordinator.acquire("wheel")
+        queued = asyncio.create_task(coordinator.acquire("wheel"))
+        await asyncio.sleep(0)
+        assert not await coordinator.acquire("wheel")  # The queue is full
+
+        coordinator.release("wheel")
+        assert await queued
+        assert coordinator.is_spinning("wheel")
+
+        async def finish():
+            pass
+
+        await coordinator.finish_later("wheel", 0, finish)
+
+        # A spin that gave up waiting leaves nothing behind either
+        assert await coordinator.acquire("other")
+        cancelled = asyncio.create_task(coordinator.acquire("other"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        coordinator.release("other")
+
+    asyncio.run(scenario())
+    assert not coordinator.is_spinning("wheel")
+    assert coordinator._locks == {}
+    assert coordinator._queued == {}